@@ -0,0 +1,216 @@
+# benchmarks/fixtures.py
+import json
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.synthetic_statcast import generate_statcast
+
+# Fixture sets replayed by the stand-in server. A set is a directory with:
+#   schedule.json               /api/v1/schedule (probable pitchers hydrated)
+#   boxscore/<gamePk>.json      /api/v1/game/<gamePk>/boxscore
+#   feed_live/<gamePk>.json     /api/v1.1/game/<gamePk>/feed/live
+#   people.json                 {full name: id} for /api/v1/people/search
+#   roster.json                 {"batters": [...], "pitchers": [...]} for the daily pull
+#   statcast.csv                league Statcast rows, filtered per request
+#   meta.json                   game_date, season window and scenario players
+# "recorded" sets come from record_fixtures.py; "synthetic" sets are generated
+# here, deterministically, so the suite runs without network access.
+FIXTURE_ROOT = Path(__file__).resolve().parent / "fixtures"
+
+SYNTHETIC_GAME_DATE = "2025-07-15"
+SYNTHETIC_SEASON = ("2025-03-27", "2025-09-28")
+TEAM_NAMES = [
+    "Arizona Diamondbacks", "Atlanta Braves", "Baltimore Orioles", "Boston Red Sox", "Chicago Cubs",
+    "Chicago White Sox", "Cincinnati Reds", "Cleveland Guardians", "Colorado Rockies", "Detroit Tigers",
+    "Houston Astros", "Kansas City Royals", "Los Angeles Angels", "Los Angeles Dodgers", "Miami Marlins",
+    "Milwaukee Brewers", "Minnesota Twins", "New York Mets", "New York Yankees", "Athletics",
+    "Philadelphia Phillies", "Pittsburgh Pirates", "San Diego Padres", "San Francisco Giants", "Seattle Mariners",
+    "St. Louis Cardinals", "Tampa Bay Rays", "Texas Rangers", "Toronto Blue Jays", "Washington Nationals",
+]
+FIRST_NAMES = ["Alex", "Ben", "Carlos", "Dan", "Eli", "Frank", "Gabe", "Hector", "Ivan", "Jose", "Kyle", "Luis"]
+POSITIONS = ["C", "1B", "2B", "3B", "SS", "LF", "CF", "RF", "DH"]
+BATTERS_PER_TEAM = 9
+PITCHERS_PER_TEAM = 3
+PITCHES_PER_BATTER = 600
+SYNTHETIC_VERSION = 2  # bump when the generated layout changes; older sets are rebuilt
+
+def fixture_dir(name="synthetic"):
+    return FIXTURE_ROOT / name
+
+def load_meta(path):
+    with open(Path(path) / "meta.json", "r") as f:
+        return json.load(f)
+
+def _player_id(team_idx, slot):
+    return 600000 + team_idx * 100 + slot
+
+def _person(team_idx, slot, rng):
+    return {
+        "id": _player_id(team_idx, slot),
+        "fullName": f"{FIRST_NAMES[slot % len(FIRST_NAMES)]} {TEAM_NAMES[team_idx].split()[-1]}{slot}",
+        "batSide": {"code": rng.choice(["L", "R"])},
+        "pitchHand": {"code": rng.choice(["L", "R"])},
+    }
+
+def _roster(rng):
+    teams = []
+    for t in range(len(TEAM_NAMES)):
+        batters = [_person(t, i, rng) for i in range(BATTERS_PER_TEAM)]
+        pitchers = [_person(t, BATTERS_PER_TEAM + i, rng) for i in range(PITCHERS_PER_TEAM)]
+        teams.append({"name": TEAM_NAMES[t], "batters": batters, "pitchers": pitchers})
+    return teams
+
+def _box_person(person):
+    # Boxscore persons are slim; handedness is only in the live feed's gameData.players
+    return {"id": person["id"], "fullName": person["fullName"], "link": f"/api/v1/people/{person['id']}"}
+
+def _boxscore(away, home):
+    def side(team):
+        players = {}
+        for order, person in enumerate(team["batters"]):
+            players[f"ID{person['id']}"] = {
+                "person": _box_person(person),
+                "position": {"abbreviation": POSITIONS[order]},
+                "battingOrder": str((order + 1) * 100),
+            }
+        for person in team["pitchers"]:
+            players[f"ID{person['id']}"] = {"person": _box_person(person), "position": {"abbreviation": "P"}}
+        return {"team": {"name": team["name"]}, "players": players}
+    return {"teams": {"away": side(away), "home": side(home)}}
+
+def _feed_live(game_pk, away, home, rng):
+    plays = []
+    runs = {"away": 0, "home": 0}
+    hits = {"away": 0, "home": 0}
+    for inning in range(1, 7):
+        for half, batting, pitching in (("top", away, home), ("bottom", home, away)):
+            for _ in range(4):
+                batter = batting["batters"][len(plays) % BATTERS_PER_TEAM]
+                pitcher = pitching["pitchers"][0]
+                events = []
+                for n in range(int(rng.integers(1, 6))):
+                    events.append({
+                        "isPitch": True,
+                        "details": {"type": {"code": rng.choice(["FF", "SL", "CH", "CU", "SI"])},
+                                    "description": rng.choice(["Ball", "Called Strike", "Swinging Strike", "Foul"])},
+                        "count": {"balls": min(n, 3), "strikes": min(n, 2)},
+                    })
+                event_type = rng.choice(["strikeout", "single", "field_out", "double", "walk"], p=[.25, .15, .45, .05, .10])
+                if event_type in ("single", "double", "field_out"):
+                    events[-1]["hitData"] = {"launchSpeed": float(rng.normal(89, 12)), "launchAngle": float(rng.normal(12, 25))}
+                team = "away" if half == "top" else "home"
+                if event_type in ("single", "double"):
+                    hits[team] += 1
+                    runs[team] += int(rng.random() < 0.3)
+                plays.append({
+                    "about": {"isComplete": True, "halfInning": half, "inning": inning},
+                    "result": {"eventType": event_type},
+                    "matchup": {"batter": {"id": batter["id"], "fullName": batter["fullName"]},
+                                "pitcher": {"id": pitcher["id"], "fullName": pitcher["fullName"]},
+                                "batSide": batter["batSide"], "pitchHand": pitcher["pitchHand"]},
+                    "playEvents": events,
+                })
+    current = dict(plays[-1], about={"isComplete": False, "halfInning": "bottom", "inning": 6})
+    current["count"] = {"balls": 1, "strikes": 2, "outs": 1}
+    current["runners"] = [{"movement": {"end": "1B"}}]
+    return {
+        "gamePk": game_pk,
+        "gameData": {
+            "teams": {"away": {"team": {"name": away["name"]}}, "home": {"team": {"name": home["name"]}}},
+            "players": {f"ID{person['id']}": person
+                        for team in (away, home) for person in team["batters"] + team["pitchers"]},
+        },
+        "liveData": {
+            "linescore": {
+                "currentInning": 6, "inningState": "Bottom",
+                "teams": {side: {"runs": runs[side], "hits": hits[side]} for side in ("away", "home")},
+            },
+            "plays": {"allPlays": plays, "currentPlay": current},
+        },
+    }
+
+def _statcast(teams, season, seed):
+    batters = [b for team in teams for b in team["batters"]]
+    pitchers = [p for team in teams for p in team["pitchers"]]
+    return generate_statcast(
+        len(batters) * PITCHES_PER_BATTER,
+        season=season,
+        pitcher_ids=[p["id"] for p in pitchers],
+        batter_ids=[b["id"] for b in batters],
+        pitcher_hands=[p["pitchHand"]["code"] for p in pitchers],
+        batter_hands=[b["batSide"]["code"] for b in batters],
+        seed=seed,
+    )
+
+def build_synthetic_fixtures(path=None, seed=7):
+    """
+    Write a deterministic synthetic fixture set (15 games, 30 teams, ~160k pitches).
+    """
+    path = Path(path or fixture_dir("synthetic"))
+    rng = np.random.default_rng(seed)
+    teams = _roster(rng)
+    (path / "boxscore").mkdir(parents=True, exist_ok=True)
+    (path / "feed_live").mkdir(parents=True, exist_ok=True)
+
+    games = []
+    for g in range(len(teams) // 2):
+        away, home = teams[2 * g], teams[2 * g + 1]
+        game_pk = 777000 + g
+        games.append({
+            "gamePk": game_pk,
+            "gameDate": f"{SYNTHETIC_GAME_DATE}T{17 + g % 6}:05:00Z",
+            "status": {"detailedState": "In Progress"},
+            "teams": {
+                "away": {"team": {"name": away["name"]}, "probablePitcher": {"fullName": away["pitchers"][0]["fullName"]}},
+                "home": {"team": {"name": home["name"]}, "probablePitcher": {"fullName": home["pitchers"][0]["fullName"]}},
+            },
+        })
+        with open(path / "boxscore" / f"{game_pk}.json", "w") as f:
+            json.dump(_boxscore(away, home), f)
+        with open(path / "feed_live" / f"{game_pk}.json", "w") as f:
+            json.dump(_feed_live(game_pk, away, home, rng), f)
+
+    with open(path / "schedule.json", "w") as f:
+        json.dump({"dates": [{"date": SYNTHETIC_GAME_DATE, "games": games}]}, f)
+
+    people = {p["fullName"]: p["id"] for team in teams for p in team["batters"] + team["pitchers"]}
+    with open(path / "people.json", "w") as f:
+        json.dump(people, f)
+
+    # 50-player roster for the daily pull: 35 batters, 15 pitchers
+    roster = {
+        "batters": [b["id"] for team in teams[:4] for b in team["batters"]][:35],
+        "pitchers": [p["id"] for team in teams[:5] for p in team["pitchers"]][:15],
+    }
+    with open(path / "roster.json", "w") as f:
+        json.dump(roster, f)
+
+    _statcast(teams, SYNTHETIC_SEASON, seed).to_csv(path / "statcast.csv", index=False)
+
+    first = games[0]
+    meta = {
+        "source": "synthetic",
+        "version": SYNTHETIC_VERSION,
+        "game_date": SYNTHETIC_GAME_DATE,
+        "season_start": SYNTHETIC_SEASON[0],
+        "season_end": SYNTHETIC_SEASON[1],
+        "home": first["teams"]["home"]["team"]["name"],
+        "away": first["teams"]["away"]["team"]["name"],
+        "matchup_batter": teams[0]["batters"][0]["fullName"],
+        "matchup_pitcher": teams[1]["pitchers"][0]["fullName"],
+    }
+    with open(path / "meta.json", "w") as f:
+        json.dump(meta, f, indent=2)
+    print(f"[✓] Synthetic fixtures written to {path}")
+    return path
+
+def ensure_fixtures(name="synthetic"):
+    path = fixture_dir(name)
+    stale = name == "synthetic" and (path / "meta.json").exists() and \
+        load_meta(path).get("version") != SYNTHETIC_VERSION
+    if stale or not (path / "meta.json").exists():
+        if name != "synthetic":
+            raise FileNotFoundError(f"No fixture set at {path}; run benchmarks/record_fixtures.py first")
+        build_synthetic_fixtures(path)
+    return path
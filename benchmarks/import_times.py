@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import ast
+import json
+import re
+import subprocess
+from collections import defaultdict
+from pathlib import Path
+
+# Start-up cost of every page and script: each entry point's module-level
+# imports run in a fresh interpreter under -X importtime, and the report
+# shows the total, the packages that dominate it, and whether any of the
+# lazily imported packages (see utils/lazy_imports.py) got pulled in anyway.
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "imports.json"
+ENTRY_POINTS = ["streamlit_app.py", "pages/*.py", "scripts/*.py"]
+LAZY_MODULES = ["pybaseball", "matplotlib", "scipy", "openpyxl", "streamlit_autorefresh"]
+DEFAULT_TOLERANCE = 0.25
+MIN_REGRESSION_MS = 20  # smaller differences are run-to-run noise
+TOP_PACKAGES = 8
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+def entry_points():
+    paths = []
+    for pattern in ENTRY_POINTS:
+        paths.extend(sorted(REPO_ROOT.glob(pattern)))
+    return [path.relative_to(REPO_ROOT).as_posix() for path in paths]
+
+def module_imports(path):
+    """
+    Source of the top-level import statements in a script (what runs before its first line of work).
+    """
+    tree = ast.parse((REPO_ROOT / path).read_text(encoding="utf-8"))
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+def measure_imports(path):
+    """
+    {"total_ms", "packages": {top-level package: self ms}, "modules": set of module names}
+    for one fresh-interpreter import of path's module-level imports.
+    """
+    snippet = f"import sys\nsys.path.insert(0, {str(REPO_ROOT)!r})\n{module_imports(path)}"
+    env = dict(os.environ, PYTHONWARNINGS="ignore")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", snippet], cwd=REPO_ROOT,
+                          capture_output=True, text=True, env=env)
+    packages = defaultdict(int)
+    modules = set()
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = int(match.group(1)), int(match.group(2)), match.group(3), match.group(4)
+        modules.add(name)
+        packages[name.split(".")[0]] += self_us
+        if len(indent) == 1:  # top-level import in the snippet
+            total_us += cumulative_us
+    return {
+        "total_ms": round(total_us / 1000, 1),
+        "packages": {pkg: round(us / 1000, 1) for pkg, us in sorted(packages.items(), key=lambda kv: -kv[1])},
+        "lazy_loaded": sorted(pkg for pkg in LAZY_MODULES if pkg in modules),
+        "error": proc.stderr.strip().splitlines()[-1] if proc.returncode else None,
+    }
+
+def run_report(paths, repeat=3):
+    """
+    Fastest of `repeat` runs per entry point (the first warms the bytecode cache).
+    """
+    report = {}
+    for path in paths:
+        runs = [measure_imports(path) for _ in range(repeat)]
+        best = min(runs, key=lambda run: run["total_ms"])
+        report[path] = best
+        top = ", ".join(f"{pkg} {ms:.0f}" for pkg, ms in list(best["packages"].items())[:TOP_PACKAGES])
+        print(f"{path:<32}{best['total_ms']:>9.1f} ms   {top}")
+        if best["lazy_loaded"]:
+            print(f"{'':<32}   loads at import: {', '.join(best['lazy_loaded'])}")
+        if best["error"]:
+            print(f"{'':<32}   ERROR {best['error']}")
+    return {"repeat": repeat, "entry_points": report}
+
+def compare_to_baseline(report, baseline, tolerance):
+    regressions = []
+    for path, result in report["entry_points"].items():
+        base = baseline.get("entry_points", {}).get(path)
+        if not base:
+            continue
+        if result["total_ms"] > base["total_ms"] * (1 + tolerance) and \
+                result["total_ms"] - base["total_ms"] > MIN_REGRESSION_MS:
+            regressions.append(f"{path}: {result['total_ms']} ms vs {base['total_ms']} ms")
+        newly_loaded = set(result["lazy_loaded"]) - set(base["lazy_loaded"])
+        if newly_loaded:
+            regressions.append(f"{path}: now imports {', '.join(sorted(newly_loaded))} at start-up")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time report for every page and script.")
+    parser.add_argument("paths", nargs="*", help="Entry points relative to the repo root (default: all)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--output", help="Write the full JSON report here")
+    args = parser.parse_args()
+
+    print(f"{'entry point':<32}{'imports':>12}   slowest packages (self ms)")
+    report = run_report(args.paths or entry_points(), args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[✓] Baseline written to {baseline_path}")
+        return 0
+
+    baseline = json.load(open(baseline_path)) if baseline_path.exists() else {}
+    regressions = compare_to_baseline(report, baseline, args.tolerance)
+    if regressions:
+        print("\n❌ Regressions:\n  " + "\n  ".join(regressions))
+        return 1
+    print("\n✅ No regressions" if baseline else "\n(no baseline yet; run with --update-baseline)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import json
+import resource
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+# Importing run_offline first points every disk cache at its throwaway WORK_DIR
+from benchmarks.run_offline import WORK_DIR, reset_app_state
+from benchmarks.fixtures import ensure_fixtures, load_meta
+from benchmarks.standin_server import StandinServer, redirect_upstream
+from streamlit.testing.v1 import AppTest
+from utils import instrumentation, upstream
+
+# Concurrent viewers against one process, the way a single Render instance
+# serves them: every simulated session is its own AppTest (own session state,
+# shared st.cache_data and disk caches) running the real page scripts, with
+# statsapi/Savant answered by the local stand-in. Sessions are stepped up
+# level by level without restarting, so later levels see the caches the
+# earlier ones warmed, as a long-running server would.
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PAGES = {
+    "home": "streamlit_app.py",
+    "game_view": "pages/game_view.py",
+    "matchup_view": "pages/matchup_view.py",
+}
+AUTOREFRESH_PAGES = {"game_view"}  # pages whose scoreboard registers st_autorefresh
+DEFAULT_LEVELS = [1, 5, 10, 25]
+PERCENTILES = [50, 90, 95, 99]
+
+def _rss_mb():
+    """
+    Current resident set size (Linux), falling back to the peak where /proc is unavailable.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+def build_app(page, meta, run_timeout):
+    """
+    An AppTest for one viewer, with the query params a link from the app would carry.
+    """
+    at = AppTest.from_file(str(REPO_ROOT / PAGES[page]), default_timeout=run_timeout)
+    if page == "game_view":
+        at.query_params.update(home=meta["home"], away=meta["away"], time=f"{meta['game_date']}T17:05:00Z")
+    elif page == "matchup_view":
+        at.query_params.update(
+            batter=meta["matchup_batter"], team=meta["away"], home=meta["home"], away=meta["away"],
+            home_pitcher=meta["matchup_pitcher"], away_pitcher=meta["matchup_pitcher"],
+        )
+    return at
+
+def run_session(page, meta, ticks, tick_interval, run_timeout):
+    """
+    One viewer: open the page, pick the fixture date/season, then sit through
+    `ticks` autorefresh reruns on pages that have one. Returns per-run records.
+    """
+    at = build_app(page, meta, run_timeout)
+    runs = []
+
+    def timed(action, label):
+        start = time.perf_counter()
+        error = None
+        try:
+            action()
+            if at.exception:
+                error = at.exception[0].value
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        runs.append({"page": page, "run": label, "seconds": time.perf_counter() - start, "error": error})
+
+    timed(at.run, "open")
+    if page == "home" and at.date_input:
+        timed(lambda: at.date_input[0].set_value(date.fromisoformat(meta["game_date"])).run(), "select_date")
+    elif page == "matchup_view" and at.selectbox:
+        # The synthetic season is a single year; "All" would also fetch every season since 2024
+        timed(lambda: at.selectbox[0].set_value(meta["season_start"][:4]).run(), "select_season")
+    if page in AUTOREFRESH_PAGES:
+        for i in range(ticks):
+            time.sleep(tick_interval)
+            timed(at.run, f"tick_{i + 1}")
+    return runs
+
+def _percentiles(seconds):
+    if not seconds:
+        return {}
+    values = np.asarray(seconds)
+    summary = {f"p{p}": round(float(np.percentile(values, p)), 3) for p in PERCENTILES}
+    summary["max"] = round(float(values.max()), 3)
+    summary["runs"] = len(values)
+    return summary
+
+def _bucket_waits():
+    """
+    {host: seconds callers have slept on that host's token bucket so far}.
+    """
+    return {host: bucket.waited_seconds for host, bucket in list(upstream.rate_limiters.items())}
+
+def run_level(server, n_sessions, pages, meta, ticks, tick_interval, run_timeout):
+    """
+    Start n_sessions viewers at once (round-robin over pages) and wait for all of them.
+    """
+    server.reset_counts()
+    waits_before = _bucket_waits()
+    rss_before = _rss_mb()
+    start = time.perf_counter()
+    assignments = [pages[i % len(pages)] for i in range(n_sessions)]
+    with ThreadPoolExecutor(max_workers=n_sessions) as executor:
+        sessions = list(executor.map(
+            lambda page: run_session(page, meta, ticks, tick_interval, run_timeout), assignments))
+    wall = time.perf_counter() - start
+
+    runs = [run for session in sessions for run in session]
+    requests = server.total_requests()
+    waits = {host: round(seconds - waits_before.get(host, 0.0), 3) for host, seconds in _bucket_waits().items()}
+    return {
+        "sessions": n_sessions,
+        "wall_s": round(wall, 3),
+        "latency": _percentiles([run["seconds"] for run in runs]),
+        "latency_by_page": {
+            page: _percentiles([run["seconds"] for run in runs if run["page"] == page]) for page in pages
+        },
+        "upstream_requests": requests,
+        "requests_per_viewer": round(requests / n_sessions, 2),
+        "by_endpoint": dict(server.request_counts.most_common()),
+        # Summed over sessions: two callers sleeping one second each count two
+        "rate_limit_wait_s": {host: seconds for host, seconds in waits.items() if seconds},
+        "rss_mb": round(_rss_mb(), 1),
+        "rss_growth_mb": round(_rss_mb() - rss_before, 1),
+        "errors": sorted({f"{run['page']}/{run['run']}: {run['error']}" for run in runs if run["error"]}),
+    }
+
+def run_load(levels, pages, fixtures="synthetic", latency=None, ticks=3, tick_interval=1.0,
+             run_timeout=600, warmup=True, cold_levels=False, production_rate_limits=False):
+    path = ensure_fixtures(fixtures)
+    meta = load_meta(path)
+    server = StandinServer(path, latency=latency).start()
+    if not production_rate_limits:
+        # Sessions share the per-host token buckets; lift them so the run measures the app, not the throttle
+        for host in (upstream.STATSAPI_HOST, upstream.SAVANT_HOST):
+            upstream.RATE_LIMITS[host] = (1000.0, 1000)
+
+    reset_app_state()
+    instrumentation.reset_stats()
+    report = {"fixtures": fixtures, "latency": server.latency, "ticks": ticks,
+              "production_rate_limits": production_rate_limits, "levels": []}
+    try:
+        with redirect_upstream(server):
+            if warmup:
+                print("▶ warm-up (one viewer per page, cold caches)")
+                report["warmup"] = run_level(server, len(pages), pages, meta, 0, 0, run_timeout)
+            for n in levels:
+                if cold_levels:
+                    reset_app_state()
+                print(f"▶ {n} concurrent sessions")
+                level = run_level(server, n, pages, meta, ticks, tick_interval, run_timeout)
+                report["levels"].append(level)
+                print(f"   p50 {level['latency'].get('p50', 0):.3f}s  p95 {level['latency'].get('p95', 0):.3f}s  "
+                      f"{level['requests_per_viewer']} upstream req/viewer  "
+                      f"{sum(level['rate_limit_wait_s'].values()):.1f}s rate-limit wait  RSS {level['rss_mb']} MB")
+    finally:
+        server.stop()
+    return report
+
+def print_report(report):
+    print(f"\n{'sessions':>8}{'wall s':>9}{'p50':>8}{'p90':>8}{'p95':>8}{'p99':>8}{'max':>8}"
+          f"{'reqs':>7}{'req/viewer':>12}{'wait s':>9}{'RSS MB':>9}{'Δ RSS':>8}")
+    for level in report["levels"]:
+        lat = level["latency"]
+        print(f"{level['sessions']:>8}{level['wall_s']:>9.2f}"
+              + "".join(f"{lat.get(k, float('nan')):>8.3f}" for k in ("p50", "p90", "p95", "p99", "max"))
+              + f"{level['upstream_requests']:>7}{level['requests_per_viewer']:>12}"
+              f"{sum(level['rate_limit_wait_s'].values()):>9.1f}{level['rss_mb']:>9.1f}{level['rss_growth_mb']:>+8.1f}")
+        for error in level["errors"]:
+            print(f"         ERROR {error}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent Streamlit sessions against a local statsapi/Savant stand-in.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=DEFAULT_LEVELS,
+                        help="Concurrent session counts to step through")
+    parser.add_argument("--pages", nargs="+", default=list(PAGES), help=f"Subset of {', '.join(PAGES)}")
+    parser.add_argument("--ticks", type=int, default=3, help="Autorefresh reruns per game_view session")
+    parser.add_argument("--tick-interval", type=float, default=1.0,
+                        help="Seconds between ticks (the app refreshes every 15s)")
+    parser.add_argument("--fixtures", default="synthetic")
+    parser.add_argument("--statsapi-latency-ms", type=float, default=40)
+    parser.add_argument("--savant-latency-ms", type=float, default=250)
+    parser.add_argument("--run-timeout", type=float, default=600, help="Seconds before a script run is abandoned")
+    parser.add_argument("--no-warmup", action="store_true", help="Start the first level on cold caches")
+    parser.add_argument("--cold-levels", action="store_true", help="Clear every cache before each level")
+    parser.add_argument("--production-rate-limits", action="store_true",
+                        help="Keep the real per-host token buckets (slow; measures throttling too)")
+    parser.add_argument("--output", help="Write the full JSON report here")
+    args = parser.parse_args()
+    unknown = set(args.pages) - set(PAGES)
+    if unknown:
+        parser.error(f"unknown pages: {', '.join(sorted(unknown))}")
+
+    latency = {
+        upstream.STATSAPI_HOST: args.statsapi_latency_ms / 1000,
+        upstream.SAVANT_HOST: args.savant_latency_ms / 1000,
+    }
+    try:
+        report = run_load(args.sessions, args.pages, args.fixtures, latency, args.ticks, args.tick_interval,
+                          args.run_timeout, not args.no_warmup, args.cold_levels, args.production_rate_limits)
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if any(level["errors"] for level in report["levels"]) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import functools
+import gc
+import json
+import platform
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.synthetic_statcast import generate_statcast
+from utils import league_sketches
+from utils.formatting_utils import format_baseball_stats
+from utils.stat_cube import build_stat_cube
+from utils.stat_utils import PITCH_TYPE_MAP, compact_statcast_frame
+from utils.style_helpers import style_batter_table, style_delta_table, style_pitcher_table
+
+# League-scale timings for the in-process pipeline (no I/O): compacting a raw
+# frame, building the pitcher/batter cubes, rolling them up into per-player
+# pitch tables, merging batter-vs-pitcher deltas, formatting and styling.
+# Each stage runs on synthetic Statcast at every size, so the report shows
+# how the cost grows from one pitcher's season to the whole league.
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "micro.json"
+SIZES = {"10k": 10_000, "100k": 100_000, "1M": 1_000_000, "5M": 5_000_000}
+DEFAULT_THRESHOLD = 0.30
+MIN_REGRESSION_S = 0.005  # stages faster than this are timer noise
+DELTA_METRICS = ["K%", "Whiff%", "PutAway%", "SLG", "wOBA", "BA"]
+
+def league_tables(cube, role):
+    """
+    One per-pitch summary per player, stacked into a league table.
+    """
+    frames = []
+    for player_id in cube.players:
+        summary = cube.pitch_type_summary(player_id, PITCH_TYPE_MAP)
+        summary.insert(0, role, int(player_id))
+        frames.append(summary)
+    return pd.concat(frames, ignore_index=True)
+
+def merge_deltas(pitchers, batters):
+    """
+    Pair every batter with a pitcher (round-robin) and build the matchup_view
+    delta table for each pair.
+    """
+    pitcher_groups = [group.drop(columns="pitcher") for _, group in pitchers.groupby("pitcher", sort=True)]
+    frames = []
+    for i, (batter_id, batter_df) in enumerate(batters.groupby("batter", sort=True)):
+        matchup_df = pd.merge(pitcher_groups[i % len(pitcher_groups)], batter_df.drop(columns="batter"),
+                              on="pitch_type", suffixes=("_P", "_B"))
+        for metric in DELTA_METRICS:
+            matchup_df[f"Δ {metric}"] = (matchup_df[f"{metric}_B"] - matchup_df[f"{metric}_P"]).round(2)
+        matchup_df.insert(0, "batter", batter_id)
+        frames.append(matchup_df)
+    return pd.concat(frames, ignore_index=True)
+
+def _time(fn, repeat):
+    """
+    (best wall time over repeat runs, last result).
+    """
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def run_size(n_pitches, repeat, sketch_path, seed=0):
+    """
+    Time every stage on one synthetic frame; returns {stage: seconds} plus row counts.
+    """
+    raw = generate_statcast(n_pitches, seed=seed)
+    timings = {}
+
+    timings["compact"], df = _time(lambda: compact_statcast_frame(raw), repeat)
+    del raw
+    timings["pitcher_cube"], pitcher_cube = _time(lambda: build_stat_cube(df, "pitcher", "stand"), repeat)
+    timings["batter_cube"], batter_cube = _time(lambda: build_stat_cube(df, "batter", "p_throws"), repeat)
+    timings["pitcher_tables"], pitchers = _time(lambda: league_tables(pitcher_cube, "pitcher"), repeat)
+    timings["batter_tables"], batters = _time(lambda: league_tables(batter_cube, "batter"), repeat)
+    timings["delta_merge"], deltas = _time(lambda: merge_deltas(pitchers, batters), repeat)
+    timings["league_sketches"], _ = _time(
+        lambda: league_sketches.build_league_sketches(pitchers, batters, path=sketch_path), repeat)
+    timings["format"], formatted = _time(
+        lambda: (format_baseball_stats(pitchers), format_baseball_stats(batters), format_baseball_stats(deltas)),
+        repeat)
+    timings["style_html"], _ = _time(lambda: (
+        style_pitcher_table(formatted[0]).to_html(),
+        style_batter_table(formatted[1]).to_html(),
+        style_delta_table(formatted[2]).to_html(),
+    ), repeat)
+
+    return {
+        "pitches": n_pitches,
+        "pitchers": len(pitcher_cube.players),
+        "batters": len(batter_cube.players),
+        "table_rows": {"pitcher": len(pitchers), "batter": len(batters), "delta": len(deltas)},
+        "stages": {stage: round(seconds, 4) for stage, seconds in timings.items()},
+    }
+
+def run_benchmarks(sizes, repeat=3, seed=0):
+    work_dir = Path(tempfile.mkdtemp(prefix="pitch-stats-micro-"))
+    sketch_path = work_dir / "league_sketches.json"
+    # Shade against sketches built from the synthetic league, not whatever the daily job left on disk
+    league_sketches.get_league_sketches = functools.partial(league_sketches.get_league_sketches, path=sketch_path)
+
+    results = {}
+    for label in sizes:
+        print(f"▶ {label} pitches")
+        results[label] = run_size(SIZES[label], repeat, sketch_path, seed)
+        stages = results[label]["stages"]
+        print("   " + "  ".join(f"{stage} {seconds:.3f}s" for stage, seconds in stages.items()))
+    return {"repeat": repeat, "seed": seed, "sizes": results}
+
+def compare_to_baseline(report, baseline, threshold):
+    """
+    Print a stage-by-size table against the baseline; return the list of regressions.
+    """
+    regressions = []
+    sizes = list(report["sizes"])
+    stages = list(next(iter(report["sizes"].values()))["stages"])
+    print(f"\n{'stage':<18}" + "".join(f"{label:>18}" for label in sizes))
+    for stage in stages:
+        row = f"{stage:<18}"
+        for label in sizes:
+            seconds = report["sizes"][label]["stages"][stage]
+            base = baseline.get("sizes", {}).get(label, {}).get("stages", {}).get(stage)
+            if base is None:
+                row += f"{seconds:>18.3f}"
+                continue
+            change = (seconds - base) / base if base else 0.0
+            row += f"{seconds:>10.3f} ({change:+5.0%})"
+            if seconds > base * (1 + threshold) and seconds - base > MIN_REGRESSION_S:
+                regressions.append(f"{stage} @ {label}: {seconds:.3f}s vs {base:.3f}s ({change:+.0%})")
+        print(row)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling micro-benchmarks on synthetic Statcast.")
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES), help=f"Subset of {', '.join(SIZES)}")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage; the fastest is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown per stage before the run fails (0.30 = 30%%)")
+    parser.add_argument("--output", help="Write the full JSON report here")
+    args = parser.parse_args()
+    unknown = set(args.sizes) - set(SIZES)
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(sorted(unknown))}")
+
+    report = run_benchmarks(args.sizes, args.repeat, args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline = json.load(open(baseline_path)) if baseline_path.exists() else {"sizes": {}}
+        # Timings only compare on similar hardware; keep a note of where these were taken
+        machine = {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()}
+        baseline.update(repeat=report["repeat"], seed=report["seed"], machine=machine)
+        baseline["sizes"].update(report["sizes"])
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"[✓] Baseline written to {baseline_path}")
+        return 0
+
+    baseline = json.load(open(baseline_path)) if baseline_path.exists() else {}
+    regressions = compare_to_baseline(report, baseline, args.threshold)
+    if regressions:
+        print("\n❌ Regressions:\n  " + "\n  ".join(regressions))
+        return 1
+    print("\n✅ No regressions" if baseline else "\n(no baseline yet; run with --update-baseline)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import requests
+from pybaseball import statcast
+
+from benchmarks.fixtures import fixture_dir
+
+STATSAPI = "https://statsapi.mlb.com"
+
+def _get_json(url):
+    resp = requests.get(url, timeout=30)
+    resp.raise_for_status()
+    return resp.json()
+
+def record_fixtures(game_date, statcast_days=14, name="recorded"):
+    """
+    Capture real statsapi responses for game_date and the preceding
+    statcast_days of league Statcast into benchmarks/fixtures/<name>.
+    """
+    path = Path(fixture_dir(name))
+    (path / "boxscore").mkdir(parents=True, exist_ok=True)
+    (path / "feed_live").mkdir(parents=True, exist_ok=True)
+
+    schedule = _get_json(f"{STATSAPI}/api/v1/schedule?sportId=1&date={game_date}&hydrate=probablePitcher")
+    with open(path / "schedule.json", "w") as f:
+        json.dump(schedule, f)
+    games = schedule.get("dates", [{}])[0].get("games", [])
+    if not games:
+        raise SystemExit(f"No games on {game_date}")
+
+    people = {}
+    batters, pitchers = [], []
+    for game in games:
+        game_pk = game["gamePk"]
+        print(f"⚾ Recording game {game_pk}")
+        boxscore = _get_json(f"{STATSAPI}/api/v1/game/{game_pk}/boxscore")
+        with open(path / "boxscore" / f"{game_pk}.json", "w") as f:
+            json.dump(boxscore, f)
+        with open(path / "feed_live" / f"{game_pk}.json", "w") as f:
+            json.dump(_get_json(f"{STATSAPI}/api/v1.1/game/{game_pk}/feed/live"), f)
+
+        for side in ("away", "home"):
+            for player in boxscore["teams"][side]["players"].values():
+                people[player["person"]["fullName"]] = player["person"]["id"]
+                if player.get("position", {}).get("abbreviation") == "P":
+                    pitchers.append(player["person"]["id"])
+                elif "battingOrder" in player:
+                    batters.append(player["person"]["id"])
+
+    with open(path / "people.json", "w") as f:
+        json.dump(people, f)
+    with open(path / "roster.json", "w") as f:
+        json.dump({"batters": batters[:35], "pitchers": pitchers[:15]}, f)
+
+    end = datetime.strptime(game_date, "%Y-%m-%d") - timedelta(days=1)
+    start = end - timedelta(days=statcast_days - 1)
+    season = (start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
+    print(f"⚾ Recording league Statcast {season[0]} → {season[1]}")
+    statcast(start_dt=season[0], end_dt=season[1]).to_csv(path / "statcast.csv", index=False)
+
+    first = games[0]
+    away_box = json.load(open(path / "boxscore" / f"{first['gamePk']}.json"))["teams"]["away"]["players"].values()
+    meta = {
+        "source": "recorded",
+        "game_date": game_date,
+        "season_start": season[0],
+        "season_end": season[1],
+        "home": first["teams"]["home"]["team"]["name"],
+        "away": first["teams"]["away"]["team"]["name"],
+        "matchup_batter": next(p["person"]["fullName"] for p in away_box if "battingOrder" in p),
+        "matchup_pitcher": first["teams"]["home"].get("probablePitcher", {}).get("fullName", ""),
+    }
+    with open(path / "meta.json", "w") as f:
+        json.dump(meta, f, indent=2)
+    print(f"[✓] Recorded fixtures to {path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record statsapi/Savant fixtures for the offline benchmarks.")
+    parser.add_argument("--date", required=True, help="Game date to record (YYYY-MM-DD)")
+    parser.add_argument("--statcast-days", type=int, default=14)
+    parser.add_argument("--name", default="recorded")
+    args = parser.parse_args()
+    record_fixtures(args.date, args.statcast_days, args.name)
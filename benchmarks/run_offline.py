@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import functools
+import importlib
+import json
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Every disk cache the app writes goes to a throwaway directory, so each cold
+# run starts empty and the benchmark never touches real cached data.
+WORK_DIR = Path(tempfile.mkdtemp(prefix="pitch-stats-bench-"))
+os.environ["SHARED_CACHE_DIR"] = str(WORK_DIR / "frames")
+os.environ["STATCAST_CHUNK_DIR"] = str(WORK_DIR / "chunks")
+os.environ["PITCH_STORE_DIR"] = str(WORK_DIR / "pitch_store")
+os.environ["PLAYER_INDEX_PATH"] = str(WORK_DIR / "player_index.json")
+os.environ["SCHEDULE_STORE_DIR"] = str(WORK_DIR / "schedule_store")
+
+import streamlit as st
+
+from benchmarks.fixtures import ensure_fixtures, load_meta
+from benchmarks.standin_server import StandinServer, redirect_upstream
+from utils import (
+    fragment_cache, instrumentation, lazy_imports, mlb_api, player_registry, schedule_store, schedule_utils,
+    upstream
+)
+from utils.lineup_utils import get_game_lineups, get_live_lineup
+from utils.mlb_api import get_probable_pitchers_for_date
+from utils.scoreboard_utils import render_scoreboard
+from utils.stat_utils import (
+    get_batter_k_rate_by_id, get_batter_metrics_by_pitch, get_pitcher_arsenal_stats, get_pitcher_stats
+)
+from utils.player_registry import lookup_player_id
+from utils.formatting_utils import format_baseball_stats
+from utils.style_helpers import style_batter_table, style_delta_table, style_pitcher_table
+import pandas as pd
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "offline.json"
+DEFAULT_TOLERANCE = 0.25
+MIN_REGRESSION_S = 0.15  # warm runs take a few hundred ms; smaller slowdowns are timer noise
+
+def reset_app_state():
+    """
+    Drop every in-process and on-disk cache so the next run is cold.
+    """
+    st.cache_data.clear()
+    for sub in ("frames", "chunks", "schedule_store"):
+        shutil.rmtree(WORK_DIR / sub, ignore_errors=True)
+    (WORK_DIR / "player_index.json").unlink(missing_ok=True)
+    schedule_utils.CACHE_DIR = str(WORK_DIR / "schedules")
+    shutil.rmtree(schedule_utils.CACHE_DIR, ignore_errors=True)
+    fragment_cache.clear_fragments()
+    mlb_api.live_feed_cache.clear()
+    mlb_api.batter_stats_cache.clear()
+    player_registry.players_by_id.clear()
+    player_registry.player_ids_by_name.clear()
+    schedule_store._seasons.clear()
+    upstream.last_good_values.clear()
+    upstream.rate_limiters.clear()
+    upstream.circuit_breakers.clear()
+
+
+# --- Scenarios (data builds behind each page, with the season pinned to the fixtures) ---
+def scenario_game_view(meta):
+    date = meta["game_date"]
+    season = dict(start_date=meta["season_start"], end_date=meta["season_end"])
+    home, away = meta["home"], meta["away"]
+
+    probables = get_probable_pitchers_for_date(date).get(f"{away} @ {home}", {})
+    game_pk = get_game_lineups(date).get(f"{away} @ {home}", {}).get("gamePk")
+    away_lineup, home_lineup = get_live_lineup(game_pk, starters_only=True)
+    render_scoreboard(game_pk, home_team=home, away_team=away, autorefresh=False)
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        list(executor.map(lambda p: get_batter_k_rate_by_id(p.id, **season), away_lineup + home_lineup))
+
+    for pitcher in (probables.get("away_pitcher"), probables.get("home_pitcher")):
+        pid = lookup_player_id(pitcher) if pitcher else None
+        if pid:
+            style_pitcher_table(format_baseball_stats(get_pitcher_arsenal_stats(pid, **season))).to_html()
+
+def scenario_matchup_view(meta):
+    season = dict(start_date=meta["season_start"], end_date=meta["season_end"])
+    pitcher_df = get_pitcher_stats(meta["matchup_pitcher"], **season)
+    batter_df = get_batter_metrics_by_pitch(lookup_player_id(meta["matchup_batter"]), **season)
+    if pitcher_df.empty or batter_df.empty:
+        return
+
+    matchup_df = pd.merge(pitcher_df, batter_df, on="pitch_type", suffixes=("_P", "_B"))
+    for metric in ["K%", "Whiff%", "PutAway%", "SLG", "wOBA", "BA"]:
+        matchup_df[f"Δ {metric}"] = (matchup_df[f"{metric}_B"] - matchup_df[f"{metric}_P"]).round(2)
+    style_pitcher_table(format_baseball_stats(pitcher_df)).to_html()
+    style_batter_table(format_baseball_stats(batter_df)).to_html()
+    style_delta_table(format_baseball_stats(matchup_df)).to_html()
+
+def scenario_scoreboard_loop(meta):
+    date = meta["game_date"]
+    games = schedule_utils.get_games_between(date, date)
+    lineup_map = get_game_lineups(date)
+    for game in games:
+        game_pk = lineup_map.get(f"{game['opponent']} @ {game['home']}", {}).get("gamePk")
+        if game_pk:
+            render_scoreboard(game_pk, home_team=game["home"], away_team=game["opponent"], autorefresh=False)
+
+def scenario_daily_pull(meta):
+    from scripts import daily_stats_job
+    season = dict(start_date=meta["season_start"], end_date=meta["season_end"])
+    daily_stats_job.DATA_DIR = WORK_DIR / "daily_stats"
+    daily_stats_job.DATA_DIR.mkdir(parents=True, exist_ok=True)
+    daily_stats_job.get_batter_metrics_by_pitch = functools.partial(get_batter_metrics_by_pitch, **season)
+    daily_stats_job.get_pitcher_arsenal_stats = functools.partial(get_pitcher_arsenal_stats, **season)
+    daily_stats_job.run_daily_stat_pull()
+
+SCENARIOS = {
+    "game_view": scenario_game_view,
+    "matchup_view": scenario_matchup_view,
+    "scoreboard_loop": scenario_scoreboard_loop,
+    "daily_pull": scenario_daily_pull,
+}
+
+
+# --- Measurement ---
+def preload_lazy_imports():
+    """
+    Import the packages utils/lazy_imports.py defers, plus the ones pandas and
+    requests load on first use (the Styler's jinja2, netrc), so their one-time
+    import cost doesn't land in whichever scenario happens to run first.
+    """
+    lazy_imports.pybaseball()
+    lazy_imports.kd_tree_class()
+    lazy_imports.st_autorefresh()
+    importlib.import_module("pandas.io.formats.style")
+    importlib.import_module("netrc")
+
+def measure(server, fn, meta):
+    server.reset_counts()
+    tracemalloc.start()
+    start = time.perf_counter()
+    error = None
+    try:
+        fn(meta)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    wall = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "wall_s": round(wall, 3),
+        "requests": server.total_requests(),
+        "bytes_served": server.bytes_sent,
+        "peak_mb": round(peak / 1e6, 1),
+        "by_endpoint": dict(server.request_counts.most_common()),
+        "error": error,
+    }
+
+def run_scenarios(names, fixtures="synthetic", latency=None, warm_runs=1, production_rate_limits=False):
+    path = ensure_fixtures(fixtures)
+    meta = load_meta(path)
+    server = StandinServer(path, latency=latency).start()
+    if not production_rate_limits:
+        # Token-bucket sleeps would dominate; request counts still show the load
+        for host in (upstream.STATSAPI_HOST, upstream.SAVANT_HOST):
+            upstream.RATE_LIMITS[host] = (1000.0, 1000)
+
+    preload_lazy_imports()
+    results = {}
+    try:
+        with redirect_upstream(server):
+            for name in names:
+                reset_app_state()
+                instrumentation.reset_stats()
+                print(f"▶ {name} (cold)")
+                runs = {"cold": measure(server, SCENARIOS[name], meta)}
+                for i in range(warm_runs):
+                    print(f"▶ {name} (warm {i + 1})")
+                    runs[f"warm_{i + 1}" if warm_runs > 1 else "warm"] = measure(server, SCENARIOS[name], meta)
+                results[name] = runs
+    finally:
+        server.stop()
+    return {"fixtures": fixtures, "latency": server.latency, "scenarios": results}
+
+
+# --- Baselines ---
+def compare_to_baseline(report, baseline, tolerance):
+    """
+    Print each run next to its baseline; return the list of regressions.
+    """
+    regressions = []
+    print(f"\n{'scenario':<18}{'run':<8}{'wall s':>9}{'base':>9}{'reqs':>7}{'base':>7}{'peak MB':>9}{'base':>8}")
+    for name, runs in report["scenarios"].items():
+        for run, result in runs.items():
+            base = baseline.get("scenarios", {}).get(name, {}).get(run, {})
+            print(f"{name:<18}{run:<8}{result['wall_s']:>9.3f}{base.get('wall_s', float('nan')):>9.3f}"
+                  f"{result['requests']:>7}{base.get('requests', '-'):>7}"
+                  f"{result['peak_mb']:>9.1f}{base.get('peak_mb', float('nan')):>8.1f}"
+                  + (f"  ERROR {result['error']}" if result["error"] else ""))
+            if result["error"]:
+                # A crash can finish fast and early, so it would otherwise pass every threshold
+                regressions.append(f"{name}/{run}: {result['error']}")
+            if not base:
+                continue
+            if result["wall_s"] > base["wall_s"] * (1 + tolerance) and result["wall_s"] - base["wall_s"] > MIN_REGRESSION_S:
+                regressions.append(f"{name}/{run}: wall {result['wall_s']}s vs {base['wall_s']}s")
+            if result["requests"] > base["requests"]:
+                regressions.append(f"{name}/{run}: {result['requests']} requests vs {base['requests']}")
+            if result["peak_mb"] > base["peak_mb"] * (1 + tolerance):
+                regressions.append(f"{name}/{run}: peak {result['peak_mb']} MB vs {base['peak_mb']} MB")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks against a local statsapi/Savant stand-in.")
+    parser.add_argument("scenarios", nargs="*", help=f"Subset of {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument("--fixtures", default="synthetic", help="Fixture set under benchmarks/fixtures")
+    parser.add_argument("--statsapi-latency-ms", type=float, default=40)
+    parser.add_argument("--savant-latency-ms", type=float, default=250)
+    parser.add_argument("--warm-runs", type=int, default=1)
+    parser.add_argument("--production-rate-limits", action="store_true",
+                        help="Keep the real per-host token buckets (slow; measures throttling too)")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--output", help="Write the full JSON report here")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    latency = {
+        upstream.STATSAPI_HOST: args.statsapi_latency_ms / 1000,
+        upstream.SAVANT_HOST: args.savant_latency_ms / 1000,
+    }
+    report = run_scenarios(args.scenarios or list(SCENARIOS), args.fixtures, latency,
+                           args.warm_runs, args.production_rate_limits)
+    shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    baseline_path = Path(args.baseline)
+    errors = [f"{name}/{run}: {result['error']}" for name, runs in report["scenarios"].items()
+              for run, result in runs.items() if result["error"]]
+    if args.update_baseline and errors:
+        print("[ERROR] Not recording a baseline with failed runs:\n  " + "\n  ".join(errors))
+        return 1
+    if args.update_baseline:
+        # Wall times only compare on similar hardware; keep a note of where these were taken
+        report["machine"] = {"python": platform.python_version(), "platform": platform.platform(),
+                             "cpus": os.cpu_count()}
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[✓] Baseline written to {baseline_path}")
+        return 0
+
+    baseline = json.load(open(baseline_path)) if baseline_path.exists() else {}
+    if baseline and (baseline.get("fixtures"), baseline.get("latency")) != (report["fixtures"], report["latency"]):
+        print("[WARN] Baseline was recorded with different fixtures or latency; comparison is indicative only")
+    regressions = compare_to_baseline(report, baseline, args.tolerance)
+    if regressions:
+        print("\n❌ Regressions:\n  " + "\n  ".join(regressions))
+        return 1
+    print("\n✅ No regressions" if baseline else "\n(no baseline yet; run with --update-baseline)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
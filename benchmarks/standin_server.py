@@ -0,0 +1,199 @@
+# benchmarks/standin_server.py
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import requests
+
+from utils.instrumentation import endpoint_template
+
+# Local HTTP stand-in for statsapi.mlb.com and baseballsavant.mlb.com that
+# replays a fixture set (see fixtures.py) with configurable per-host latency.
+# redirect_upstream() rewrites outbound requests (ours and pybaseball's) to it,
+# so the app code under test runs unmodified. Responses carry a content ETag
+# and honor If-None-Match with a 304, as a CDN in front of statsapi would.
+STANDIN_HOSTS = {"statsapi.mlb.com", "baseballsavant.mlb.com", "api.example.com"}
+DEFAULT_LATENCY = {
+    "statsapi.mlb.com": 0.040,
+    "baseballsavant.mlb.com": 0.250,
+}
+
+_GAME_PATH = re.compile(r"^/api/v1(?:\.1)?/game/(\d+)/(boxscore|feed/live)$")
+_PEOPLE_STATS_PATH = re.compile(r"^/api/v1/people/(\d+)/stats$")
+_ROSTER_PATH = re.compile(r"^/api/v1/teams/(\d+)/roster$")
+ROSTER_TEAM_ID = 1
+
+class FixtureSet:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.schedule = self._read_json("schedule.json")
+        self.people = {name.lower(): pid for name, pid in self._read_json("people.json").items()}
+        self.roster = self._read_json("roster.json")
+        self._json_cache = {}
+        statcast = pd.read_csv(self.path / "statcast.csv", low_memory=False)
+        statcast = statcast.sort_values("game_date", kind="stable")
+        self.statcast_columns = list(statcast.columns)
+        self.by_pitcher = {pid: df for pid, df in statcast.groupby("pitcher")}
+        self.by_batter = {pid: df for pid, df in statcast.groupby("batter")}
+
+    def schedule_between(self, query):
+        """
+        The fixture schedule, limited to startDate..endDate when both are given
+        (single-date requests get every fixture date).
+        """
+        if "startDate" not in query or "endDate" not in query:
+            return self.schedule
+        start, end = query["startDate"][0], query["endDate"][0]
+        return {**self.schedule, "dates": [d for d in self.schedule.get("dates", []) if start <= d["date"] <= end]}
+
+    def _read_json(self, name):
+        with open(self.path / name, "r") as f:
+            return json.load(f)
+
+    def game_json(self, kind, game_pk):
+        key = (kind, game_pk)
+        if key not in self._json_cache:
+            path = self.path / kind / f"{game_pk}.json"
+            self._json_cache[key] = path.read_bytes() if path.exists() else None
+        return self._json_cache[key]
+
+    def statcast_csv(self, player_type, player_id, start, end):
+        frames = self.by_pitcher if player_type == "pitcher" else self.by_batter
+        df = frames.get(player_id)
+        if df is None:
+            return pd.DataFrame(columns=self.statcast_columns).to_csv(index=False)
+        dates = df["game_date"].to_numpy()
+        lo, hi = dates.searchsorted(start, side="left"), dates.searchsorted(end, side="right")
+        return df.iloc[lo:hi].to_csv(index=False)
+
+
+class StandinServer:
+    def __init__(self, fixture_path, latency=None, host="127.0.0.1", port=0):
+        self.fixtures = FixtureSet(fixture_path)
+        self.latency = dict(DEFAULT_LATENCY if latency is None else latency)
+        self.request_counts = Counter()
+        self.bytes_sent = 0
+        self._count_lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def reset_counts(self):
+        with self._count_lock:
+            self.request_counts.clear()
+            self.bytes_sent = 0
+
+    def total_requests(self):
+        with self._count_lock:
+            return sum(self.request_counts.values())
+
+    def _record(self, endpoint, nbytes):
+        with self._count_lock:
+            self.request_counts[endpoint] += 1
+            self.bytes_sent += nbytes
+
+    def route(self, upstream_host, path, query):
+        """
+        (status, content type, body bytes) for one upstream request.
+        """
+        fx = self.fixtures
+        if upstream_host == "statsapi.mlb.com":
+            if path.rstrip("/") in ("/api/v1/schedule", "/api/v1/schedule/games"):
+                return 200, "application/json", json.dumps(fx.schedule_between(query)).encode()
+            match = _GAME_PATH.match(path)
+            if match:
+                kind = "boxscore" if match.group(2) == "boxscore" else "feed_live"
+                body = fx.game_json(kind, int(match.group(1)))
+                return (200, "application/json", body) if body else (404, "application/json", b"{}")
+            if path == "/api/v1/people/search":
+                pid = fx.people.get(query.get("names", [""])[0].lower())
+                people = [{"id": pid}] if pid else []
+                return 200, "application/json", json.dumps({"people": people}).encode()
+            if path == "/api/v1/teams":
+                teams = [{"id": ROSTER_TEAM_ID, "name": "Fixture Roster"}]
+                return 200, "application/json", json.dumps({"teams": teams}).encode()
+            if _ROSTER_PATH.match(path):
+                roster = [{"person": {"id": pid}, "position": {"abbreviation": "P"}} for pid in fx.roster["pitchers"]]
+                roster += [{"person": {"id": pid}, "position": {"abbreviation": "DH"}} for pid in fx.roster["batters"]]
+                return 200, "application/json", json.dumps({"roster": roster}).encode()
+            if _PEOPLE_STATS_PATH.match(path):
+                return 200, "application/json", json.dumps({"stats": [{"splits": []}]}).encode()
+        elif upstream_host == "baseballsavant.mlb.com" and path == "/statcast_search/csv":
+            player_type = query.get("player_type", ["pitcher"])[0]
+            lookup = query.get("pitchers_lookup[]") or query.get("batters_lookup[]") or ["0"]
+            start = query.get("game_date_gt", ["0000-00-00"])[0]
+            end = query.get("game_date_lt", ["9999-99-99"])[0]
+            body = fx.statcast_csv(player_type, int(lookup[0]), start, end)
+            return 200, "text/csv", body.encode()
+        return 404, "application/json", b"{}"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                upstream_host, _, path = self.path.lstrip("/").partition("/")
+                parsed = urlparse(f"/{path}")
+                delay = server.latency.get(upstream_host, 0.0)
+                if delay:
+                    time.sleep(delay)
+                status, content_type, body = server.route(upstream_host, parsed.path, parse_qs(parsed.query))
+                etag = f'"{hashlib.sha1(body).hexdigest()}"'
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    status, body = 304, b""
+                server._record(endpoint_template(f"https://{upstream_host}{parsed.path}"), len(body))
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+@contextmanager
+def redirect_upstream(server):
+    """
+    Send every requests call to a STANDIN_HOSTS URL to the stand-in server instead.
+    """
+    original = requests.sessions.Session.request
+
+    def request(session, method, url, *args, **kwargs):
+        parsed = urlparse(url)
+        if parsed.netloc in STANDIN_HOSTS:
+            url = f"{server.base_url}/{parsed.netloc}{parsed.path}" + (f"?{parsed.query}" if parsed.query else "")
+        return original(session, method, url, *args, **kwargs)
+
+    requests.sessions.Session.request = request
+    try:
+        yield server
+    finally:
+        requests.sessions.Session.request = original
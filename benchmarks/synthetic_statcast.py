@@ -0,0 +1,156 @@
+# benchmarks/synthetic_statcast.py
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+# Synthetic pitch-level Statcast with league-like marginals: pitch mix per
+# pitcher (each draws a 3-6 pitch arsenal), the count distribution, pitch
+# outcomes conditioned on the count, plate-appearance events, and expected
+# stats from a launch speed/angle model. Shapes and dtypes match what
+# pybaseball returns for the columns the app reads.
+PITCH_MIX = {
+    "FF": .32, "SI": .15, "SL": .15, "CH": .11, "FC": .08, "CU": .07,
+    "ST": .06, "FS": .03, "KC": .02, "SV": .01,
+}
+
+# Share of all pitches thrown in each (balls, strikes) count
+COUNT_MIX = {
+    (0, 0): .26, (1, 0): .10, (0, 1): .13, (1, 1): .10, (2, 0): .04, (2, 1): .06,
+    (0, 2): .06, (1, 2): .10, (2, 2): .08, (3, 0): .01, (3, 1): .02, (3, 2): .04,
+}
+
+DESCRIPTIONS = ["ball", "blocked_ball", "called_strike", "swinging_strike", "swinging_strike_blocked",
+                "foul", "foul_tip", "hit_into_play", "hit_by_pitch"]
+# Baseline outcome probabilities; ahead/behind counts shift them below
+DESCRIPTION_MIX = np.array([.335, .02, .165, .10, .01, .18, .01, .175, .005])
+
+IN_PLAY_EVENTS = ["field_out", "single", "double", "triple", "home_run", "grounded_into_double_play",
+                  "force_out", "sac_fly", "field_error"]
+IN_PLAY_MIX = np.array([.615, .215, .065, .005, .045, .02, .02, .008, .007])
+
+def _normalize(p):
+    return np.asarray(p, dtype=float) / np.sum(p)
+
+def _arsenal_weights(n_pitchers, rng):
+    """
+    (n_pitchers, n_pitch_types) pitch mix: each pitcher throws 3-6 pitch types
+    drawn by league frequency, with Dirichlet weights around the league mix.
+    """
+    types = list(PITCH_MIX)
+    league = _normalize(list(PITCH_MIX.values()))
+    weights = np.zeros((n_pitchers, len(types)))
+    for i in range(n_pitchers):
+        k = rng.integers(3, 7)
+        # Flattened selection odds: picking by raw frequency overweights fastballs once renormalized
+        chosen = rng.choice(len(types), size=k, replace=False, p=_normalize(np.sqrt(league)))
+        weights[i, chosen] = rng.dirichlet(league[chosen] * 20)
+    return types, weights
+
+def _sample_rows(weights, rows, rng):
+    """
+    One categorical draw per row, from the distribution weights[rows[i]].
+    Rows are grouped by distribution, so memory stays O(n) rather than O(n * k).
+    """
+    out = np.empty(len(rows), dtype=np.int64)
+    order = np.argsort(rows, kind="stable")
+    keys, starts = np.unique(rows[order], return_index=True)
+    bounds = np.append(starts, len(rows))
+    for key, lo, hi in zip(keys, bounds[:-1], bounds[1:]):
+        out[order[lo:hi]] = rng.choice(weights.shape[1], hi - lo, p=_normalize(weights[key]))
+    return out
+
+def generate_statcast(n_pitches, n_pitchers=None, n_batters=None, season=("2025-03-27", "2025-09-28"),
+                      pitcher_ids=None, batter_ids=None, pitcher_hands=None, batter_hands=None, seed=0):
+    """
+    Generate n_pitches rows of synthetic Statcast. Player pools default to a
+    size that keeps per-player samples realistic (~3k pitches per pitcher,
+    ~2.2k per batter at full season scale); pass pitcher_ids/batter_ids (and
+    optionally their hands) to draw from a fixed roster instead.
+    """
+    rng = np.random.default_rng(seed)
+
+    if pitcher_ids is None:
+        n_pitchers = n_pitchers or max(10, n_pitches // 3000)
+        pitcher_ids = 500000 + np.arange(n_pitchers)
+    if batter_ids is None:
+        n_batters = n_batters or max(20, n_pitches // 2200)
+        batter_ids = 650000 + np.arange(n_batters)
+    pitcher_ids, batter_ids = np.asarray(pitcher_ids), np.asarray(batter_ids)
+    if pitcher_hands is None:
+        pitcher_hands = rng.choice(["R", "L"], len(pitcher_ids), p=[.72, .28])
+    if batter_hands is None:
+        batter_hands = rng.choice(["R", "L"], len(batter_ids), p=[.58, .42])
+    pitcher_hands, batter_hands = np.asarray(pitcher_hands), np.asarray(batter_hands)
+
+    # Workload is skewed: starters (~40%) throw several times as many pitches as relievers
+    starter = rng.random(len(pitcher_ids)) < 0.4
+    pitcher_share = _normalize(np.where(starter, rng.gamma(6, 0.45, len(pitcher_ids)), rng.gamma(3, 0.25, len(pitcher_ids))))
+    batter_share = _normalize(rng.gamma(2, 1, len(batter_ids)))
+    p_idx = rng.choice(len(pitcher_ids), n_pitches, p=pitcher_share)
+    b_idx = rng.choice(len(batter_ids), n_pitches, p=batter_share)
+
+    types, arsenal = _arsenal_weights(len(pitcher_ids), rng)
+    pitch_type = np.asarray(types, dtype=object)[_sample_rows(arsenal, p_idx, rng)]
+
+    counts = list(COUNT_MIX)
+    count_idx = rng.choice(len(counts), n_pitches, p=_normalize(list(COUNT_MIX.values())))
+    balls = np.array([c[0] for c in counts], dtype=np.int64)[count_idx]
+    strikes = np.array([c[1] for c in counts], dtype=np.int64)[count_idx]
+
+    # Outcome mix by count: fewer balls and more chases/fouls the further the pitcher is ahead
+    leverage = np.arange(-3, 3)  # strikes - balls
+    shift = np.zeros((len(leverage), len(DESCRIPTIONS)))
+    shift[:, 0] = -0.03 * leverage
+    shift[:, 3] = 0.015 * leverage
+    shift[:, 5] = 0.015 * leverage
+    desc_weights = np.clip(DESCRIPTION_MIX + shift, 0.001, None)
+    description = np.asarray(DESCRIPTIONS, dtype=object)[_sample_rows(desc_weights, strikes - balls + 3, rng)]
+
+    events = np.full(n_pitches, np.nan, dtype=object)
+    in_play = description == "hit_into_play"
+    events[in_play] = rng.choice(IN_PLAY_EVENTS, in_play.sum(), p=_normalize(IN_PLAY_MIX))
+    called_or_swinging = np.isin(description, ["called_strike", "swinging_strike", "swinging_strike_blocked", "foul_tip"])
+    events[called_or_swinging & (strikes == 2)] = "strikeout"
+    events[np.isin(description, ["ball", "blocked_ball"]) & (balls == 3)] = "walk"
+    events[description == "hit_by_pitch"] = "hit_by_pitch"
+
+    # Batted balls: speed/angle, and expected stats that rise with both (peaking at 10-30 degrees)
+    launch_speed = np.full(n_pitches, np.nan)
+    launch_angle = np.full(n_pitches, np.nan)
+    n_bip = in_play.sum()
+    launch_speed[in_play] = np.clip(rng.normal(88.5, 14, n_bip), 30, 121).round(1)
+    launch_angle[in_play] = np.clip(rng.normal(12, 26, n_bip), -85, 85).round(0)
+    speed_term = 1 / (1 + np.exp(-(launch_speed - 95) / 5))
+    angle_term = np.exp(-((launch_angle - 20) / 18) ** 2)
+    xba = np.clip(0.08 + 0.75 * speed_term * angle_term + rng.normal(0, 0.05, n_pitches), 0, 1).round(3)
+    xslg = np.clip(xba * (1.1 + 2.4 * speed_term * angle_term), 0, 4).round(3)
+    xwoba = np.clip(0.9 * xba + 0.25 * xslg, 0, 2).round(3)
+
+    # Non-contact plate appearance ends carry their wOBA weight; other pitches have no expected stats
+    xwoba = np.where(events == "walk", 0.69, np.where(events == "hit_by_pitch", 0.72, xwoba))
+    xwoba = np.where(events == "strikeout", 0.0, xwoba)
+    has_xwoba = in_play | np.isin(events, ["walk", "hit_by_pitch", "strikeout"])
+
+    start = date.fromisoformat(season[0])
+    n_days = (date.fromisoformat(season[1]) - start).days + 1
+    day_labels = np.array([(start + timedelta(days=d)).isoformat() for d in range(n_days)], dtype=object)
+
+    df = pd.DataFrame({
+        "pitch_type": pitch_type,
+        "game_date": day_labels[rng.integers(0, n_days, n_pitches)],
+        "batter": batter_ids[b_idx],
+        "pitcher": pitcher_ids[p_idx],
+        "events": events,
+        "description": description,
+        "stand": batter_hands[b_idx],
+        "p_throws": pitcher_hands[p_idx],
+        "balls": balls,
+        "strikes": strikes,
+        "launch_speed": launch_speed,
+        "launch_angle": launch_angle,
+        "estimated_ba_using_speedangle": np.where(in_play, xba, np.nan),
+        "estimated_slg_using_speedangle": np.where(in_play, xslg, np.nan),
+        "estimated_woba_using_speedangle": np.where(has_xwoba, xwoba, np.nan),
+    })
+    return df.sort_values("game_date", kind="stable", ignore_index=True)
@@ -0,0 +1,112 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+from utils.instrumentation import page_run, snapshot, export_json, reset_stats
+from utils import memory_monitor
+
+st.set_page_config(page_title="Diagnostics", layout="wide")
+with page_run("diagnostics"):
+    st.title("🩺 Diagnostics")
+    st.caption("Counters are per server process and reset on restart.")
+
+    data = snapshot()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "Export JSON",
+            data=export_json(),
+            file_name=f"diagnostics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+            mime="application/json",
+        )
+    with col2:
+        if st.button("Reset counters"):
+            reset_stats()
+            st.rerun()
+
+    # --- Outbound calls ---
+    st.markdown("## Upstream Endpoints")
+    if data["endpoints"]:
+        endpoints_df = pd.DataFrame([
+            {"endpoint": name, **{k: v for k, v in stats.items() if k != "histogram"}}
+            for name, stats in data["endpoints"].items()
+        ])
+        endpoints_df["total_s"] = (endpoints_df["calls"] * endpoints_df["mean_ms"] / 1000).round(1)
+        endpoints_df["KB"] = (endpoints_df["bytes"] / 1024).round(1)
+        endpoints_df = endpoints_df.drop(columns=["bytes"]).sort_values("total_s", ascending=False)
+        st.dataframe(endpoints_df, use_container_width=True, hide_index=True)
+
+        endpoint = st.selectbox("Latency histogram", endpoints_df["endpoint"])
+        histogram = data["endpoints"][endpoint]["histogram"]
+        st.bar_chart(pd.Series(histogram, name="calls"))
+    else:
+        st.info("No upstream calls recorded yet.")
+
+    # --- Cached functions ---
+    st.markdown("## Caches")
+    if data["caches"]:
+        caches_df = pd.DataFrame([
+            {"cache": name, **{k: v for k, v in stats.items() if k != "histogram"}}
+            for name, stats in data["caches"].items()
+        ]).sort_values("misses", ascending=False)
+        st.dataframe(caches_df, use_container_width=True, hide_index=True)
+    else:
+        st.info("No cache lookups recorded yet.")
+
+    # --- Page runs ---
+    st.markdown("## Recent Page Runs")
+    runs = [run for run in reversed(data["page_runs"]) if run["page"] != "diagnostics"]
+    if runs:
+        runs_df = pd.DataFrame([
+            {"page": run["page"], "started_at": run["started_at"], "elapsed_ms": run["elapsed_ms"],
+             "events": len(run["events"]), "errors": sum(e["error"] for e in run["events"])}
+            for run in runs
+        ])
+        st.dataframe(runs_df, use_container_width=True, hide_index=True)
+
+        selected = st.selectbox(
+            "Run detail",
+            range(len(runs)),
+            format_func=lambda i: f"{runs[i]['page']} @ {runs[i]['started_at']} ({runs[i]['elapsed_ms']} ms)",
+        )
+        st.dataframe(pd.DataFrame(runs[selected]["events"]), use_container_width=True, hide_index=True)
+    else:
+        st.info("No page runs recorded yet.")
+
+    # --- Memory ---
+    st.markdown("## Memory")
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Snapshot now"):
+            memory_monitor.take_snapshot()
+    with col2:
+        tracing = memory_monitor.tracemalloc.is_tracing()
+        if st.button("Stop allocation tracing" if tracing else "Start allocation tracing"):
+            memory_monitor.stop_tracing() if tracing else memory_monitor.start_tracing()
+            st.rerun()
+
+    memory_snapshots = list(memory_monitor.snapshots)
+    if memory_snapshots:
+        latest = memory_snapshots[-1]
+        st.caption(f"Snapshot at {latest['taken_at']} (every {memory_monitor.SNAPSHOT_INTERVAL:.0f}s); "
+                   f"RSS {latest['rss_mb'] or 0:.0f} MB"
+                   + (f", traced {latest['traced_mb']} MB (peak {latest['traced_peak_mb']} MB)" if latest["traced_mb"] else ""))
+        caches_df = pd.DataFrame([
+            {"namespace": name, "entries": stats["entries"], "MB": round(stats["bytes"] / 1e6, 2),
+             "budget_mb": stats["budget_mb"], "evictions": stats["evictions"]}
+            for name, stats in latest["caches"].items()
+        ]).sort_values("MB", ascending=False)
+        st.dataframe(caches_df, use_container_width=True, hide_index=True)
+
+        if len(memory_snapshots) > 1:
+            st.line_chart(pd.DataFrame(
+                {"RSS MB": [s["rss_mb"] for s in memory_snapshots]},
+                index=[s["taken_at"] for s in memory_snapshots],
+            ))
+        if latest["top_growth"]:
+            st.markdown("### Top Allocation Growth Since Previous Snapshot")
+            st.dataframe(pd.DataFrame(latest["top_growth"]), use_container_width=True, hide_index=True)
+        elif not memory_monitor.tracemalloc.is_tracing():
+            st.info("Allocation tracing is off; start it (or set MEMORY_TRACE=1) to see growth by allocation site.")
+    else:
+        st.info("No memory snapshots yet.")
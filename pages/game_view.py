@@ -4,18 +4,23 @@ import os
 # Add the parent directory to the system path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from utils.style_utils import get_red_shade, get_pitcher_red_green_shade, get_pitcher_blue_red_shade
+from utils.style_utils import get_red_shade
 from utils.lineup_utils import get_game_lineups, get_live_lineup
 from utils.mlb_api import (
     get_probable_pitchers_for_date, 
     get_game_state, 
     get_pitcher_advanced_metrics_by_name, 
-    get_batter_advanced_metrics_by_name,
-    get_pitcher_arsenal_from_api
+    get_batter_advanced_metrics_by_name
 )
-from utils.style_helpers import sanitize_numeric_columns
+from utils.style_helpers import style_pitcher_table
 from utils.scoreboard_utils import render_scoreboard
+from utils.fragment_cache import cached_fragment
+from utils.stat_utils import get_batter_k_rate_by_id
+from utils.count_index import warm_count_index
+from utils.live_accumulator import update_live_counts, get_season_plus_today_arsenal
+from utils.player_registry import lookup_player_id
 from utils.formatting_utils import format_baseball_stats
+from utils.instrumentation import page_run, span
 import streamlit as st
 from urllib.parse import unquote, quote
 from datetime import datetime
@@ -24,138 +29,120 @@ import pandas as pd
 from concurrent.futures import ThreadPoolExecutor
 
 st.set_page_config(page_title="Matchup View", layout="wide")
+with page_run("game_view"):
+    # --- Query Params ---
+    query_params = st.query_params
+    home = unquote(query_params.get("home", "Unknown"))
+    away = unquote(query_params.get("away", "Unknown"))
+    game_time_utc = query_params.get("time", "Unknown")
 
-# --- Query Params ---
-query_params = st.query_params
-home = unquote(query_params.get("home", "Unknown"))
-away = unquote(query_params.get("away", "Unknown"))
-game_time_utc = query_params.get("time", "Unknown")
-
-# --- Convert to EST ---
-try:
-    utc_dt = datetime.fromisoformat(game_time_utc.replace("Z", "+00:00"))
-    eastern = pytz.timezone("US/Eastern")
-    est_dt = utc_dt.astimezone(eastern)
-    formatted_time = est_dt.strftime("%B %d, %Y at %I:%M %p EST")
-    date_only = est_dt.strftime("%Y-%m-%d")
-except Exception:
-    formatted_time = game_time_utc
-    date_only = game_time_utc.split("T")[0] if "T" in game_time_utc else "Unknown"
-
-# --- Header ---
-st.title(f"\U0001F3DF️ {away} @ {home}")
-st.markdown(f"\U0001F552 **Game Time:** {formatted_time}")
-st.markdown("---")
-
-# --- Get Probable Pitchers ---
-probables_map = get_probable_pitchers_for_date(date_only)
-probables = probables_map.get(f"{away} @ {home}", {})
-away_pitcher = probables.get("away_pitcher")
-home_pitcher = probables.get("home_pitcher")
-
-# --- Get GamePK & Lineups ---
-lineup_map = get_game_lineups(date_only)
-game_pk = lineup_map.get(f"{away} @ {home}", {}).get("gamePk")
-
-# --- Use live active lineup (only 9 players currently in batting order) ---
-away_lineup_raw, home_lineup_raw = get_live_lineup(game_pk, starters_only=True) if game_pk else ([], [])
-
-# --- Scoreboard Render ---
-if game_pk:
-    render_scoreboard(game_pk, home_team=home, away_team=away)
-
-# --- Extract Starters and Subs ---
-away_lineup = away_lineup_raw
-home_lineup = home_lineup_raw
-
-# --- Fallback Pitcher ---
-def fallback_pitcher_from_lineup(lineup):
-    return next((p.replace(" - P", "") for p in lineup if " - P" in p), "Not Announced")
-
-if not away_pitcher or away_pitcher == "Not Announced":
-    away_pitcher = fallback_pitcher_from_lineup(away_lineup)
-if not home_pitcher or home_pitcher == "Not Announced":
-    home_pitcher = fallback_pitcher_from_lineup(home_lineup)
-
-st.write("gamePk:", game_pk)
-
-# --- Lineup Renderer ---
-# --- Lineup Renderer ---
-def render_lineup(pitcher_name, lineup, team_name):
-    pitch_types = []
-    arsenal_df = None
-
-    st.markdown(f"<h4 style='margin-bottom: 0.25rem;'>{team_name} Starting Pitcher</h4>", unsafe_allow_html=True)
-    st.markdown(f"<p style='margin-top: -0.5rem; margin-bottom: 0.5rem;'>{pitcher_name or 'Not announced yet.'}</p>", unsafe_allow_html=True)
-
-    st.markdown("<h4 style='margin-bottom: 0.5rem;'>Pitch Arsenal</h4>", unsafe_allow_html=True)
-
-    if pitcher_name and pitcher_name != "Not Announced":
-        # Fetch the pitch arsenal (types, PA, etc.) using the correct function
-        arsenal_df = get_pitcher_arsenal_from_api(pitcher_name)  # Use this function for pitch arsenal data
-        
-        # Debugging to check what data we are getting
-        st.write(f"Pitch Arsenal for {pitcher_name}: {arsenal_df}")
-
-        if isinstance(arsenal_df, pd.DataFrame) and not arsenal_df.empty:
-            # ✅ Sanitize numerical columns
-            arsenal_df = sanitize_numeric_columns(arsenal_df, ["PA", "BA", "SLG", "wOBA", "K%", "Whiff%", "PutAway%"])
-
-            # ✅ Pre-format values to 3 decimal places, strip trailing 0s
-            stat_cols = ["BA", "SLG", "wOBA", "K%", "Whiff%", "PutAway%"]
-            for col in stat_cols:
-                if col in arsenal_df.columns:
-                    arsenal_df[col] = arsenal_df[col].map(lambda x: f"{x:.3f}".rstrip("0").rstrip(".") if pd.notnull(x) else "-")
-
-            # ✅ Display the arsenal in a nice table
-            display_df = arsenal_df[["pitch_type", "PA", "BA", "SLG", "wOBA", "K%", "Whiff%", "PutAway%"]].fillna("-")
-
-            st.dataframe(
-                display_df.style
-                    .map(get_pitcher_blue_red_shade, subset=["BA", "SLG", "wOBA"])
-                    .map(lambda v: get_pitcher_red_green_shade(v, high_is_good=True), subset=["K%", "Whiff%", "PutAway%"]),
-                use_container_width=True
-            )
+    # --- Convert to EST ---
+    try:
+        utc_dt = datetime.fromisoformat(game_time_utc.replace("Z", "+00:00"))
+        eastern = pytz.timezone("US/Eastern")
+        est_dt = utc_dt.astimezone(eastern)
+        formatted_time = est_dt.strftime("%B %d, %Y at %I:%M %p EST")
+        date_only = est_dt.strftime("%Y-%m-%d")
+    except Exception:
+        formatted_time = game_time_utc
+        date_only = game_time_utc.split("T")[0] if "T" in game_time_utc else "Unknown"
+
+    # --- Header ---
+    st.title(f"\U0001F3DF️ {away} @ {home}")
+    st.markdown(f"\U0001F552 **Game Time:** {formatted_time}")
+    st.markdown("---")
+
+    # --- Get Probable Pitchers ---
+    with span("probable_pitchers"):
+        probables_map = get_probable_pitchers_for_date(date_only)
+    probables = probables_map.get(f"{away} @ {home}", {})
+    away_pitcher = probables.get("away_pitcher")
+    home_pitcher = probables.get("home_pitcher")
+
+    # --- Get GamePK & Lineups ---
+    with span("lineups"):
+        lineup_map = get_game_lineups(date_only)
+        game_pk = lineup_map.get(f"{away} @ {home}", {}).get("gamePk")
+
+        # --- Use live active lineup (only 9 players currently in batting order) ---
+        away_lineup_raw, home_lineup_raw = get_live_lineup(game_pk, starters_only=True) if game_pk else ([], [])
+
+    # --- Scoreboard Render ---
+    if game_pk:
+        with span("scoreboard"):
+            render_scoreboard(game_pk, home_team=home, away_team=away)
+            update_live_counts(game_pk)  # Fold pitches thrown since the last refresh into today's arsenals
+
+    # --- Extract Starters and Subs ---
+    away_lineup = away_lineup_raw
+    home_lineup = home_lineup_raw
+
+    # --- Fallback Pitcher ---
+    def fallback_pitcher_from_lineup(lineup):
+        return next((p.name for p in lineup if p.position == "P"), "Not Announced")
+
+    if not away_pitcher or away_pitcher == "Not Announced":
+        away_pitcher = fallback_pitcher_from_lineup(away_lineup)
+    if not home_pitcher or home_pitcher == "Not Announced":
+        home_pitcher = fallback_pitcher_from_lineup(home_lineup)
+
+    # --- Lineup Renderer ---
+    # --- Lineup Renderer ---
+    def render_lineup(pitcher_name, lineup, team_name):
+        pitch_types = []
+        arsenal_df = None
+
+        st.markdown(f"<h4 style='margin-bottom: 0.25rem;'>{team_name} Starting Pitcher</h4>", unsafe_allow_html=True)
+        st.markdown(f"<p style='margin-top: -0.5rem; margin-bottom: 0.5rem;'>{pitcher_name or 'Not announced yet.'}</p>", unsafe_allow_html=True)
+
+        st.markdown("<h4 style='margin-bottom: 0.5rem;'>Pitch Arsenal</h4>", unsafe_allow_html=True)
 
-            pitch_types = display_df["pitch_type"].tolist()
-        else:
-            st.warning(f"No pitch data found for {pitcher_name}.")
-    
-    height = len(arsenal_df) if arsenal_df is not None else 0
-    return pitch_types, lineup, team_name, pitcher_name, height
+        if pitcher_name and pitcher_name != "Not Announced":
+            # Season through yesterday plus today's pitches from the live feed
+            pitcher_id = lookup_player_id(pitcher_name)
+            arsenal_df = get_season_plus_today_arsenal(pitcher_id) if pitcher_id else None
 
+            if isinstance(arsenal_df, pd.DataFrame) and not arsenal_df.empty:
+                display_df = format_baseball_stats(arsenal_df)[["pitch_type", "PA", "BA", "SLG", "wOBA", "K%", "Whiff%", "PutAway%"]].fillna("-")
 
+                st.dataframe(style_pitcher_table(display_df), use_container_width=True)
 
+                pitch_types = display_df["pitch_type"].tolist()
+            else:
+                st.warning(f"No pitch data found for {pitcher_name}.")
 
-# --- Fetch Batter K% Stats ---
-def fetch_batter_k_rates(batters):
-    stats = {}
+        height = len(arsenal_df) if arsenal_df is not None else 0
+        return pitch_types, lineup, team_name, pitcher_name, height
 
-    def fetch_and_store(batter):
-        stats[batter] = get_batter_k_rate_by_pitch(batter) or {}
 
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        executor.map(fetch_and_store, batters)
 
-    return stats
 
-# Gather all unique batters from both lineups
-all_batters = list({player.split(" - ")[0].strip() for player in away_lineup + home_lineup if player.strip()})
+    # --- Fetch Batter K% Stats ---
+    def fetch_batter_k_rates(batters):
+        stats = {}
 
-# Fetch K% data for all batters in parallel
-away_k_rate_lookup = fetch_batter_k_rates(home_pitcher)  # Away team batters vs home pitcher
-home_k_rate_lookup = fetch_batter_k_rates(away_pitcher)  # Home team batters vs away pitcher
+        def fetch_and_store(batter):
+            stats[batter.id] = get_batter_k_rate_by_id(batter.id) or {}
 
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            executor.map(fetch_and_store, batters)
 
-# --- Batting Lineup Renderer ---
-def render_batting_lineup(pitch_types, pitcher_name, lineup, team_name, k_rate_lookup):
-    st.subheader(f"{team_name} Batting Lineup")
+        return stats
 
-    if not lineup:
-        st.info("Batting order not available yet.")
-        return
+    # Fetch K% data for all batters in parallel, keyed by player ID
+    with span("batter_k_rates"):
+        away_k_rate_lookup = fetch_batter_k_rates(away_lineup)  # Away team batters vs home pitcher
+        home_k_rate_lookup = fetch_batter_k_rates(home_lineup)  # Home team batters vs away pitcher
 
-    st.markdown("""<style>
+    # --- Index per-count splits for the live scoreboard (batter cubes are cached by the K% fetch) ---
+    warm_count_index(
+        pitcher_ids=[lookup_player_id(p) for p in (away_pitcher, home_pitcher) if p and p != "Not Announced"],
+        batter_ids=[player.id for player in away_lineup + home_lineup],
+    )
+
+
+    # --- Lineup Table CSS (emitted once per page, shared by both lineups) ---
+    LINEUP_TABLE_CSS = """<style>
         .lineup-wrapper {
             overflow-x: auto;
             padding-bottom: 1rem;
@@ -225,65 +212,89 @@ def render_batting_lineup(pitch_types, pitcher_name, lineup, team_name, k_rate_l
                 min-width: 100%;
             }
         }
-    </style>""", unsafe_allow_html=True)
-
-    # Table headers
-    headers = "<tr><th>#</th><th>Batter</th>"
-    for pitch in pitch_types:
-        headers += f"<th>{pitch} K%</th>"
-    headers += "<th>View Matchup</th></tr>"
-
-    rows = ""
-    for i, player in enumerate(lineup):
-        if player.strip() == "":
-            row = f"<tr><td>-</td><td>-</td>"
-            for _ in pitch_types:
-                row += "<td>-</td>"
-            row += "<td>-</td></tr>"
-            rows += row
-            continue
+    </style>"""
 
-        batter_name = player.split(" - ")[0].strip()
-        k_vals = k_rate_lookup.get(batter_name, {})
 
-        row = f"<tr><td>{i+1}</td><td><strong>{batter_name}</strong></td>"
+    # --- Batting Lineup Renderer ---
+    def render_batting_lineup(pitch_types, pitcher_name, lineup, team_name, k_rate_lookup):
+        st.subheader(f"{team_name} Batting Lineup")
 
-        for pitch in pitch_types:
-            val = k_vals.get(pitch, "0.0%")
-            style = get_red_shade(val)
-            row += f"<td style='{style}'>{val}</td>"
-
-        matchup_url = (
-            f"/matchup_view?batter={quote(batter_name)}"
-            f"&team={quote(team_name)}"
-            f"&home={quote(home)}"
-            f"&away={quote(away)}"
-            f"&home_pitcher={quote(home_pitcher)}"
-            f"&away_pitcher={quote(away_pitcher)}"
+        if not lineup:
+            st.info("Batting order not available yet.")
+            return
+
+        # Only this lineup's K% rows feed the HTML, so only they belong in the key
+        lineup_ids = [player.id for player in lineup]
+        lineup_k_rates = {player_id: k_rate_lookup.get(player_id, {}) for player_id in lineup_ids}
+        table_html = cached_fragment(
+            "batting_lineup",
+            (pitch_types, lineup_ids, team_name, lineup_k_rates, home, away, home_pitcher, away_pitcher),
+            lambda: build_batting_lineup_html(pitch_types, lineup, team_name, k_rate_lookup)
         )
+        st.markdown(table_html, unsafe_allow_html=True)
+
 
-        row += f"<td><a href='{matchup_url}'>View Matchup</a></td></tr>"
+    def build_batting_lineup_html(pitch_types, lineup, team_name, k_rate_lookup):
 
-        rows += row
+        # Table headers
+        headers = "<tr><th>#</th><th>Batter</th>"
+        for pitch in pitch_types:
+            headers += f"<th>{pitch} K%</th>"
+        headers += "<th>View Matchup</th></tr>"
+
+        rows = ""
+        for i, player in enumerate(lineup):
+            if player is None:
+                row = f"<tr><td>-</td><td>-</td>"
+                for _ in pitch_types:
+                    row += "<td>-</td>"
+                row += "<td>-</td></tr>"
+                rows += row
+                continue
+
+            batter_name = player.name
+            k_vals = k_rate_lookup.get(player.id, {})
+
+            row = f"<tr><td>{i+1}</td><td><strong>{batter_name}</strong></td>"
+
+            for pitch in pitch_types:
+                val = k_vals.get(pitch, "0.0%")
+                style = get_red_shade(val)
+                row += f"<td style='{style}'>{val}</td>"
+
+            matchup_url = (
+                f"/matchup_view?batter={quote(batter_name)}"
+                f"&batter_id={player.id}"
+                f"&team={quote(team_name)}"
+                f"&home={quote(home)}"
+                f"&away={quote(away)}"
+                f"&home_pitcher={quote(home_pitcher)}"
+                f"&away_pitcher={quote(away_pitcher)}"
+            )
+
+            row += f"<td><a href='{matchup_url}'>View Matchup</a></td></tr>"
+
+            rows += row
 
-    table_html = f"""
-        <div class="lineup-wrapper">
-            <table class="lineup-table">
-                <thead>{headers}</thead>
-                <tbody>{rows}</tbody>
-            </table>
-        </div>
-    """
-    st.markdown(table_html, unsafe_allow_html=True)
+        table_html = f"""
+            <div class="lineup-wrapper">
+                <table class="lineup-table">
+                    <thead>{headers}</thead>
+                    <tbody>{rows}</tbody>
+                </table>
+            </div>
+        """
+        return table_html
 
 
-# --- Render Columns Side-by-Side ---
-col1, col2 = st.columns(2)
+    # --- Render Columns Side-by-Side ---
+    st.markdown(LINEUP_TABLE_CSS, unsafe_allow_html=True)
+    col1, col2 = st.columns(2)
 
-with col1:
-    pt_1, lu_1, tn_1, pn_1, h1 = render_lineup(away_pitcher, away_lineup, away)
-    render_batting_lineup(pt_1, pn_1, away_lineup, away, away_k_rate_lookup)
+    with col1, span("away_lineup"):
+        pt_1, lu_1, tn_1, pn_1, h1 = render_lineup(away_pitcher, away_lineup, away)
+        render_batting_lineup(pt_1, pn_1, away_lineup, away, away_k_rate_lookup)
 
-with col2:
-    pt_2, lu_2, tn_2, pn_2, h2 = render_lineup(home_pitcher, home_lineup, home)
-    render_batting_lineup(pt_2, pn_2, home_lineup, home, home_k_rate_lookup)
+    with col2, span("home_lineup"):
+        pt_2, lu_2, tn_2, pn_2, h2 = render_lineup(home_pitcher, home_lineup, home)
+        render_batting_lineup(pt_2, pn_2, home_lineup, home, home_k_rate_lookup)
@@ -0,0 +1,67 @@
+import pstats
+import streamlit as st
+import pandas as pd
+from utils.instrumentation import page_run
+from utils.profiling import PROFILE_DIR, MAX_PROFILES, list_profiles, delete_profile
+
+st.set_page_config(page_title="Profiles", layout="wide")
+with page_run("profiles"):
+    st.title("⏱️ Page Profiles")
+    st.caption(
+        f"Runs are profiled when the server has PROFILE_PAGES=1 or the page URL has ?profile=1. "
+        f"The newest {MAX_PROFILES} are kept in {PROFILE_DIR}."
+    )
+
+    profiles = list_profiles()
+    if not profiles:
+        st.info("No profiles saved yet.")
+    else:
+        profiles_df = pd.DataFrame([
+            {"page": p["page"], "started_at": p["started_at"], "elapsed_ms": p["elapsed_ms"],
+             "samples": p["samples"], "status": p["status"]}
+            for p in profiles
+        ])
+        st.dataframe(profiles_df, use_container_width=True, hide_index=True)
+
+        selected = st.selectbox(
+            "Profile",
+            range(len(profiles)),
+            format_func=lambda i: f"{profiles[i]['page']} @ {profiles[i]['started_at']} ({profiles[i]['elapsed_ms']} ms)",
+        )
+        profile = profiles[selected]
+        files = profile["files"]
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            if "prof" in files:
+                st.download_button("Download pstats (.prof)", data=(PROFILE_DIR / files["prof"]).read_bytes(),
+                                   file_name=files["prof"], mime="application/octet-stream")
+        with col2:
+            st.download_button("Download collapsed stacks (.folded)", data=(PROFILE_DIR / files["folded"]).read_bytes(),
+                               file_name=files["folded"], mime="text/plain")
+        with col3:
+            if st.button("Delete profile"):
+                delete_profile(profile["id"])
+                st.rerun()
+
+        # --- Top functions (cProfile) ---
+        if "prof" in files:
+            st.markdown("### Top Functions by Cumulative Time")
+            stats = pstats.Stats(str(PROFILE_DIR / files["prof"]))
+            rows = [
+                {"function": f"{func} ({filename.rsplit('/', 1)[-1]}:{line})", "calls": nc,
+                 "tottime_s": round(tt, 4), "cumtime_s": round(ct, 4)}
+                for (filename, line, func), (cc, nc, tt, ct, callers) in stats.stats.items()
+            ]
+            top_df = pd.DataFrame(rows).sort_values("cumtime_s", ascending=False).head(30)
+            st.dataframe(top_df, use_container_width=True, hide_index=True)
+
+        # --- Hottest stacks (sampler) ---
+        st.markdown("### Hottest Sampled Stacks")
+        lines = (PROFILE_DIR / files["folded"]).read_text().splitlines()
+        stacks = [line.rsplit(" ", 1) for line in lines if line]
+        if stacks:
+            stacks_df = pd.DataFrame([{"leaf": s.split(";")[-1], "samples": int(n), "stack": s} for s, n in stacks[:30]])
+            st.dataframe(stacks_df, use_container_width=True, hide_index=True)
+        else:
+            st.info("The run finished before the first stack sample.")
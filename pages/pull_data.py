@@ -5,38 +5,42 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import streamlit as st
+import pandas as pd
 from utils.stat_utils import get_pitcher_stats, get_batter_metrics_by_pitch
-from utils.schedule_utils import fetch_schedule_by_date
-from utils.mlb_api import get_player_id
+from utils import schedule_store
+from utils.schedule_utils import get_games_between
+from utils.player_registry import lookup_player_id
 from datetime import datetime
+from utils.instrumentation import page_run
 
-st.title("📊 Manual Stat & Schedule Pull")
+with page_run("pull_data"):
+    st.title("📊 Manual Stat & Schedule Pull")
 
-# Pitcher Stats Section
-st.header("Pull Pitcher Stats")
-pitcher_name = st.text_input("Enter Pitcher Name (e.g. 'Jacob deGrom')")
-if st.button("Fetch Pitcher Stats"):
-    if pitcher_name:
-        df = get_pitcher_stats(pitcher_name, refresh=True)
-        st.success(f"Pulled {len(df)} pitch types for {pitcher_name}")
-        st.dataframe(df)
-
-# Batter Stats Section
-st.header("Pull Batter Stats")
-batter_name = st.text_input("Enter Batter Name (e.g. 'Mookie Betts')")
-if st.button("Fetch Batter Stats"):
-    if batter_name:
-        first, last = batter_name.strip().split(" ", 1)
-        batter_id = get_player_id(first, last)
-        if batter_id:
-            df = get_batter_metrics_by_pitch(batter_id, refresh=True)
-            st.success(f"Pulled batter stats for {batter_name}")
+    # Pitcher Stats Section
+    st.header("Pull Pitcher Stats")
+    pitcher_name = st.text_input("Enter Pitcher Name (e.g. 'Jacob deGrom')")
+    if st.button("Fetch Pitcher Stats"):
+        if pitcher_name:
+            df = get_pitcher_stats(pitcher_name, refresh=True)
+            st.success(f"Pulled {len(df)} pitch types for {pitcher_name}")
             st.dataframe(df)
 
-# Schedule Section
-st.header("Refresh Game Schedule")
-if st.button("Fetch Today's Schedule"):
-    today = datetime.now().strftime("%Y-%m-%d")
-    schedule_df = fetch_schedule_by_date(today)
-    st.success("MLB schedule refreshed.")
-    st.dataframe(schedule_df)
+    # Batter Stats Section
+    st.header("Pull Batter Stats")
+    batter_name = st.text_input("Enter Batter Name (e.g. 'Mookie Betts')")
+    if st.button("Fetch Batter Stats"):
+        if batter_name:
+            batter_id = lookup_player_id(batter_name)
+            if batter_id:
+                df = get_batter_metrics_by_pitch(batter_id, refresh=True)
+                st.success(f"Pulled batter stats for {batter_name}")
+                st.dataframe(df)
+
+    # Schedule Section
+    st.header("Refresh Game Schedule")
+    if st.button("Fetch Today's Schedule"):
+        today = datetime.now().date()
+        schedule_store.get_season_schedule(today.year, force_refresh=True)
+        schedule_df = pd.DataFrame(get_games_between(today, today))
+        st.success("MLB schedule refreshed.")
+        st.dataframe(schedule_df)
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+from datetime import datetime
+from utils.pitch_store import build_pitch_store, PITCH_STORE_DIR
+from utils.xba_grid import build_xba_grid
+from utils.statcast_chunks import fetch_statcast_range
+from utils.lazy_imports import pybaseball_function
+
+def run_pitch_store_build(start_date, end_date, store_dir=PITCH_STORE_DIR):
+    print(f"⚾ Pulling league-wide Statcast {start_date} → {end_date}")
+    df = fetch_statcast_range(pybaseball_function("statcast"), "league", start_date, end_date)
+    if df.empty:
+        print("[WARN] No pitches returned; store not rebuilt.")
+        return None
+    meta = build_pitch_store(df, store_dir, start_date, end_date)
+    build_xba_grid(df, os.path.join(store_dir, "xba_grid.npz"))
+    return meta
+
+if __name__ == "__main__":
+    season = datetime.now().year
+    parser = argparse.ArgumentParser(description="Build the memory-mapped pitch store.")
+    parser.add_argument("--start", default=f"{season}-03-01")
+    parser.add_argument("--end", default=datetime.now().strftime("%Y-%m-%d"))
+    parser.add_argument("--store-dir", default=str(PITCH_STORE_DIR))
+    args = parser.parse_args()
+    run_pitch_store_build(args.start, args.end, args.store_dir)
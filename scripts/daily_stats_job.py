@@ -10,6 +10,8 @@ import pandas as pd
 from datetime import datetime
 from utils.stat_utils import get_batter_metrics_by_pitch, get_pitcher_arsenal_stats
 from utils.team_utils import get_all_mlb_players
+from utils.league_sketches import build_league_sketches
+from utils import disk_cache
 from pathlib import Path
 
 # Output directory
@@ -22,7 +24,9 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 def save_stats_to_csv(data, filename):
     file_path = DATA_DIR / filename
-    data.to_csv(file_path, index=False)
+    # Plain CSV (it is published for download), renamed into place so readers never see half a file
+    with disk_cache.atomic_path(file_path) as tmp_path:
+        data.to_csv(tmp_path, index=False)
     print(f"[✓] Saved: {file_path}")
 
 def run_daily_stat_pull():
@@ -36,8 +40,7 @@ def run_daily_stat_pull():
     for batter_id in all_players["batters"]:
         batter_stats = get_batter_metrics_by_pitch(batter_id)
         if not batter_stats.empty:
-            batter_stats["batter_id"] = batter_id
-            batter_data.append(batter_stats)
+            batter_data.append(batter_stats.assign(batter_id=batter_id))
 
     df_batters = pd.concat(batter_data, ignore_index=True)
     save_stats_to_csv(df_batters, f"batters_by_pitch_{datetime.today().date()}.csv")
@@ -47,12 +50,14 @@ def run_daily_stat_pull():
     for pitcher_id in all_players["pitchers"]:
         pitcher_stats = get_pitcher_arsenal_stats(pitcher_id)
         if not pitcher_stats.empty:
-            pitcher_stats["pitcher_id"] = pitcher_id
-            pitcher_data.append(pitcher_stats)
+            pitcher_data.append(pitcher_stats.assign(pitcher_id=pitcher_id))
 
     df_pitchers = pd.concat(pitcher_data, ignore_index=True)
     save_stats_to_csv(df_pitchers, f"pitchers_by_pitch_{datetime.today().date()}.csv")
 
+    # --- League distributions for percentile shading ---
+    build_league_sketches(df_pitchers, df_batters, DATA_DIR / "league_sketches.json")
+
     print("✅ Stat pull complete.")
 
 if __name__ == "__main__":
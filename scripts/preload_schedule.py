@@ -5,6 +5,7 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from utils.schedule_utils import fetch_schedule_by_date
+from utils.schedule_store import get_season_schedule
 from datetime import datetime, timedelta
 
 import warnings
@@ -15,3 +16,6 @@ print("⏰ Preloading MLB schedule for today and tomorrow...")
 for offset in range(2):  # Today and tomorrow
     target_date = datetime.utcnow().date() + timedelta(days=offset)
     fetch_schedule_by_date(datetime.combine(target_date, datetime.min.time()), force_refresh=True)
+
+print("⏰ Reloading this season's schedule store...")
+get_season_schedule(datetime.utcnow().year, force_refresh=True)
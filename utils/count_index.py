@@ -0,0 +1,85 @@
+# utils/count_index.py
+import threading
+import time
+
+import numpy as np
+
+from utils.memory_monitor import register_cache
+from utils.stat_cube import C, MAX_BALLS, MAX_STRIKES
+from utils.stat_utils import PITCH_TYPE_MAP, get_pitcher_cube, get_batter_cube
+from utils.live_accumulator import season_end_date
+
+# Precomputed per-count lookups for the live scoreboard:
+#   (pitcher_id, balls, strikes) -> pitch mix at that count
+#   (batter_id, balls, strikes)  -> batter Whiff% / K% at that count
+# Filled from the cached pitch cubes when a game page loads its players, so
+# a refresh tick only does dict lookups (no network, no aggregation).
+INDEX_TTL = 600
+
+pitcher_count_index = {}
+batter_count_index = {}
+indexed_at = {}
+_index_lock = threading.Lock()
+# Entries are only rebuilt when indexed_at expires, so these are sized but never trimmed
+register_cache("count_index.pitcher_count_index", pitcher_count_index, _index_lock, evictable=False)
+register_cache("count_index.batter_count_index", batter_count_index, _index_lock, evictable=False)
+
+def index_pitcher(pitcher_id, cube):
+    entries = {}
+    for balls in range(MAX_BALLS):
+        for strikes in range(MAX_STRIKES):
+            pitches = cube.select(pitcher_id, balls=balls, strikes=strikes)[:, C["pitches"]]
+            total = pitches.sum()
+            if not total:
+                continue
+            order = np.argsort(-pitches)
+            entries[(pitcher_id, balls, strikes)] = [
+                (PITCH_TYPE_MAP.get(cube.pitch_types[i], cube.pitch_types[i]), round(float(pitches[i] / total * 100), 1))
+                for i in order if pitches[i] > 0
+            ]
+    with _index_lock:
+        pitcher_count_index.update(entries)
+        indexed_at[("pitcher", pitcher_id)] = time.time()
+
+def index_batter(batter_id, cube):
+    entries = {}
+    for balls in range(MAX_BALLS):
+        for strikes in range(MAX_STRIKES):
+            totals = cube.select(batter_id, balls=balls, strikes=strikes).sum(axis=0)
+            pitches = totals[C["pitches"]]
+            if not pitches:
+                continue
+            entries[(batter_id, balls, strikes)] = {
+                "pitches": int(pitches),
+                "Whiff%": round(float(totals[C["whiffs"]] / pitches * 100), 1),
+                "K%": round(float(totals[C["strikeouts"]] / pitches * 100), 1),
+            }
+    with _index_lock:
+        batter_count_index.update(entries)
+        indexed_at[("batter", batter_id)] = time.time()
+
+def _is_fresh(role, player_id):
+    return time.time() - indexed_at.get((role, player_id), 0) < INDEX_TTL
+
+def warm_count_index(pitcher_ids=(), batter_ids=()):
+    """
+    Index any of the given players not indexed within INDEX_TTL.
+    Called from page loads, never from the scoreboard refresh path.
+    """
+    for pitcher_id in filter(None, pitcher_ids):
+        if not _is_fresh("pitcher", pitcher_id):
+            # Same window as game_view's arsenal table, so both read one cached cube
+            cube = get_pitcher_cube(pitcher_id, end_date=season_end_date())
+            if cube is not None:
+                index_pitcher(pitcher_id, cube)
+    for batter_id in filter(None, batter_ids):
+        if not _is_fresh("batter", batter_id):
+            cube = get_batter_cube(batter_id)
+            if cube is not None:
+                index_batter(batter_id, cube)
+
+def lookup_pitch_mix(pitcher_id, balls, strikes):
+    return pitcher_count_index.get((pitcher_id, balls, strikes))
+
+def lookup_batter_count(batter_id, balls, strikes):
+    return batter_count_index.get((batter_id, balls, strikes))
@@ -0,0 +1,169 @@
+# utils/disk_cache.py
+import contextlib
+import gzip
+import io
+import json
+import os
+import struct
+import tempfile
+import threading
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Non-POSIX: writes stay atomic, but refreshes aren't coordinated across processes
+    fcntl = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Shared read/write path for every on-disk cache (schedules, league
+# sketches, the player index, Statcast chunk manifests) and the atomic
+# rename behind the daily stats snapshots.
+# Several Streamlit workers share these files, so:
+#   - writes go to a temp file in the same directory and are renamed into
+#     place, so a reader sees the old file or the new one, never half of one;
+#   - refreshes take an advisory lock on "<file>.lock", so when a key goes
+#     stale one process refetches it and the others wait and read its result;
+#   - payloads are gzip-compressed behind an 8-byte header: magic, format
+#     version, codec, two reserved bytes. Every worker writes gzip, so any
+#     worker can read any file; zstd files are readable where zstandard is
+#     installed.
+# Files without the header are read as plain bytes, so caches written before
+# this module (e.g. the committed cached_schedules/*.json) still load.
+MAGIC = b"PSDC"
+FORMAT_VERSION = 1
+HEADER = struct.Struct(">4sBBxx")
+CODEC_NONE, CODEC_GZIP, CODEC_ZSTD = 0, 1, 2
+DEFAULT_CODEC = CODEC_GZIP
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+LOCK_SUFFIX = ".lock"
+
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+class DiskCacheError(ValueError):
+    """Raised for cache files with a bad header or a codec this process can't decode."""
+
+
+def _compress(payload, codec):
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(payload)
+    if codec == CODEC_GZIP:
+        return gzip.compress(payload, compresslevel=GZIP_LEVEL, mtime=0)
+    return payload
+
+def _decompress(body, codec):
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise DiskCacheError("file is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(body)
+    if codec == CODEC_GZIP:
+        return gzip.decompress(body)
+    if codec == CODEC_NONE:
+        return body
+    raise DiskCacheError(f"unknown codec {codec}")
+
+def encode(payload, codec=None):
+    codec = DEFAULT_CODEC if codec is None else codec
+    return HEADER.pack(MAGIC, FORMAT_VERSION, codec) + _compress(payload, codec)
+
+def decode(data):
+    """
+    Payload bytes from a cache file's contents. Data without the header is
+    returned unchanged (a legacy plain file).
+    """
+    if not data.startswith(MAGIC):
+        return data
+    if len(data) < HEADER.size:
+        raise DiskCacheError("truncated header")
+    _, version, codec = HEADER.unpack_from(data)
+    if version != FORMAT_VERSION:
+        raise DiskCacheError(f"unsupported format version {version}")
+    return _decompress(data[HEADER.size:], codec)
+
+
+# --- Atomic writes ---
+@contextlib.contextmanager
+def atomic_path(path):
+    """
+    Yield a temp path next to `path`; when the block exits cleanly the temp
+    file replaces `path` in one rename, otherwise it is removed. For writers
+    that produce their own file format (e.g. DataFrame.to_feather).
+    """
+    path = os.fspath(path)
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+        raise
+
+def write_bytes(path, payload, codec=None):
+    with atomic_path(path) as tmp_path:
+        with open(tmp_path, "wb") as f:
+            f.write(encode(payload, codec))
+
+def read_bytes(path):
+    """
+    Decoded payload, or None if the file doesn't exist.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    return decode(data)
+
+
+# --- Typed helpers ---
+def write_json(path, value, codec=None):
+    write_bytes(path, json.dumps(value, separators=(",", ":")).encode("utf-8"), codec)
+
+def read_json(path):
+    payload = read_bytes(path)
+    return None if payload is None else json.loads(payload)
+
+def read_frame(path):
+    """
+    DataFrame from a CSV file, plain or written through write_bytes. None if absent.
+    """
+    payload = read_bytes(path)
+    return None if payload is None else pd.read_csv(io.BytesIO(payload))
+
+
+# --- Refresh locks ---
+def _thread_lock(path):
+    with _thread_locks_guard:
+        return _thread_locks.setdefault(path, threading.Lock())
+
+@contextlib.contextmanager
+def locked(path):
+    """
+    Hold the refresh lock for the cache file at `path`: an advisory flock on
+    "<path>.lock" across processes, plus a thread lock within this one.
+    Readers don't need it; writes are atomic either way. Refreshers take it,
+    then re-read the file before refetching, since another process may have
+    refreshed the key while they waited.
+    """
+    path = os.path.abspath(os.fspath(path))
+    with _thread_lock(path):
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + LOCK_SUFFIX, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
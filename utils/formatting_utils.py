@@ -3,21 +3,32 @@
 import sys
 import os
 
+import numpy as np
 import pandas as pd
 
 # Add the parent directory to the system path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+def format_decimal_strings(values: pd.Series, trim_zeros=False) -> pd.Series:
+    """
+    Vectorized 3-decimal string formatting for a numeric column. NaN stays NaN.
+    With trim_zeros=True, trailing zeros and a dangling '.' are stripped ("0.250" -> "0.25").
+    """
+    arr = values.to_numpy(dtype=float, na_value=np.nan)
+    mask = np.isnan(arr)
+    text = np.char.mod("%.3f", np.where(mask, 0.0, arr))
+    if trim_zeros:
+        text = np.char.rstrip(np.char.rstrip(text, "0"), ".")
+    out = pd.Series(text, index=values.index, name=values.name, dtype=object)
+    out[mask] = np.nan
+    return out
+
 def format_baseball_stats(df: pd.DataFrame) -> pd.DataFrame:
     formatted_df = df.copy()
     float_cols = formatted_df.select_dtypes(include=["float", "float64"]).columns
 
     for col in float_cols:
-        # Format numbers to 3 decimal places, remove trailing zeros, and ensure 0 is displayed as 0.000
-        formatted_df[col] = formatted_df[col].map(
-            lambda x: f"{x:.3f}" if pd.notnull(x) else x
-        )
-        # Ensure all 0 values are formatted as '0.000'
-        formatted_df[col] = formatted_df[col].replace("0", "0.000")
+        # Format numbers to 3 decimal places (0 is displayed as 0.000)
+        formatted_df[col] = format_decimal_strings(formatted_df[col])
 
     return formatted_df
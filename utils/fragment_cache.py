@@ -0,0 +1,63 @@
+# utils/fragment_cache.py
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from utils.instrumentation import record_cache
+from utils.memory_monitor import register_cache
+
+# Rendered HTML fragments shared by every session in the process.
+# Keyed by (namespace, state hash) so an unchanged game state or lineup
+# returns the previously built markup instead of re-rendering it.
+MAX_FRAGMENTS = 512
+
+fragment_cache = OrderedDict()
+_fragment_lock = threading.Lock()
+register_cache("fragment_cache", fragment_cache, _fragment_lock)
+
+def state_hash(*parts):
+    """
+    Stable hash of arbitrary JSON-like input state (dicts, lists, tuples, scalars).
+    Dict keys are sorted so equal states always hash the same.
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+def get_fragment(namespace, key):
+    with _fragment_lock:
+        html = fragment_cache.get((namespace, key))
+        if html is not None:
+            fragment_cache.move_to_end((namespace, key))
+        return html
+
+def put_fragment(namespace, key, html):
+    with _fragment_lock:
+        fragment_cache[(namespace, key)] = html
+        fragment_cache.move_to_end((namespace, key))
+        while len(fragment_cache) > MAX_FRAGMENTS:
+            fragment_cache.popitem(last=False)
+    return html
+
+def cached_fragment(namespace, state, build):
+    """
+    Return the HTML for `state`, calling `build()` only when this exact state
+    has not been rendered before.
+    """
+    start = time.perf_counter()
+    key = state_hash(state)
+    html = get_fragment(namespace, key)
+    hit = html is not None
+    if not hit:
+        html = put_fragment(namespace, key, build())
+    record_cache(f"fragment.{namespace}", hit, time.perf_counter() - start)
+    return html
+
+def clear_fragments(namespace=None):
+    with _fragment_lock:
+        if namespace is None:
+            fragment_cache.clear()
+            return
+        for key in [k for k in fragment_cache if k[0] == namespace]:
+            del fragment_cache[key]
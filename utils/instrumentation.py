@@ -0,0 +1,266 @@
+# utils/instrumentation.py
+import functools
+import json
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlparse
+
+import numpy as np
+
+from utils.memory_monitor import register_cached_function, start_memory_monitor
+from utils.profiling import finish_page_profile, start_page_profile
+
+# Process-wide counters for outbound calls and cached functions, plus a short
+# history of page runs broken into spans. Everything is plain in-memory
+# state read by the diagnostics page and exportable as JSON.
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+MAX_PAGE_RUNS = 100
+MAX_RUN_EVENTS = 500  # per page run; later events still count toward the totals
+
+_ID_SEGMENT = re.compile(r"^(\d+|\d{4}-\d{2}-\d{2})$")
+
+def endpoint_template(url):
+    """
+    Collapse a URL to its endpoint: host + path with ids and dates replaced,
+    query string dropped. ".../game/745123/feed/live" -> ".../game/{id}/feed/live".
+    """
+    parsed = urlparse(url)
+    segments = ["{id}" if _ID_SEGMENT.match(seg) else seg for seg in parsed.path.split("/")]
+    return f"{parsed.netloc}{'/'.join(segments)}"
+
+
+class EndpointStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.bytes = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)  # last bucket is overflow
+
+    def record(self, ms, nbytes, error):
+        self.calls += 1
+        self.errors += int(error)
+        self.bytes += nbytes
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.buckets[int(np.searchsorted(LATENCY_BUCKETS_MS, ms))] += 1
+
+    def percentile(self, q):
+        """
+        Approximate latency percentile (upper bucket bound, ms) from the histogram.
+        """
+        if not self.calls:
+            return None
+        rank = q * self.calls
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "mean_ms": round(self.total_ms / self.calls, 1) if self.calls else None,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max_ms, 1),
+            "histogram": dict(zip([f"<={b}" for b in LATENCY_BUCKETS_MS] + ["over"], self.buckets)),
+        }
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.latency = EndpointStats()
+
+    def to_dict(self):
+        calls = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / calls, 3) if calls else None,
+            **{k: v for k, v in self.latency.to_dict().items() if k not in ("calls", "bytes")},
+        }
+
+
+endpoint_stats = {}
+cache_stats = {}
+page_runs = deque(maxlen=MAX_PAGE_RUNS)
+_stats_lock = threading.Lock()
+_local = threading.local()
+
+def payload_size(result):
+    """
+    Bytes of a response body, or in-memory size of a DataFrame result.
+    """
+    content = getattr(result, "content", None)
+    if isinstance(content, bytes):
+        return len(content)
+    if hasattr(result, "memory_usage"):
+        return int(result.memory_usage(index=False).sum())
+    return 0
+
+def record_call(endpoint, seconds, nbytes=0, error=False):
+    ms = seconds * 1000
+    with _stats_lock:
+        endpoint_stats.setdefault(endpoint, EndpointStats()).record(ms, nbytes, error)
+    _add_to_run("call", endpoint, ms, error)
+
+def record_cache(name, hit, seconds, error=False):
+    ms = seconds * 1000
+    with _stats_lock:
+        stats = cache_stats.setdefault(name, CacheStats())
+        if hit:
+            stats.hits += 1
+        else:
+            stats.misses += 1
+        stats.latency.record(ms, 0, error)
+
+# --- Cached functions ---
+def instrumented_cache(cache_decorator, name=None):
+    """
+    Apply cache_decorator (e.g. st.cache_data(ttl=600)) to a function and
+    record per-call latency and hit/miss. A call is a miss when the function
+    body actually ran underneath the cache. Use in place of the cache decorator.
+    """
+    def decorator(fn):
+        label = name or f"{fn.__module__.split('.')[-1]}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def body(*args, **kwargs):
+            frames = getattr(_local, "cache_frames", None)
+            if frames:
+                frames[-1] = True
+            return fn(*args, **kwargs)
+
+        cached = cache_decorator(body)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            frames = _local.__dict__.setdefault("cache_frames", [])
+            frames.append(False)
+            start = time.perf_counter()
+            error = False
+            try:
+                return cached(*args, **kwargs)
+            except BaseException:
+                error = True
+                raise
+            finally:
+                missed = frames.pop()
+                seconds = time.perf_counter() - start
+                record_cache(label, not missed, seconds, error)
+                _add_to_run("cache", f"{label} ({'miss' if missed else 'hit'})", seconds * 1000, error)
+
+        wrapper.clear = getattr(cached, "clear", None)
+        register_cached_function(f"{fn.__module__}.{fn.__qualname__}", wrapper.clear)
+        return wrapper
+    return decorator
+
+
+# --- Page runs and spans ---
+def begin_page_run(page):
+    """
+    Start recording a page run for the current script thread. Spans, calls and
+    cache lookups until the next begin_page_run are attributed to it. Pages
+    use page_run, which also closes the run and its profile.
+    """
+    run = {
+        "page": page,
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "start": time.perf_counter(),
+        "elapsed_ms": 0.0,
+        "events": [],
+    }
+    _local.page_run = run
+    with _stats_lock:
+        page_runs.append(run)
+    start_memory_monitor()
+    return run
+
+def end_page_run():
+    """
+    Record the current page run's final elapsed time.
+    """
+    run = getattr(_local, "page_run", None)
+    if run is not None:
+        run["elapsed_ms"] = round((time.perf_counter() - run["start"]) * 1000, 1)
+
+@contextmanager
+def page_run(page):
+    """
+    Record one run of a page script; wrap the whole page body in it. Starts a
+    profile when one is requested (see utils/profiling.py) and saves it however
+    the script ends: normally, on st.stop() or a rerun ("interrupted"), or on
+    an exception ("error").
+    """
+    begin_page_run(page)
+    profile = start_page_profile(page)
+    status = "complete"
+    try:
+        yield
+    except Exception:
+        status = "error"
+        raise
+    except BaseException:  # Streamlit's StopException / RerunException
+        status = "interrupted"
+        raise
+    finally:
+        end_page_run()
+        finish_page_profile(profile, status)
+
+def _add_to_run(kind, name, ms, error=False):
+    run = getattr(_local, "page_run", None)
+    if run is None:
+        return
+    if len(run["events"]) < MAX_RUN_EVENTS:
+        run["events"].append({"kind": kind, "name": name, "ms": round(ms, 1), "error": error})
+    run["elapsed_ms"] = round((time.perf_counter() - run["start"]) * 1000, 1)
+
+@contextmanager
+def span(name):
+    """
+    Time a section of a page run (e.g. "scoreboard", "lineups").
+    """
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        _add_to_run("span", name, (time.perf_counter() - start) * 1000, error)
+
+
+# --- Export ---
+def snapshot():
+    with _stats_lock:
+        return {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "endpoints": {name: stats.to_dict() for name, stats in endpoint_stats.items()},
+            "caches": {name: stats.to_dict() for name, stats in cache_stats.items()},
+            "page_runs": [
+                {k: v for k, v in run.items() if k != "start"}
+                for run in page_runs
+            ],
+        }
+
+def export_json():
+    return json.dumps(snapshot(), indent=2, default=str)
+
+def reset_stats():
+    with _stats_lock:
+        endpoint_stats.clear()
+        cache_stats.clear()
+        page_runs.clear()
@@ -0,0 +1,29 @@
+# utils/lazy_imports.py
+import importlib
+
+# Accessors for packages that are slow to import and only needed on some
+# code paths. pybaseball pulls in matplotlib, PyGithub and its own data
+# sources (~1 s); scipy.spatial is only used for large similarity indexes;
+# streamlit_autorefresh only by pages that refresh. Importing them here, on
+# first use, keeps page and script start-up to what the run actually needs.
+# (Python caches the module after the first call, so later calls are cheap.)
+def pybaseball():
+    return importlib.import_module("pybaseball")
+
+def pybaseball_function(name):
+    """
+    A pybaseball fetcher by name ("statcast", "statcast_pitcher", ...).
+    """
+    return getattr(pybaseball(), name)
+
+def kd_tree_class():
+    """
+    scipy's cKDTree, or None when scipy is not installed.
+    """
+    try:
+        return importlib.import_module("scipy.spatial").cKDTree
+    except ImportError:
+        return None
+
+def st_autorefresh():
+    return importlib.import_module("streamlit_autorefresh").st_autorefresh
@@ -0,0 +1,108 @@
+# utils/league_sketches.py
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils import disk_cache
+
+# Compact league distributions for percentile-based shading. The daily job
+# stores 101 quantiles (0th..100th percentile) per role, metric and pitch
+# type; the style layer maps a value to its league percentile with a binary
+# search into those quantiles instead of scanning the league per render.
+if os.environ.get("RENDER"):
+    SKETCH_PATH = Path("/data/daily_stats/league_sketches.json")
+else:
+    SKETCH_PATH = Path("data/daily_stats/league_sketches.json")
+
+SKETCH_METRICS = ["BA", "SLG", "wOBA", "K%", "Whiff%", "PutAway%"]
+QUANTILE_POINTS = np.linspace(0, 1, 101)
+MIN_PITCHES = 25  # rows with fewer pitches are too noisy to shape the distribution
+ALL_PITCHES = "ALL"
+
+def _quantiles(values):
+    values = pd.to_numeric(values, errors="coerce").dropna().to_numpy(dtype=float)
+    if len(values) < 2:
+        return None
+    return np.round(np.quantile(values, QUANTILE_POINTS), 5).tolist()
+
+def build_role_sketches(df: pd.DataFrame):
+    """
+    {pitch_type: {metric: [101 quantiles]}} from a per-player, per-pitch summary
+    frame, plus an ALL entry across pitch types.
+    """
+    if "PA" in df.columns:
+        df = df[df["PA"] >= MIN_PITCHES]
+    sketches = {}
+    groups = [(ALL_PITCHES, df)] + list(df.groupby("pitch_type")) if "pitch_type" in df.columns else [(ALL_PITCHES, df)]
+    for pitch_type, group in groups:
+        metrics = {}
+        for metric in SKETCH_METRICS:
+            if metric in group.columns:
+                quantiles = _quantiles(group[metric])
+                if quantiles:
+                    metrics[metric] = quantiles
+        if metrics:
+            sketches[str(pitch_type)] = metrics
+    return sketches
+
+def build_league_sketches(df_pitchers: pd.DataFrame, df_batters: pd.DataFrame, path=SKETCH_PATH):
+    sketches = {
+        "pitcher": build_role_sketches(df_pitchers),
+        "batter": build_role_sketches(df_batters),
+    }
+    path = Path(path)
+    disk_cache.write_json(path, sketches)
+    print(f"[✓] Saved league sketches: {path}")
+    return sketches
+
+
+_sketches = None
+_sketches_mtime = None
+_sketch_lock = threading.Lock()
+
+def get_league_sketches(path=SKETCH_PATH):
+    """
+    Saved sketches, reloaded when the daily job rewrites the file. None if absent.
+    """
+    global _sketches, _sketches_mtime
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    with _sketch_lock:
+        if mtime != _sketches_mtime:
+            _sketches = {
+                role: {pt: {m: np.asarray(q) for m, q in metrics.items()} for pt, metrics in by_pitch.items()}
+                for role, by_pitch in (disk_cache.read_json(path) or {}).items()
+            }
+            _sketches_mtime = mtime
+        return _sketches
+
+def has_sketch(role, metric):
+    sketches = get_league_sketches()
+    return bool(sketches and metric in sketches.get(role, {}).get(ALL_PITCHES, {}))
+
+def league_percentiles(role, metric, values, pitch_types=None):
+    """
+    Map values (array-like) to league percentiles in [0, 1] for a role and metric,
+    using each row's pitch-type distribution when one exists. NaN stays NaN.
+    """
+    values = np.asarray(values, dtype=float)
+    result = np.full(values.shape, np.nan)
+    sketches = get_league_sketches()
+    by_pitch = (sketches or {}).get(role, {})
+    if metric not in by_pitch.get(ALL_PITCHES, {}):
+        return result
+
+    if pitch_types is None:
+        pitch_types = np.full(values.shape, ALL_PITCHES, dtype=object)
+    pitch_types = np.asarray(pitch_types, dtype=object)
+    for pitch_type in pd.unique(pitch_types):
+        rows = pitch_types == pitch_type
+        quantiles = by_pitch.get(pitch_type, {}).get(metric, by_pitch[ALL_PITCHES][metric])
+        result[rows] = np.interp(values[rows], quantiles, QUANTILE_POINTS)
+    result[np.isnan(values)] = np.nan
+    return result
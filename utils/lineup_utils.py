@@ -1,12 +1,14 @@
 # lineup_utils.py
-import requests
+from utils.upstream import http_get
+from utils.mlb_api import get_live_feed
+from utils.player_registry import register_from_boxscore, register_game_players
 from datetime import datetime, timedelta
 import pytz
 
 # --- Get games for a specific date ---
 def get_game_lineups(game_date: str):
     url = f"https://statsapi.mlb.com/api/v1/schedule/games/?sportId=1&date={game_date}"
-    resp = requests.get(url)
+    resp = http_get(url)
     if resp.status_code != 200:
         return {}
 
@@ -23,56 +25,68 @@ def get_game_lineups(game_date: str):
         }
     return lineup_data
 
+# --- Handedness for boxscore players ---
+def fill_handedness(game_pk, *lineups):
+    """
+    Boxscores don't carry bats/throws; when a lineup player's are unknown,
+    register them from the game's live feed (cached, and read by the scoreboard anyway).
+    """
+    if all(player.bats and player.throws for lineup in lineups for player in lineup if player is not None):
+        return
+    data = get_live_feed(game_pk)
+    if data:
+        register_game_players(data.get("gameData", {}).get("players", {}))
+
 # --- Extract boxscore lineups (partial data for starters) ---
 def get_lineup_for_game(game_pk: int):
     url = f"https://statsapi.mlb.com/api/v1/game/{game_pk}/boxscore"
-    resp = requests.get(url)
+    resp = http_get(url)
     if resp.status_code != 200:
         return None, None
 
     data = resp.json()
-    home_players = data['teams']['home']['players']
-    away_players = data['teams']['away']['players']
 
-    def extract_lineup(players):
+    def extract_lineup(team_data):
+        team_name = team_data.get("team", {}).get("name")
         lineup = []
-        for pid, player in players.items():
+        for pid, player in team_data["players"].items():
             try:
                 pos = player['position']['abbreviation']
                 if pos in ["P", "1B", "2B", "3B", "SS", "LF", "CF", "RF", "DH", "C"]:
-                    lineup.append(f"{player['person']['fullName']} - {pos}")
+                    lineup.append(register_from_boxscore(player, team=team_name))
             except:
                 continue
         return lineup
 
-    return extract_lineup(away_players), extract_lineup(home_players)
+    away_lineup, home_lineup = extract_lineup(data['teams']['away']), extract_lineup(data['teams']['home'])
+    fill_handedness(game_pk, away_lineup, home_lineup)
+    return away_lineup, home_lineup
 
 # --- Pull live game lineups (includes real-time battingOrder) ---
 
 
 def get_live_lineup(game_pk: int, starters_only=True):
     url = f"https://statsapi.mlb.com/api/v1/game/{game_pk}/boxscore"
-    resp = requests.get(url)
+    resp = http_get(url)
     if not resp.ok:
         return [], []
 
     data = resp.json()
-    away_players = data["teams"]["away"]["players"]
-    home_players = data["teams"]["home"]["players"]
 
-    def extract_active_lineup(players):
+    def extract_active_lineup(team_data):
+        team_name = team_data.get("team", {}).get("name")
         lineup = []
-        for pid, player in players.items():
+        for pid, player in team_data["players"].items():
             if "battingOrder" in player:
                 order = int(player["battingOrder"])
-                name = player["person"]["fullName"]
-                pos = player.get("position", {}).get("abbreviation", "")
-                lineup.append((order, f"{name} - {pos}"))
+                lineup.append((order, register_from_boxscore(player, team=team_name)))
 
         lineup.sort(key=lambda x: x[0])
         return [p for _, p in lineup[:9]] if starters_only else [p for _, p in lineup]
 
-    return extract_active_lineup(away_players), extract_active_lineup(home_players)
+    away_lineup, home_lineup = extract_active_lineup(data["teams"]["away"]), extract_active_lineup(data["teams"]["home"])
+    fill_handedness(game_pk, away_lineup, home_lineup)
+    return away_lineup, home_lineup
 
 
 
@@ -86,7 +100,7 @@ def get_official_lineups(game_pk):
 
     # Fetch game preview
     preview_url = f"https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live"
-    resp = requests.get(preview_url)
+    resp = http_get(preview_url)
     if not resp.ok:
         return get_lineup_for_game(game_pk)
 
@@ -0,0 +1,166 @@
+# utils/live_accumulator.py
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytz
+
+from utils.memory_monitor import register_cache
+from utils.mlb_api import get_live_feed
+from utils.stat_cube import StatCube, combine_cubes, COUNTERS, C, HANDS, MAX_BALLS, MAX_STRIKES
+from utils.stat_utils import PITCH_TYPE_MAP, get_pitcher_cube
+
+# Folds pitches from the live feed (allPlays[].playEvents) into in-memory
+# "today" counters with the same layout as the season StatCube. Each game
+# remembers how far into allPlays it has read, so an update only touches
+# pitches thrown since the last one. Counters are keyed by the game's
+# official date (US Eastern), and days before today are dropped on each
+# update, so the counters only ever hold today's games.
+CUBE_SHAPE = (len(HANDS), MAX_BALLS, MAX_STRIKES, len(COUNTERS))
+EASTERN = pytz.timezone("US/Eastern")
+
+# (game_date, role, player_id) -> {pitch_type: counters array of CUBE_SHAPE}
+today_counts = {}
+# game_pk -> read position in the feed (and the game's date)
+game_progress = {}
+_accumulator_lock = threading.Lock()
+# Bounded to one day by _drop_past_days; evicting would lose pitches already read past
+register_cache("live_accumulator.today_counts", today_counts, _accumulator_lock, evictable=False)
+
+def _statcast_description(details):
+    """
+    Map a live-feed pitch call to the Statcast description vocabulary.
+    """
+    text = details.get("description", "").lower()
+    if text.startswith("in play"):
+        return "hit_into_play"
+    return text.replace(" (", "_").replace(")", "").replace(" ", "_")
+
+def _today():
+    return datetime.now(EASTERN).strftime("%Y-%m-%d")
+
+def season_end_date():
+    """
+    Last day the season cubes cover when combined with today's counters (yesterday,
+    US Eastern), so pitches Statcast has already published for today aren't counted twice.
+    """
+    return (datetime.now(EASTERN) - timedelta(days=1)).strftime("%Y-%m-%d")
+
+def _drop_past_days(today):
+    for key in [key for key in today_counts if key[0] < today]:
+        del today_counts[key]
+    for game_pk in [pk for pk, progress in game_progress.items() if progress["date"] < today]:
+        del game_progress[game_pk]
+
+def _bucket(game_date, role, player_id, pitch_type):
+    buckets = today_counts.setdefault((game_date, role, player_id), {})
+    if pitch_type not in buckets:
+        buckets[pitch_type] = np.zeros(CUBE_SHAPE)
+    return buckets[pitch_type]
+
+def _hand_index(code):
+    return HANDS.index(code) if code in HANDS[:2] else HANDS.index("?")
+
+def _fold_pitch(game_date, pitch):
+    description = pitch["description"]
+    row = np.zeros(len(COUNTERS))
+    row[C["pitches"]] = 1
+    row[C["whiffs"]] = "swinging_strike" in description
+    row[C["putaways"]] = "swinging_strike" in description or "strikeout" in description
+    for role, player_id, hand in [
+        ("pitcher", pitch["pitcher_id"], pitch["bat_side"]),
+        ("batter", pitch["batter_id"], pitch["pitch_hand"]),
+    ]:
+        _bucket(game_date, role, player_id, pitch["pitch_type"])[_hand_index(hand), pitch["balls"], pitch["strikes"]] += row
+
+def _fold_strikeout(game_date, pitch):
+    for role, player_id, hand in [
+        ("pitcher", pitch["pitcher_id"], pitch["bat_side"]),
+        ("batter", pitch["batter_id"], pitch["pitch_hand"]),
+    ]:
+        _bucket(game_date, role, player_id, pitch["pitch_type"])[_hand_index(hand), pitch["balls"], pitch["strikes"], C["strikeouts"]] += 1
+
+def update_live_counts(game_pk):
+    """
+    Read pitches added to the game's live feed since the last call and fold
+    them into today's counters. Games from earlier days are not counted.
+    Returns the number of new pitches.
+    """
+    data = get_live_feed(game_pk)
+    if not data:
+        return 0
+    plays = data.get("liveData", {}).get("plays", {}).get("allPlays", [])
+    today = _today()
+    game_date = data.get("gameData", {}).get("datetime", {}).get("officialDate") or today
+
+    new_pitches = 0
+    with _accumulator_lock:
+        _drop_past_days(today)
+        if game_date < today:
+            return 0
+        progress = game_progress.setdefault(
+            game_pk, {"date": game_date, "play": 0, "event": 0, "count": (0, 0), "last_pitch": None})
+        for play_index in range(progress["play"], len(plays)):
+            play = plays[play_index]
+            matchup = play.get("matchup", {})
+            events = play.get("playEvents", [])
+            start = progress["event"] if play_index == progress["play"] else 0
+            if start == 0:
+                progress["count"], progress["last_pitch"] = (0, 0), None
+
+            for event in events[start:]:
+                if event.get("isPitch") and event.get("details", {}).get("type", {}).get("code"):
+                    balls, strikes = progress["count"]
+                    pitch = {
+                        "pitcher_id": matchup.get("pitcher", {}).get("id"),
+                        "batter_id": matchup.get("batter", {}).get("id"),
+                        "bat_side": matchup.get("batSide", {}).get("code"),
+                        "pitch_hand": matchup.get("pitchHand", {}).get("code"),
+                        "pitch_type": event["details"]["type"]["code"],
+                        "description": _statcast_description(event["details"]),
+                        "balls": min(balls, MAX_BALLS - 1),
+                        "strikes": min(strikes, MAX_STRIKES - 1),
+                    }
+                    _fold_pitch(game_date, pitch)
+                    progress["last_pitch"] = pitch
+                    new_pitches += 1
+                count = event.get("count", {})
+                progress["count"] = (count.get("balls", 0), count.get("strikes", 0))
+
+            if not play.get("about", {}).get("isComplete"):
+                # Current at-bat: resume from this event on the next update
+                progress["play"], progress["event"] = play_index, len(events)
+                break
+
+            if play.get("result", {}).get("eventType") == "strikeout" and progress["last_pitch"]:
+                _fold_strikeout(game_date, progress["last_pitch"])
+            progress["play"], progress["event"] = play_index + 1, 0
+    return new_pitches
+
+def get_today_cube(role, player_id):
+    """
+    Today's counters for one player as a single-player StatCube (None if no pitches).
+    """
+    with _accumulator_lock:
+        buckets = today_counts.get((_today(), role, player_id))
+        if not buckets:
+            return None
+        pitch_types = sorted(buckets)
+        counts = np.stack([buckets[code] for code in pitch_types])[np.newaxis].copy()
+    return StatCube(np.array([player_id], dtype=np.int64), pitch_types, counts)
+
+def get_today_arsenal(pitcher_id):
+    cube = get_today_cube("pitcher", pitcher_id)
+    if cube is None:
+        return None
+    return cube.pitch_type_summary(pitcher_id, PITCH_TYPE_MAP)
+
+def get_season_plus_today_arsenal(pitcher_id, start_date="2024-03-01"):
+    """
+    Season arsenal through yesterday plus today's live pitches, as one table (None if no pitches).
+    """
+    combined = combine_cubes(get_pitcher_cube(pitcher_id, start_date, season_end_date()),
+                             get_today_cube("pitcher", pitcher_id))
+    if not len(combined.players):
+        return None
+    return combined.pitch_type_summary(pitcher_id, PITCH_TYPE_MAP)
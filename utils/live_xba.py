@@ -0,0 +1,73 @@
+# utils/live_xba.py
+import threading
+from datetime import datetime
+
+import pytz
+
+from utils.memory_monitor import register_cache
+from utils.xba_grid import lookup_xba
+
+# Team expected BA for live games, accumulated from hitData as plays complete.
+# Each game remembers the last play index it processed, so a refresh only
+# looks at plays added since the previous one. Games dated before today
+# (US Eastern) are dropped on each update.
+STRIKEOUT_EVENTS = {"strikeout", "strikeout_double_play", "strikeout_triple_play"}
+SACRIFICE_EVENTS = {"sac_fly", "sac_bunt", "sac_fly_double_play", "sac_bunt_double_play"}
+
+EASTERN = pytz.timezone("US/Eastern")
+
+# game_pk -> {"date": str, "next_play": int, "away": [xba_sum, at_bats], "home": [xba_sum, at_bats]}
+team_xba_progress = {}
+_xba_lock = threading.Lock()
+# An evicted game is simply re-read from its first play on the next update
+register_cache("live_xba.team_xba_progress", team_xba_progress, _xba_lock)
+
+def _drop_past_days(today):
+    for game_pk in [pk for pk, progress in team_xba_progress.items() if progress["date"] < today]:
+        del team_xba_progress[game_pk]
+
+def _batted_ball(play):
+    for event in reversed(play.get("playEvents", [])):
+        hit = event.get("hitData")
+        if hit and hit.get("launchSpeed") is not None and hit.get("launchAngle") is not None:
+            return hit["launchSpeed"], hit["launchAngle"]
+    return None
+
+def update_team_xba(game_pk, data):
+    """
+    Fold completed plays since the last call into each team's xBA totals and
+    return {"away": ".xxx", "home": ".xxx"} (".000" until a grid/at-bat exists).
+    """
+    plays = data.get("liveData", {}).get("plays", {}).get("allPlays", [])
+    today = datetime.now(EASTERN).strftime("%Y-%m-%d")
+    game_date = data.get("gameData", {}).get("datetime", {}).get("officialDate") or today
+
+    with _xba_lock:
+        _drop_past_days(today)
+        progress = team_xba_progress.setdefault(
+            game_pk, {"date": game_date, "next_play": 0, "away": [0.0, 0], "home": [0.0, 0]})
+        for play in plays[progress["next_play"]:]:
+            if not play.get("about", {}).get("isComplete"):
+                break
+            progress["next_play"] += 1
+
+            team = "away" if play.get("about", {}).get("halfInning") == "top" else "home"
+            event_type = play.get("result", {}).get("eventType", "")
+            if event_type in STRIKEOUT_EVENTS:
+                progress[team][1] += 1
+                continue
+
+            batted = _batted_ball(play)
+            if batted is None or event_type in SACRIFICE_EVENTS:
+                continue
+            xba = lookup_xba(*batted)
+            if xba is None:
+                continue
+            progress[team][0] += xba
+            progress[team][1] += 1
+
+        result = {}
+        for team in ("away", "home"):
+            xba_sum, at_bats = progress[team]
+            result[team] = f"{xba_sum / at_bats:.3f}".lstrip("0") if at_bats else ".000"
+        return result
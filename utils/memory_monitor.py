@@ -0,0 +1,332 @@
+# utils/memory_monitor.py
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Memory accounting for the long-lived server process. In-process caches
+# register themselves here by name; a background thread periodically sizes
+# every namespace (entries and deep bytes), evicts the oldest entries of any
+# namespace over its budget, and, when tracing is on, diffs tracemalloc
+# snapshots to show which allocation sites grew since the last check.
+# st.cache_data functions are sized from Streamlit's own cache stats and, as
+# Streamlit has no per-entry eviction, are cleared whole when over budget.
+SNAPSHOT_INTERVAL = float(os.environ.get("MEMORY_SNAPSHOT_INTERVAL", "300"))  # seconds
+TRACE_ON_START = os.environ.get("MEMORY_TRACE", "").lower() in ("1", "true", "yes")
+TRACE_FRAMES = int(os.environ.get("MEMORY_TRACE_FRAMES", "1"))
+MAX_SNAPSHOTS = 48
+TOP_SITES = 25
+ST_CACHE_PREFIX = "st.cache_data:"
+SHARED_FRAMES = "shared_frames"
+
+# Per-namespace budgets in MB; MEMORY_BUDGETS_MB="name=mb,name=mb" overrides or adds to these
+DEFAULT_BUDGETS_MB = {
+    "fragment_cache": 32,
+    "mlb_api.live_feed_cache": 64,
+    "mlb_api.stats_cache": 32,
+    "mlb_api.batter_stats_cache": 32,
+    "upstream.last_good_values": 128,
+    SHARED_FRAMES: 512,
+}
+
+def _parse_budgets(spec):
+    budgets = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, mb = item.rpartition("=")
+        try:
+            budgets[name.strip()] = float(mb)
+        except ValueError:
+            print(f"[WARN] Ignoring memory budget {item!r}")
+    return budgets
+
+budgets_mb = {**DEFAULT_BUDGETS_MB, **_parse_budgets(os.environ.get("MEMORY_BUDGETS_MB", ""))}
+
+registered_caches = {}
+cached_function_clearers = {}
+evictions = {}
+snapshots = deque(maxlen=MAX_SNAPSHOTS)
+
+_monitor_lock = threading.Lock()
+_monitor_thread = None
+_last_trace = None
+
+class RegisteredCache:
+    def __init__(self, container, lock=None, evictable=True):
+        self.container = container  # dict-like; iteration order is oldest first
+        self.lock = lock
+        self.evictable = evictable
+
+    def items(self):
+        if self.lock is None:
+            return list(self.container.items())
+        with self.lock:
+            return list(self.container.items())
+
+    def evict_oldest(self, count):
+        removed = 0
+        if self.lock is not None:
+            self.lock.acquire()
+        try:
+            while removed < count and self.container:
+                try:
+                    self.container.pop(next(iter(self.container)), None)
+                except RuntimeError:
+                    continue  # an unlocked dict changed size under us; retry
+                removed += 1
+        finally:
+            if self.lock is not None:
+                self.lock.release()
+        return removed
+
+
+def register_cache(name, container, lock=None, evictable=True):
+    """
+    Account for a module-level dict cache under `name`. Pass the lock that
+    guards it, if any; evictable=False for caches other state depends on
+    (they are sized but never trimmed).
+    """
+    registered_caches[name] = RegisteredCache(container, lock, evictable)
+    return container
+
+def register_cached_function(cache_name, clear):
+    """
+    Remember how to clear an st.cache_data function, keyed by Streamlit's
+    cache name ("module.qualname").
+    """
+    if clear is not None:
+        cached_function_clearers[cache_name] = clear
+
+
+# --- Sizing ---
+def deep_size(obj):
+    """
+    Approximate bytes held by obj: DataFrames and arrays by their buffers,
+    containers and plain objects by walking their contents once.
+    """
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        if isinstance(item, (pd.DataFrame, pd.Series, pd.Index)):
+            usage = item.memory_usage(deep=True)
+            total += int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+            continue
+        if isinstance(item, np.ndarray):
+            if item.base is None:
+                total += item.nbytes
+            else:
+                stack.append(item.base)  # views share their base's buffer; count it once
+            continue
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        elif hasattr(item, "__dict__") and not isinstance(item, type):
+            stack.append(item.__dict__)
+        elif hasattr(item, "__slots__"):
+            stack.extend(getattr(item, slot) for slot in item.__slots__ if hasattr(item, slot))
+    return total
+
+def _entry_sizes(cache):
+    return [(key, deep_size(key) + deep_size(value)) for key, value in cache.items()]
+
+def _st_cache_usage():
+    """
+    {cache name: bytes} for st.cache_data functions. Streamlit reports one
+    total per function, not per key, so there is no entry count to give.
+    """
+    try:
+        from streamlit.runtime.caching import cache_data_api
+        stats = cache_data_api.get_data_cache_stats_provider().get_stats()
+    except Exception:
+        return {}
+    usage = {}
+    for stat in (stats.values() if isinstance(stats, dict) else [stats]):
+        for entry in stat:
+            usage[entry.cache_name] = usage.get(entry.cache_name, 0) + entry.byte_length
+    return usage
+
+def _shared_frame_files():
+    from utils.shared_frame_cache import SHARED_CACHE_DIR
+    if not os.path.isdir(SHARED_CACHE_DIR):
+        return []
+    files = []
+    for entry in os.scandir(SHARED_CACHE_DIR):
+        try:
+            if entry.name.endswith(".arrow"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.path, stat.st_size))
+        except FileNotFoundError:
+            continue
+    return sorted(files)
+
+def cache_usage():
+    """
+    {namespace: {"entries", "bytes", "budget_mb"}} for every registered cache,
+    each st.cache_data function and the shared Arrow frames. "entries" is None
+    for st.cache_data functions (Streamlit only reports their bytes).
+    """
+    usage = {}
+    for name, cache in list(registered_caches.items()):
+        sizes = _entry_sizes(cache)
+        usage[name] = {"entries": len(sizes), "bytes": sum(size for _, size in sizes)}
+    for name, nbytes in _st_cache_usage().items():
+        usage[f"{ST_CACHE_PREFIX}{name}"] = {"entries": None, "bytes": nbytes}
+    files = _shared_frame_files()
+    usage[SHARED_FRAMES] = {"entries": len(files), "bytes": sum(size for _, _, size in files)}
+    for name, stats in usage.items():
+        stats["budget_mb"] = budgets_mb.get(name)
+        stats["evictions"] = evictions.get(name, 0)
+    return usage
+
+
+# --- Budgets ---
+def _record_eviction(name, count, nbytes, budget, cleared=False):
+    evictions[name] = evictions.get(name, 0) + count
+    what = "Cleared" if cleared else f"Evicted {count} entries from"
+    print(f"[MEMORY] {what} {name} ({nbytes / 1e6:.1f} MB > {budget:g} MB budget)")
+
+def enforce_budgets(usage=None):
+    """
+    Trim every namespace that is over its budget, oldest entries first.
+    Returns {namespace: entries evicted} (1 for a cleared st.cache_data function).
+    """
+    usage = usage or cache_usage()
+    evicted = {}
+    for name, stats in usage.items():
+        budget = budgets_mb.get(name)
+        if budget is None or stats["bytes"] <= budget * 1e6:
+            continue
+
+        if name in registered_caches:
+            cache = registered_caches[name]
+            if not cache.evictable:
+                continue
+            excess = stats["bytes"] - budget * 1e6
+            count, freed = 0, 0
+            for _, size in _entry_sizes(cache):
+                if freed >= excess:
+                    break
+                count, freed = count + 1, freed + size
+            count = cache.evict_oldest(count)
+        elif name == SHARED_FRAMES:
+            excess = stats["bytes"] - budget * 1e6
+            count, freed = 0, 0
+            for _, path, size in _shared_frame_files():
+                if freed >= excess:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                count, freed = count + 1, freed + size
+        elif name.startswith(ST_CACHE_PREFIX) and name[len(ST_CACHE_PREFIX):] in cached_function_clearers:
+            cached_function_clearers[name[len(ST_CACHE_PREFIX):]]()
+            # The per-key count isn't known; a whole-function clear counts as one eviction
+            _record_eviction(name, 1, stats["bytes"], budget, cleared=True)
+            evicted[name] = 1
+            continue
+        else:
+            continue
+
+        if count:
+            _record_eviction(name, count, stats["bytes"], budget)
+            evicted[name] = count
+    return evicted
+
+
+# --- Tracing and snapshots ---
+def _rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except OSError:
+        return None
+
+def start_tracing(frames=TRACE_FRAMES):
+    global _last_trace
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+    _last_trace = None
+
+def stop_tracing():
+    global _last_trace
+    tracemalloc.stop()
+    _last_trace = None
+
+def _top_growth(limit=TOP_SITES):
+    """
+    Allocation sites that grew the most since the previous traced snapshot.
+    """
+    global _last_trace
+    if not tracemalloc.is_tracing():
+        return []
+    current = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ])
+    previous, _last_trace = _last_trace, current
+    if previous is None:
+        stats = current.statistics("lineno")[:limit]
+        return [{"site": str(s.traceback[0]), "size_kb": round(s.size / 1024, 1), "size_diff_kb": None,
+                 "count": s.count, "count_diff": None} for s in stats]
+    stats = [s for s in current.compare_to(previous, "lineno") if s.size_diff > 0][:limit]
+    return [{"site": str(s.traceback[0]), "size_kb": round(s.size / 1024, 1), "size_diff_kb": round(s.size_diff / 1024, 1),
+             "count": s.count, "count_diff": s.count_diff} for s in stats]
+
+def take_snapshot():
+    """
+    Size every cache, enforce budgets and (when tracing) record top growth sites.
+    """
+    with _monitor_lock:
+        usage = cache_usage()
+        evicted = enforce_budgets(usage)
+        for name in evicted:
+            usage[name]["evictions"] = evictions[name]
+        traced = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else None
+        snapshot = {
+            "taken_at": datetime.now().isoformat(timespec="seconds"),
+            "rss_mb": _rss_mb(),
+            "traced_mb": round(traced[0] / 1e6, 1) if traced else None,
+            "traced_peak_mb": round(traced[1] / 1e6, 1) if traced else None,
+            "caches": usage,
+            "evicted": evicted,
+            "top_growth": _top_growth(),
+        }
+        snapshots.append(snapshot)
+    return snapshot
+
+def _run_monitor():
+    while True:
+        time.sleep(SNAPSHOT_INTERVAL)
+        try:
+            take_snapshot()
+        except Exception as e:
+            print(f"[WARN] Memory snapshot failed: {e}")
+
+def start_memory_monitor():
+    """
+    Start the background snapshot thread once per process.
+    """
+    global _monitor_thread
+    with _monitor_lock:
+        if _monitor_thread is not None or SNAPSHOT_INTERVAL <= 0:
+            return
+        if TRACE_ON_START:
+            start_tracing()
+        _monitor_thread = threading.Thread(target=_run_monitor, daemon=True, name="memory-monitor")
+        _monitor_thread.start()
@@ -1,5 +1,9 @@
 from datetime import datetime
-import requests
+import time
+from utils.upstream import CircuitOpenError, http_get
+from utils.live_xba import update_team_xba
+from utils.instrumentation import record_cache
+from utils.memory_monitor import register_cache
 import pytz
 import pandas as pd
 import streamlit as st
@@ -9,15 +13,15 @@ import logging
 logging.getLogger('streamlit').setLevel(logging.DEBUG)
 
 # Global cache for storing player stats
-stats_cache = {}
-batter_stats_cache = {}
+stats_cache = register_cache("mlb_api.stats_cache", {})
+batter_stats_cache = register_cache("mlb_api.batter_stats_cache", {})
 
 # --- Fetch today's MLB schedule ---
 def fetch_today_schedule():
     eastern = pytz.timezone("US/Eastern")
     today = datetime.now(eastern).strftime("%Y-%m-%d")
     url = f"https://statsapi.mlb.com/api/v1/schedule?sportId=1&date={today}"
-    response = requests.get(url)
+    response = http_get(url)
     data = response.json()
 
     games = []
@@ -34,17 +38,39 @@ def fetch_today_schedule():
 # --- Get player ID using the Stats API ---
 def get_player_id(first_name, last_name):
     search_url = f"https://statsapi.mlb.com/api/v1/people/search?names={first_name}%20{last_name}"
-    response = requests.get(search_url)
+    response = http_get(search_url)
     if response.status_code == 200:
         data = response.json()
         if data.get("people"):
             return data["people"][0]["id"]
     return None
 
+# --- Active rosters for every MLB team ---
+def get_all_team_player_ids():
+    """
+    {team name: [{"id": player_id, "position": "SS"}, ...]} from each team's active roster.
+    """
+    response = http_get("https://statsapi.mlb.com/api/v1/teams?sportId=1")
+    if not response.ok:
+        print("[ERROR] Failed to fetch MLB teams")
+        return {}
+
+    rosters = {}
+    for team in response.json().get("teams", []):
+        roster_resp = http_get(f"https://statsapi.mlb.com/api/v1/teams/{team['id']}/roster?rosterType=active")
+        if not roster_resp.ok:
+            print(f"[ERROR] Failed to fetch roster for {team.get('name')}")
+            continue
+        rosters[team["name"]] = [
+            {"id": entry["person"]["id"], "position": entry.get("position", {}).get("abbreviation", "")}
+            for entry in roster_resp.json().get("roster", [])
+        ]
+    return rosters
+
 # --- Get season batting stats for a given batter ID ---
 def get_batting_stats(player_id, season):
     url = f"https://statsapi.mlb.com/api/v1/people/{player_id}/stats?stats=season&season={season}&group=batting"
-    response = requests.get(url)
+    response = http_get(url)
     if response.status_code == 200:
         data = response.json()
         splits = data.get("stats", [])[0].get("splits", [])
@@ -68,9 +94,6 @@ def calculate_batter_advanced_metrics(stats):
         batters_faced = stats.get("battersFaced", 0)
         two_strike_counts = stats.get("twoStrikeCounts", 0)
 
-        # Debugging the calculation process
-        st.write(f"Calculating Advanced Batter Metrics: Strikeouts: {strikeouts}, Batters Faced: {batters_faced}, Two Strike Counts: {two_strike_counts}")
-
         # K% Calculation: Strikeouts / Batters faced
         k_rate = (
             (strikeouts / batters_faced) * 100
@@ -91,7 +114,7 @@ def calculate_batter_advanced_metrics(stats):
             "PutAway%": round(putaway_rate, 2) if putaway_rate is not None else "N/A"
         }
     except (TypeError, ZeroDivisionError, KeyError) as e:
-        st.write(f"[ERROR] Failed to calculate batter metrics: {e}")
+        print(f"[ERROR] Failed to calculate batter metrics: {e}")
         return {
             "BA": "N/A",
             "SLG": "N/A",
@@ -128,7 +151,7 @@ def get_batter_advanced_metrics_by_name(full_name, season=None):
 # --- Fetch the lineups for a given game ---
 def get_lineups_for_game(game_pk):
     url = f"https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live"
-    response = requests.get(url)
+    response = http_get(url)
     if response.status_code == 200:
         data = response.json()
         teams = data["gameData"]["teams"]
@@ -165,15 +188,35 @@ def display_game_lineups_and_metrics(game_pk, season=None):
     for batter, metrics in away_metrics.items():
         st.write(f"{batter}: {metrics}")
 
-# --- Get Game State ---
-def get_game_state(game_pk):
+# --- Live feed (one request per game per refresh tick, shared by all readers) ---
+LIVE_FEED_TTL = 10
+
+live_feed_cache = register_cache("mlb_api.live_feed_cache", {})
+
+def get_live_feed(game_pk):
+    cached = live_feed_cache.get(game_pk)
+    if cached and time.time() - cached[0] < LIVE_FEED_TTL:
+        record_cache("mlb_api.get_live_feed", True, 0.0)
+        return cached[1]
+    record_cache("mlb_api.get_live_feed", False, 0.0)
+
     url = f"https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live"
-    response = requests.get(url)
-    
+    try:
+        response = http_get(url)
+    except CircuitOpenError:
+        return cached[1] if cached else None  # keep showing the last feed until statsapi recovers
     if not response.ok:
         return None
 
     data = response.json()
+    live_feed_cache[game_pk] = (time.time(), data)
+    return data
+
+# --- Get Game State ---
+def get_game_state(game_pk):
+    data = get_live_feed(game_pk)
+    if not data:
+        return None
 
     try:
         inning = data["liveData"]["linescore"]["currentInning"]
@@ -182,6 +225,14 @@ def get_game_state(game_pk):
         count = f"{count_data.get('balls', 0)}-{count_data.get('strikes', 0)}"
         outs = count_data.get("outs", 0)
 
+        play_matchup = data["liveData"]["plays"]["currentPlay"].get("matchup", {})
+        matchup = {
+            "batter_id": play_matchup.get("batter", {}).get("id"),
+            "batter": play_matchup.get("batter", {}).get("fullName"),
+            "pitcher_id": play_matchup.get("pitcher", {}).get("id"),
+            "pitcher": play_matchup.get("pitcher", {}).get("fullName"),
+        }
+
         bases = []
         runners = data["liveData"]["plays"]["currentPlay"].get("runners", [])
         for r in runners:
@@ -193,16 +244,18 @@ def get_game_state(game_pk):
             elif base == "3B":
                 bases.append("3B")
 
+        team_xba = update_team_xba(game_pk, data)
+
         linescore = {
             "away": {
                 "runs": data["liveData"]["linescore"]["teams"]["away"]["runs"],
                 "hits": data["liveData"]["linescore"]["teams"]["away"]["hits"],
-                "xba": ".000"  # Placeholder for xBA
+                "xba": team_xba["away"]
             },
             "home": {
                 "runs": data["liveData"]["linescore"]["teams"]["home"]["runs"],
                 "hits": data["liveData"]["linescore"]["teams"]["home"]["hits"],
-                "xba": ".000"
+                "xba": team_xba["home"]
             }
         }
 
@@ -212,7 +265,8 @@ def get_game_state(game_pk):
             "count": count,
             "outs": outs,
             "bases": bases,
-            "linescore": linescore
+            "linescore": linescore,
+            "matchup": matchup
         }
     except Exception as e:
         print(f"[ERROR] Failed to parse game state: {e}")
@@ -291,7 +345,7 @@ def get_pitcher_advanced_metrics_by_name(full_name, season=None):
 # --- Get probable pitchers for a specific date ---
 def get_probable_pitchers_for_date(date_str):
     url = f"https://statsapi.mlb.com/api/v1/schedule?sportId=1&date={date_str}&hydrate=probablePitcher"
-    response = requests.get(url)
+    response = http_get(url)
     
     if response.status_code != 200:
         print(f"[ERROR] Failed to fetch probable pitchers for {date_str}")
@@ -330,19 +384,15 @@ def get_pitcher_arsenal_from_api(pitcher_name, season=None):
     if not season:
         season = datetime.now().strftime("%Y-%m-%d")
 
-    # Log the pitcher name and season to ensure correct values
-    st.write(f"Fetching arsenal for pitcher: {pitcher_name}, season: {season}")
-
     # We use a mock API for demonstration, replace this with the actual API logic
     try:
         # Example: API URL to get detailed pitch arsenal for the pitcher
         url = f"https://api.example.com/arsenal?pitcher={pitcher_name}&season={season}"
-        response = requests.get(url)
+        response = http_get(url)
         
         # Check if the response is successful
         if response.status_code == 200:
             data = response.json()
-            st.write(f"API Response: {data}")  # Log the raw data for inspection
 
             # Assuming the API returns data in the following format:
             # [{"pitch_type": "4-Seam Fastball", "PA": 50, "BA": 0.220, "SLG": 0.350, ...}, {...}, ...]
@@ -368,17 +418,13 @@ def get_pitcher_arsenal_from_api(pitcher_name, season=None):
     if not season:
         season = datetime.now().strftime("%Y-%m-%d")
 
-    # Log the pitcher name and season to ensure correct values
-    st.write(f"Fetching arsenal for pitcher: {pitcher_name}, season: {season}")
-
     try:
         # Example: API URL to get detailed pitch arsenal for the pitcher
         url = f"https://api.example.com/arsenal?pitcher={pitcher_name}&season={season}"
-        response = requests.get(url)
+        response = http_get(url)
         
         if response.status_code == 200:
             data = response.json()
-            st.write(f"API Response: {data}")  # Log the raw data for inspection
 
             # Assuming the API returns data in the following format:
             # [{"pitch_type": "4-Seam Fastball", "PA": 50, "BA": 0.220, "SLG": 0.350, ...}, {...}, ...]
@@ -0,0 +1,265 @@
+# utils/pitch_store.py
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils import disk_cache
+
+# On-disk columnar store of pitch-level Statcast data. Each pitch is one
+# fixed-width record; text columns are stored as small integer codes into
+# vocabularies kept in meta.json. Records are sorted by (pitcher, date) so a
+# pitcher's pitches are one contiguous slice of a read-only memmap, and a
+# (batter, date) permutation gives the same lookup for batters.
+# Each build goes into its own versions/<stamp>/ directory and is published
+# by atomically rewriting the CURRENT pointer, so a reader always opens one
+# complete build, never new arrays with old meta. The previous build is kept
+# for readers that still have it open.
+if os.environ.get("RENDER"):
+    PITCH_STORE_DIR = Path(os.environ.get("PITCH_STORE_DIR", "/data/pitch_store"))
+else:
+    PITCH_STORE_DIR = Path(os.environ.get("PITCH_STORE_DIR", "data/pitch_store"))
+
+PITCH_DTYPE = np.dtype([
+    ("pitcher", "<i4"),
+    ("batter", "<i4"),
+    ("game_date", "<i4"),        # days since 1970-01-01
+    ("pitch_type", "u1"),        # vocabulary codes, 0 = missing
+    ("description", "u1"),
+    ("events", "u1"),
+    ("stand", "u1"),
+    ("p_throws", "u1"),
+    ("balls", "u1"),
+    ("strikes", "u1"),
+    ("estimated_ba_using_speedangle", "<f4"),
+    ("estimated_slg_using_speedangle", "<f4"),
+    ("estimated_woba_using_speedangle", "<f4"),
+    ("launch_speed", "<f4"),
+    ("launch_angle", "<f4"),
+])
+
+INDEX_DTYPE = np.dtype([("player", "<i4"), ("start", "<i8"), ("stop", "<i8")])
+
+CODED_COLUMNS = ["pitch_type", "description", "events", "stand", "p_throws"]
+COUNT_COLUMNS = ["balls", "strikes"]
+FLOAT_COLUMNS = [
+    "estimated_ba_using_speedangle", "estimated_slg_using_speedangle",
+    "estimated_woba_using_speedangle", "launch_speed", "launch_angle",
+]
+
+def _date_to_days(dates):
+    return (pd.to_datetime(dates).values.astype("datetime64[D]").astype(np.int64)).astype(np.int32)
+
+def _day(date_str):
+    return int(np.datetime64(pd.Timestamp(date_str).date(), "D").astype(np.int64))
+
+def _player_index(ids):
+    """
+    Build (player, start, stop) rows for an array of IDs that is already sorted.
+    """
+    if len(ids) == 0:
+        return np.zeros(0, dtype=INDEX_DTYPE)
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    index = np.zeros(len(starts), dtype=INDEX_DTYPE)
+    index["player"] = ids[starts]
+    index["start"] = starts
+    index["stop"] = np.r_[starts[1:], len(ids)]
+    return index
+
+
+# --- Build ---
+CURRENT_POINTER = "CURRENT"
+VERSIONS_DIR = "versions"
+KEEP_VERSIONS = 2
+
+def current_version_dir(store_dir=PITCH_STORE_DIR):
+    """
+    Directory of the published build, or None if the store has never been built.
+    Stores built before versioning (files directly in store_dir) still open.
+    """
+    store_dir = Path(store_dir)
+    try:
+        version = (store_dir / CURRENT_POINTER).read_text().strip()
+    except FileNotFoundError:
+        return store_dir if (store_dir / "meta.json").exists() else None
+    return store_dir / VERSIONS_DIR / version
+
+def _remove_old_versions(store_dir, keep=KEEP_VERSIONS):
+    versions_dir = Path(store_dir) / VERSIONS_DIR
+    for old in sorted(versions_dir.iterdir(), reverse=True)[keep:]:
+        shutil.rmtree(old, ignore_errors=True)
+
+def build_pitch_store(df: pd.DataFrame, store_dir=PITCH_STORE_DIR, start_date=None, end_date=None):
+    """
+    Encode a raw statcast() frame into the store layout, write it as a new
+    version under store_dir and publish it. start_date/end_date are the range
+    the frame was pulled for (default: its first and last pitch dates); the
+    store serves any request inside that range.
+    """
+    store_dir = Path(store_dir)
+    version = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    version_dir = store_dir / VERSIONS_DIR / version
+    version_dir.mkdir(parents=True)
+
+    records = np.zeros(len(df), dtype=PITCH_DTYPE)
+    records["pitcher"] = df["pitcher"].to_numpy(dtype=np.int32)
+    records["batter"] = df["batter"].to_numpy(dtype=np.int32)
+    records["game_date"] = _date_to_days(df["game_date"])
+
+    vocabularies = {}
+    for col in CODED_COLUMNS:
+        values = df[col] if col in df.columns else pd.Series(index=df.index, dtype=object)
+        categories = sorted(values.dropna().astype(str).unique())
+        if len(categories) > 254:
+            raise ValueError(f"Too many distinct values in {col} for a 1-byte code")
+        codes = pd.Categorical(values.astype("string"), categories=categories).codes
+        records[col] = codes.astype(np.int16) + 1  # -1 (missing) becomes 0
+        vocabularies[col] = categories
+
+    for col in COUNT_COLUMNS:
+        if col in df.columns:
+            records[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).to_numpy(dtype=np.uint8)
+    for col in FLOAT_COLUMNS:
+        if col in df.columns:
+            records[col] = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float32)
+        else:
+            records[col] = np.nan
+
+    # Order pitches within a game by at-bat and pitch number when Savant provides them
+    tiebreak = [df[col].to_numpy() for col in ["pitch_number", "at_bat_number"] if col in df.columns]
+    order = np.lexsort(tiebreak + [records["game_date"], records["pitcher"]])
+    records = records[order]
+
+    batter_order = np.lexsort((records["game_date"], records["batter"])).astype(np.int64)
+
+    min_date = str(np.datetime64(int(records["game_date"].min()), "D")) if len(records) else None
+    max_date = str(np.datetime64(int(records["game_date"].max()), "D")) if len(records) else None
+    meta = {
+        "rows": int(len(records)),
+        "start_date": start_date or min_date,
+        "end_date": end_date or max_date,
+        "min_date": min_date,
+        "max_date": max_date,
+        "vocabularies": vocabularies,
+    }
+
+    arrays = {
+        "pitches.npy": records,
+        "pitcher_index.npy": _player_index(records["pitcher"]),
+        "batter_order.npy": batter_order,
+        "batter_index.npy": _player_index(records["batter"][batter_order]),
+    }
+    for name, array in arrays.items():
+        with open(version_dir / name, "wb") as f:
+            np.save(f, array)
+    (version_dir / "meta.json").write_text(json.dumps(meta))
+
+    with disk_cache.atomic_path(store_dir / CURRENT_POINTER) as tmp_path:
+        Path(tmp_path).write_text(version)
+    _remove_old_versions(store_dir)
+
+    print(f"[✓] Pitch store: {meta['rows']} pitches ({meta['start_date']} to {meta['end_date']}) -> {version_dir}")
+    return meta
+
+
+# --- Read ---
+class PitchStore:
+    """
+    Read-only, memory-mapped view of one pitch store build.
+    """
+    def __init__(self, store_dir=PITCH_STORE_DIR, version_dir=None):
+        store_dir = version_dir or current_version_dir(store_dir)
+        if store_dir is None:
+            raise FileNotFoundError("pitch store has not been built")
+        self.meta = json.loads((store_dir / "meta.json").read_text())
+        self.vocabularies = self.meta["vocabularies"]
+        self.pitches = np.load(store_dir / "pitches.npy", mmap_mode="r")
+        self.pitcher_index = np.load(store_dir / "pitcher_index.npy", mmap_mode="r")
+        self.batter_order = np.load(store_dir / "batter_order.npy", mmap_mode="r")
+        self.batter_index = np.load(store_dir / "batter_index.npy", mmap_mode="r")
+
+    def covers(self, start_date, end_date):
+        """
+        True if [start_date, end_date] lies inside the range the store was built for.
+        """
+        if not self.meta["rows"]:
+            return False
+        built_start = self.meta.get("start_date", self.meta["min_date"])
+        built_end = self.meta.get("end_date", self.meta["max_date"])
+        return built_start <= start_date and end_date <= built_end
+
+    @staticmethod
+    def _find(index, player_id):
+        pos = np.searchsorted(index["player"], player_id)
+        if pos < len(index) and index["player"][pos] == player_id:
+            return int(index["start"][pos]), int(index["stop"][pos])
+        return 0, 0
+
+    @staticmethod
+    def _date_bounds(dates, start_date=None, end_date=None):
+        lo = np.searchsorted(dates, _day(start_date), side="left") if start_date else 0
+        hi = np.searchsorted(dates, _day(end_date), side="right") if end_date else len(dates)
+        return lo, hi
+
+    def pitcher_pitches(self, pitcher_id, start_date=None, end_date=None):
+        """
+        Zero-copy slice of one pitcher's records, optionally bounded by date.
+        """
+        start, stop = self._find(self.pitcher_index, pitcher_id)
+        rows = self.pitches[start:stop]
+        lo, hi = self._date_bounds(rows["game_date"], start_date, end_date)
+        return rows[lo:hi]
+
+    def batter_pitches(self, batter_id, start_date=None, end_date=None):
+        """
+        One batter's records in date order (gathered through the batter permutation).
+        """
+        start, stop = self._find(self.batter_index, batter_id)
+        positions = self.batter_order[start:stop]
+        lo, hi = self._date_bounds(self.pitches["game_date"][positions], start_date, end_date)
+        return self.pitches[positions[lo:hi]]
+
+    def to_frame(self, rows) -> pd.DataFrame:
+        """
+        Decode records into the compact Statcast frame layout stat_utils aggregates.
+        """
+        data = {
+            "pitcher": rows["pitcher"],
+            "batter": rows["batter"],
+            "game_date": rows["game_date"].astype("datetime64[D]"),
+        }
+        for col in CODED_COLUMNS:
+            data[col] = pd.Categorical.from_codes(
+                rows[col].astype(np.int16) - 1, categories=self.vocabularies[col]
+            )
+        for col in COUNT_COLUMNS + FLOAT_COLUMNS:
+            data[col] = rows[col]
+        return pd.DataFrame(data)
+
+
+_store = None
+_store_version = None
+_store_lock = threading.Lock()
+
+def get_pitch_store(store_dir=PITCH_STORE_DIR):
+    """
+    Shared PitchStore for the process, reopened when a new build is published.
+    Returns None when no store has been built.
+    """
+    global _store, _store_version
+    version_dir = current_version_dir(store_dir)
+    if version_dir is None:
+        return None
+    with _store_lock:
+        if _store is None or version_dir != _store_version:
+            try:
+                _store = PitchStore(store_dir, version_dir)
+            except FileNotFoundError:
+                return None  # the build was replaced while we opened it; try again next call
+            _store_version = version_dir
+        return _store
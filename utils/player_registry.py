@@ -0,0 +1,171 @@
+# utils/player_registry.py
+import os
+import sys
+import threading
+
+from utils import disk_cache
+from utils.mlb_api import get_player_id
+from utils.memory_monitor import register_cache
+
+# Process-wide registry of every player the app has seen. Lineups and stat
+# lookups pass PlayerRecords (or bare IDs) around instead of "Name - POS"
+# strings, and a name only goes to the people/search API the first time.
+# Resolved names are also kept in an on-disk index shared by every worker,
+# so a name is searched once per deployment rather than once per process.
+if os.environ.get("RENDER"):
+    PLAYER_INDEX_PATH = os.environ.get("PLAYER_INDEX_PATH", "/data/player_index.json")
+else:
+    PLAYER_INDEX_PATH = os.environ.get("PLAYER_INDEX_PATH", "data/player_index.json")
+
+class PlayerRecord:
+    __slots__ = ("id", "name", "team", "position", "bats", "throws")
+
+    def __init__(self, player_id, name, team=None, position=None, bats=None, throws=None):
+        self.id = player_id
+        self.name = name
+        self.team = team
+        self.position = position
+        self.bats = bats
+        self.throws = throws
+
+    @property
+    def is_pitcher(self):
+        return self.position in {"P", "SP", "RP"}
+
+    def __repr__(self):
+        return f"PlayerRecord({self.id}, {self.name!r}, {self.position!r})"
+
+
+players_by_id = {}
+player_ids_by_name = {}
+_registry_lock = threading.Lock()
+register_cache("player_registry.players_by_id", players_by_id, _registry_lock, evictable=False)
+register_cache("player_registry.player_ids_by_name", player_ids_by_name, _registry_lock, evictable=False)
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+def register_player(player_id, name, team=None, position=None, bats=None, throws=None):
+    """
+    Add or update a player. Fields passed as None keep their previous value.
+    """
+    player_id = int(player_id)
+    name = _intern(name.strip())
+    with _registry_lock:
+        record = players_by_id.get(player_id)
+        if record is None:
+            record = PlayerRecord(player_id, name)
+            players_by_id[player_id] = record
+        record.name = name
+        if team is not None:
+            record.team = _intern(team)
+        if position is not None:
+            record.position = _intern(position)
+        if bats is not None:
+            record.bats = _intern(bats)
+        if throws is not None:
+            record.throws = _intern(throws)
+        player_ids_by_name[name.lower()] = player_id
+        return record
+
+def register_from_boxscore(player, team=None):
+    """
+    Register a boxscore `players` entry and return its record. Boxscore
+    persons carry only id/fullName/link; handedness comes from
+    register_game_players.
+    """
+    person = player["person"]
+    return register_player(
+        person["id"],
+        person["fullName"],
+        team=team,
+        position=player.get("position", {}).get("abbreviation"),
+    )
+
+def register_game_players(game_players):
+    """
+    Record bats/throws from a live feed's gameData.players ({"ID<id>": person}).
+    """
+    for person in game_players.values():
+        register_player(
+            person["id"],
+            person["fullName"],
+            bats=person.get("batSide", {}).get("code"),
+            throws=person.get("pitchHand", {}).get("code"),
+        )
+
+def get_player(player_id):
+    return players_by_id.get(int(player_id))
+
+def lookup_player_id(full_name):
+    """
+    Resolve a full name to an MLB player ID, hitting the people/search API
+    only for names the registry hasn't seen yet.
+    """
+    if not full_name:
+        return None
+    player_id = player_ids_by_name.get(full_name.strip().lower())
+    if player_id:
+        return player_id
+
+    try:
+        first, last = full_name.strip().split(" ", 1)
+    except ValueError:
+        return None
+
+    player_id = _indexed_player_id(full_name) or _search_player_id(full_name, first, last)
+    if player_id:
+        register_player(player_id, full_name)
+    return player_id
+
+
+# --- On-disk player index ({lowercase full name: player ID}) ---
+_index = {}
+_index_mtime = None
+_index_lock = threading.Lock()
+
+def _read_player_index():
+    try:
+        return disk_cache.read_json(PLAYER_INDEX_PATH) or {}
+    except Exception as e:
+        print(f"[WARN] Failed to load player index: {e}")
+        return {}
+
+def _player_index():
+    """
+    The on-disk index, reloaded only when another worker rewrote the file.
+    """
+    global _index, _index_mtime
+    try:
+        mtime = os.stat(PLAYER_INDEX_PATH).st_mtime_ns
+    except OSError:
+        return {}
+    with _index_lock:
+        if mtime != _index_mtime:
+            _index = _read_player_index()
+            _index_mtime = mtime
+        return _index
+
+def _indexed_player_id(full_name):
+    return _player_index().get(full_name.strip().lower())
+
+def _search_player_id(full_name, first, last):
+    """
+    Search the API for a name, then merge it into the index under the
+    index's lock. The search runs unlocked, so workers resolving different
+    names don't queue behind each other's network calls.
+    """
+    global _index, _index_mtime
+    player_id = get_player_id(first, last)
+    if not player_id:
+        return player_id
+    key = full_name.strip().lower()
+    with disk_cache.locked(PLAYER_INDEX_PATH):
+        index = _read_player_index()
+        if index.get(key) != player_id:
+            index[key] = player_id
+            disk_cache.write_json(PLAYER_INDEX_PATH, index)
+        with _index_lock:
+            _index = index
+            _index_mtime = os.stat(PLAYER_INDEX_PATH).st_mtime_ns
+    return player_id
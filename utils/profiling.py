@@ -0,0 +1,173 @@
+# utils/profiling.py
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+import streamlit as st
+
+# Opt-in profiling of page script runs. Set PROFILE_PAGES=1 to profile every
+# run, or add ?profile=1 to a page URL to profile that session's runs. Each
+# run is recorded twice: cProfile (deterministic, saved as .prof for pstats /
+# snakeviz) and a stack sampler (saved as .folded collapsed stacks for
+# flamegraph.pl / speedscope). Both cover the script thread only; work the
+# page hands to a thread pool shows up as time spent waiting on it.
+if os.environ.get("RENDER"):
+    PROFILE_DIR = Path(os.environ.get("PROFILE_DIR", "/data/profiles"))
+else:
+    PROFILE_DIR = Path(os.environ.get("PROFILE_DIR", "data/profiles"))
+
+MAX_PROFILES = int(os.environ.get("PROFILE_KEEP", "50"))  # oldest runs beyond this are deleted
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+MAX_SAMPLE_SECONDS = 600  # a run that never ends stops sampling here
+EXCLUDED_PAGES = {"diagnostics", "profiles"}
+
+_retention_lock = threading.Lock()
+
+def profiling_requested(page):
+    if page in EXCLUDED_PAGES:
+        return False
+    if os.environ.get("PROFILE_PAGES", "").lower() in ("1", "true", "yes"):
+        return True
+    try:
+        return st.query_params.get("profile", "") in ("1", "true")
+    except Exception:
+        return False
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class StackSampler:
+    """
+    Samples one thread's stack every SAMPLE_INTERVAL seconds into collapsed
+    stacks ("root;caller;callee" -> samples), starting at the page script.
+    """
+    def __init__(self, thread_id):
+        self.thread_id = thread_id
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="page-profile-sampler")
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self):
+        deadline = time.monotonic() + MAX_SAMPLE_SECONDS
+        while not self._stop.wait(SAMPLE_INTERVAL) and time.monotonic() < deadline:
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                break
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                if frame.f_code.co_name == "<module>" and frame.f_back is not None \
+                        and frame.f_back.f_code.co_name == "code_to_exec":
+                    break  # everything below the page script is Streamlit's runner
+                frame = frame.f_back
+            self.stacks[";".join(reversed(labels))] += 1
+
+    def collapsed(self):
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+
+class PageProfile:
+    def __init__(self, page):
+        self.page = page
+        self.started_at = datetime.now()
+        self.start = time.perf_counter()
+        self.profiler = cProfile.Profile()
+        try:
+            self.profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one cProfile per process; this run gets the sampler only
+            self.profiler = None
+        self.sampler = StackSampler(threading.get_ident()).start()
+
+    def finish(self, status="complete"):
+        """
+        Stop both profilers and write <stamp>_<page>.prof/.folded/.json to PROFILE_DIR.
+        """
+        elapsed_ms = round((time.perf_counter() - self.start) * 1000, 1)
+        if self.profiler is not None:
+            self.profiler.disable()
+        self.sampler.stop()
+
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        stem = f"{self.started_at.strftime('%Y%m%d_%H%M%S_%f')}_{self.page}"
+        files = {"folded": f"{stem}.folded"}
+        (PROFILE_DIR / files["folded"]).write_text(self.sampler.collapsed())
+        if self.profiler is not None:
+            files["prof"] = f"{stem}.prof"
+            self.profiler.dump_stats(PROFILE_DIR / files["prof"])
+
+        meta = {
+            "page": self.page,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "elapsed_ms": elapsed_ms,
+            "samples": sum(self.sampler.stacks.values()),
+            "status": status,
+            "files": files,
+        }
+        tmp_path = PROFILE_DIR / f"{stem}.json.tmp"
+        tmp_path.write_text(json.dumps(meta))
+        os.replace(tmp_path, PROFILE_DIR / f"{stem}.json")
+        enforce_retention()
+        print(f"[✓] Profiled {self.page} run ({elapsed_ms} ms, {status}): {PROFILE_DIR / stem}")
+        return meta
+
+
+def start_page_profile(page):
+    """
+    A PageProfile for this script run if profiling is requested, else None.
+    The caller finishes it however the run ends (see instrumentation.page_run).
+    """
+    return PageProfile(page) if profiling_requested(page) else None
+
+def finish_page_profile(profile, status="complete"):
+    if profile is None:
+        return None
+    try:
+        return profile.finish(status)
+    except Exception as e:
+        print(f"[WARN] Could not save profile for {profile.page}: {e}")
+        return None
+
+
+# --- Saved profiles ---
+def list_profiles(profile_dir=None):
+    """
+    Metadata for saved profiles, newest first.
+    """
+    profile_dir = Path(profile_dir or PROFILE_DIR)
+    profiles = []
+    for path in sorted(profile_dir.glob("*.json"), reverse=True):
+        try:
+            meta = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        meta["id"] = path.stem
+        profiles.append(meta)
+    return profiles
+
+def delete_profile(profile_id, profile_dir=None):
+    profile_dir = Path(profile_dir or PROFILE_DIR)
+    for path in profile_dir.glob(f"{profile_id}.*"):
+        path.unlink(missing_ok=True)
+
+def enforce_retention(max_profiles=None, profile_dir=None):
+    max_profiles = MAX_PROFILES if max_profiles is None else max_profiles
+    with _retention_lock:
+        for meta in list_profiles(profile_dir)[max_profiles:]:
+            delete_profile(meta["id"], profile_dir)
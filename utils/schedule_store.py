@@ -0,0 +1,253 @@
+# utils/schedule_store.py
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from utils import disk_cache
+from utils.memory_monitor import register_cache
+from utils.upstream import http_get
+
+# Whole-season schedules. A season is loaded with one
+# schedule?startDate=&endDate= request and kept as a table sorted by date,
+# with row positions indexed by gamePk and by team, so "games between two
+# dates" or "team X's games in a range" is a binary search instead of a
+# file open and API call per day. For the current season, the current week
+# (yesterday through six days out) is refetched every WEEK_REFRESH_SECONDS
+# and merged in, and the whole season once a day to pick up reschedules;
+# earlier seasons are final. Seasons are stored through utils/disk_cache.py
+# and shared by every worker.
+if os.environ.get("RENDER"):
+    SCHEDULE_STORE_DIR = os.environ.get("SCHEDULE_STORE_DIR", "/data/schedule_store")
+else:
+    SCHEDULE_STORE_DIR = os.environ.get("SCHEDULE_STORE_DIR", "data/schedule_store")
+
+SCHEDULE_RANGE_URL = "https://statsapi.mlb.com/api/v1/schedule?sportId=1&startDate={start}&endDate={end}"
+WEEK_REFRESH_SECONDS = 900
+SEASON_REFRESH_SECONDS = 24 * 3600
+WEEK_BACK_DAYS = 1
+WEEK_AHEAD_DAYS = 6
+COLUMNS = ["game_pk", "date", "time", "home", "away", "status", "game_type"]
+CATEGORY_COLUMNS = ["home", "away", "status", "game_type"]
+
+_seasons_lock = threading.Lock()
+_seasons = register_cache("schedule_store.seasons", {}, _seasons_lock)  # {season: (file mtime_ns, SeasonSchedule)}
+
+def _day(value):
+    return np.datetime64(pd.Timestamp(value).date(), "D")
+
+class SeasonSchedule:
+    """
+    One season's games sorted by (date, time). `games` columns: game_pk,
+    date, time (UTC first pitch), home, away, status, game_type.
+    """
+    def __init__(self, season, games, fetched_at=0, week_refreshed_at=0):
+        self.season = season
+        self.fetched_at = fetched_at
+        self.week_refreshed_at = week_refreshed_at
+        self.games = games.sort_values(["date", "time"], kind="stable").reset_index(drop=True)
+        self.dates = self.games["date"].to_numpy().astype("datetime64[D]")
+        self.positions_by_pk = {int(pk): pos for pk, pos in self.games.groupby("game_pk").indices.items()}
+        self.positions_by_team = {}
+        for side in ("home", "away"):
+            for team, pos in self.games.groupby(side, observed=True).indices.items():
+                self.positions_by_team.setdefault(team, []).append(pos)
+        self.positions_by_team = {team: np.sort(np.concatenate(parts)) for team, parts in self.positions_by_team.items()}
+        self.dates_by_team = {team: self.dates[pos] for team, pos in self.positions_by_team.items()}
+
+    def __len__(self):
+        return len(self.games)
+
+    @property
+    def is_loaded(self):
+        """
+        False for the empty stand-in get_season_schedule returns when the season couldn't be loaded.
+        """
+        return self.fetched_at > 0
+
+    def games_between(self, start=None, end=None):
+        """
+        Games dated start..end (inclusive; None leaves that side open).
+        """
+        lo = 0 if start is None else np.searchsorted(self.dates, _day(start), side="left")
+        hi = len(self.dates) if end is None else np.searchsorted(self.dates, _day(end), side="right")
+        return self.games.iloc[lo:hi]
+
+    def team_games(self, team, start=None, end=None):
+        """
+        Games team played (home or away) dated start..end, in date order.
+        """
+        positions = self.positions_by_team.get(team)
+        if positions is None:
+            return self.games.iloc[0:0]
+        dates = self.dates_by_team[team]
+        lo = 0 if start is None else np.searchsorted(dates, _day(start), side="left")
+        hi = len(dates) if end is None else np.searchsorted(dates, _day(end), side="right")
+        return self.games.iloc[positions[lo:hi]]
+
+    def games_for_pk(self, game_pk):
+        """
+        Rows for a gamePk: usually one; a postponed game also keeps its original date's row.
+        """
+        return self.games.iloc[self.positions_by_pk.get(int(game_pk), [])]
+
+
+# --- Upstream rows <-> table ---
+def _empty_columns():
+    return {col: [] for col in COLUMNS}
+
+def _parse_rows(data):
+    rows = _empty_columns()
+    for date_data in data.get("dates", []):
+        for game in date_data.get("games", []):
+            rows["game_pk"].append(game.get("gamePk"))
+            rows["date"].append(date_data.get("date"))
+            rows["time"].append(game.get("gameDate", ""))
+            rows["home"].append(game["teams"]["home"]["team"]["name"])
+            rows["away"].append(game["teams"]["away"]["team"]["name"])
+            rows["status"].append(game.get("status", {}).get("detailedState", ""))
+            rows["game_type"].append(game.get("gameType", ""))
+    return rows
+
+def _frame(columns):
+    games = pd.DataFrame({
+        "game_pk": np.asarray(columns["game_pk"], dtype=np.int64),
+        "date": pd.to_datetime(pd.Series(columns["date"], dtype=object), format="%Y-%m-%d"),
+        "time": pd.to_datetime(pd.Series(columns["time"], dtype=object), utc=True, errors="coerce"),
+    })
+    for col in CATEGORY_COLUMNS:
+        games[col] = pd.Categorical(columns[col])
+    return games
+
+def _fetch_range(start, end):
+    response = http_get(SCHEDULE_RANGE_URL.format(start=start.isoformat(), end=end.isoformat()))
+    response.raise_for_status()
+    return _parse_rows(response.json())
+
+def _merge_window(columns, fresh, start, end):
+    """
+    Replace the rows dated start..end with freshly fetched ones.
+    """
+    start, end = start.isoformat(), end.isoformat()
+    keep = [i for i, day in enumerate(columns["date"]) if not start <= day <= end]
+    return {col: [columns[col][i] for i in keep] + fresh[col] for col in COLUMNS}
+
+
+# --- Disk store ---
+def _store_path(season):
+    return os.path.join(SCHEDULE_STORE_DIR, f"{season}.json")
+
+def _read_entry(season):
+    """
+    {"season", "columns": {column: values}, "fetched_at", "week_refreshed_at"}, or None.
+    """
+    try:
+        return disk_cache.read_json(_store_path(season))
+    except Exception as e:
+        print(f"[WARN] Failed to load {season} schedule store: {e}")
+        return None
+
+def _is_current(season):
+    return season == datetime.utcnow().year
+
+def _week_window(season):
+    today = datetime.utcnow().date()
+    start = max(today - timedelta(days=WEEK_BACK_DAYS), date(season, 1, 1))
+    end = min(today + timedelta(days=WEEK_AHEAD_DAYS), date(season, 12, 31))
+    return start, end
+
+def _needs_season_load(season, fetched_at):
+    return fetched_at is None or _is_current(season) and time.time() - fetched_at > SEASON_REFRESH_SECONDS
+
+def _needs_week_refresh(season, week_refreshed_at):
+    return _is_current(season) and time.time() - week_refreshed_at > WEEK_REFRESH_SECONDS
+
+def _refresh(season, entry, full):
+    """
+    Load the whole season (one request), or merge in the current week.
+    Runs under the season's lock; returns the entry now on disk.
+    """
+    now = time.time()
+    try:
+        if full or entry is None or _needs_season_load(season, entry["fetched_at"]):
+            print(f"[FETCHING] {season} season schedule")
+            columns = _fetch_range(date(season, 1, 1), date(season, 12, 31))
+            entry = {"season": season, "columns": columns, "fetched_at": now, "week_refreshed_at": now}
+        else:
+            start, end = _week_window(season)
+            print(f"[FETCHING] {season} schedule for {start}..{end}")
+            columns = _merge_window(entry["columns"], _fetch_range(start, end), start, end)
+            entry = {**entry, "columns": columns, "week_refreshed_at": now}
+    except Exception as e:
+        print(f"[ERROR] Failed to refresh the {season} schedule: {e}")
+        return entry
+    disk_cache.write_json(_store_path(season), entry)
+    print(f"[CACHED] {len(entry['columns']['game_pk'])} games in the {season} schedule store")
+    return entry
+
+def _load(season):
+    """
+    The stored season, rebuilt in memory when another process rewrote the file. None if absent.
+    """
+    try:
+        mtime = os.stat(_store_path(season)).st_mtime_ns
+    except OSError:
+        return None
+    with _seasons_lock:
+        cached = _seasons.get(season)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    entry = _read_entry(season)
+    if entry is None:
+        return None
+    schedule = SeasonSchedule(season, _frame(entry["columns"]), entry["fetched_at"], entry["week_refreshed_at"])
+    with _seasons_lock:
+        _seasons[season] = (mtime, schedule)
+    return schedule
+
+def get_season_schedule(season, force_refresh=False):
+    """
+    The SeasonSchedule for a season, loading or refreshing it first if needed.
+    force_refresh reloads the whole season. Empty if the season can't be loaded.
+    """
+    season = int(season)
+    schedule = _load(season)
+    if schedule is not None and not force_refresh and not _needs_season_load(season, schedule.fetched_at) \
+            and not _needs_week_refresh(season, schedule.week_refreshed_at):
+        return schedule
+
+    requested_at = time.time()
+    with disk_cache.locked(_store_path(season)):
+        # Another worker may have refreshed the season while we waited for the lock
+        entry = _read_entry(season)
+        fresh = entry is not None and not _needs_season_load(season, entry["fetched_at"]) and \
+            not _needs_week_refresh(season, entry["week_refreshed_at"])
+        if not fresh or force_refresh and entry["fetched_at"] < requested_at:
+            _refresh(season, entry, full=force_refresh)
+
+    schedule = _load(season)
+    return schedule if schedule is not None else SeasonSchedule(season, _frame(_empty_columns()))
+
+
+# --- Queries across seasons ---
+def _concat(frames):
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+def games_between(start, end):
+    """
+    Every game dated start..end (inclusive), in date order.
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    return _concat([get_season_schedule(season).games_between(start, end)
+                    for season in range(start.year, end.year + 1)])
+
+def team_games(team, start, end):
+    """
+    team's games (home or away) dated start..end (inclusive), in date order.
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    return _concat([get_season_schedule(season).team_games(team, start, end)
+                    for season in range(start.year, end.year + 1)])
@@ -1,92 +1,162 @@
 import os
-import json
-import requests
-from datetime import datetime
+import hashlib
+import time
+from utils import disk_cache, schedule_store
+from utils.upstream import http_get
+from datetime import date, datetime, timedelta
 import pandas as pd
+from utils.shared_frame_cache import shared_frame_cache
+from utils.instrumentation import instrumented_cache
 
 CACHE_DIR = "cached_schedules"
 
+# Cached days are revalidated, not re-downloaded: each cache file keeps the
+# response's validators (ETag / Last-Modified) and a hash of the body, the
+# refresh sends a conditional GET, and a 304, or a 200 whose body hashes the
+# same, keeps the cached games. Days from yesterday on are revalidated once
+# the cache is older than REVALIDATE_SECONDS; earlier days are final.
+# Files go through utils/disk_cache.py: one worker revalidates a date while
+# the others wait on its lock and then read the refreshed file.
+REVALIDATE_SECONDS = 900
+
+def _cache_path(date_str):
+    return os.path.join(CACHE_DIR, f"{date_str}.json")
+
+def _read_cached_schedule(date_str):
+    """
+    Cache entry {"games", "etag", "last_modified", "content_hash", "fetched_at"},
+    or None. Files from before validators were stored hold just the games list.
+    """
+    try:
+        entry = disk_cache.read_json(_cache_path(date_str))
+    except Exception as e:
+        print(f"[WARN] Failed to load cache for {date_str}: {e}")
+        return None
+    if entry is None:
+        return None
+    if isinstance(entry, list):
+        return {"games": entry, "etag": None, "last_modified": None, "content_hash": None, "fetched_at": 0}
+    return entry
+
+def _write_cached_schedule(date_str, entry):
+    disk_cache.write_json(_cache_path(date_str), entry)
+
+def _needs_revalidation(date_str, entry):
+    if entry is None or not entry["games"] and not entry["content_hash"]:
+        return True
+    yesterday = (datetime.utcnow() - timedelta(days=1)).strftime("%Y-%m-%d")
+    return date_str >= yesterday and time.time() - entry["fetched_at"] > REVALIDATE_SECONDS
+
+def _parse_schedule(data):
+    games = []
+    for date_data in data.get("dates", []):
+        for game in date_data.get("games", []):
+            games.append({
+                "gamePk": game.get("gamePk"),
+                "home": game["teams"]["home"]["team"]["name"],
+                "opponent": game["teams"]["away"]["team"]["name"],
+                "time": game.get("gameDate", ""),
+                "status": game.get("status", {}).get("detailedState", "")
+            })
+    return games
+
 def fetch_schedule_by_date(date, force_refresh=False):
+    """
+    Games for a date from the disk cache, revalidated against the MLB API when
+    stale or when force_refresh is set. Unchanged schedules cost a 304.
+    """
     date_str = date.strftime("%Y-%m-%d")
-    cache_file = os.path.join(CACHE_DIR, f"{date_str}.json")
-
-    if not force_refresh and os.path.exists(cache_file):
-        try:
-            with open(cache_file, "r") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"[WARN] Failed to load cache for {date_str}: {e}")
-
-    print(f"[FETCHING] Using MLB API for {date_str}")
+    entry = _read_cached_schedule(date_str)
+    if entry is not None and not force_refresh and not _needs_revalidation(date_str, entry):
+        return entry["games"]
+
+    requested_at = time.time()
+    with disk_cache.locked(_cache_path(date_str)):
+        # Another worker may have refreshed this date while we waited for the lock
+        entry = _read_cached_schedule(date_str)
+        if entry is not None and not _needs_revalidation(date_str, entry) and \
+                (not force_refresh or entry["fetched_at"] >= requested_at):
+            return entry["games"]
+        return _refresh_schedule(date_str, entry)
+
+def _refresh_schedule(date_str, entry):
+    headers = {}
+    if entry is not None and entry["games"]:
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    print(f"[FETCHING] Using MLB API for {date_str}" + (" (conditional)" if headers else ""))
     url = f"https://statsapi.mlb.com/api/v1/schedule?sportId=1&date={date_str}"
     try:
-        response = requests.get(url)
-        data = response.json()
-
-        games = []
-        for date_data in data.get("dates", []):
-            for game in date_data.get("games", []):
-                games.append({
-                    "gamePk": game.get("gamePk"),
-                    "home": game["teams"]["home"]["team"]["name"],
-                    "opponent": game["teams"]["away"]["team"]["name"],
-                    "time": game.get("gameDate", ""),
-                    "status": game.get("status", {}).get("detailedState", "")
-                })
-
-        # Cache result
-        os.makedirs(CACHE_DIR, exist_ok=True)
-        with open(cache_file, "w") as f:
-            json.dump(games, f)
-
-        print(f"[CACHED] {len(games)} games saved for {date_str}")
+        response = http_get(url, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            entry["fetched_at"] = time.time()
+            _write_cached_schedule(date_str, entry)
+            print(f"[REVALIDATED] {date_str} unchanged (304)")
+            return entry["games"]
+        response.raise_for_status()  # Don't cache an empty schedule on upstream failure
+
+        content_hash = hashlib.sha1(response.content).hexdigest()
+        if entry is not None and entry["games"] and content_hash == entry["content_hash"]:
+            games = entry["games"]
+            print(f"[REVALIDATED] {date_str} unchanged (same content hash)")
+        else:
+            games = _parse_schedule(response.json())
+            print(f"[CACHED] {len(games)} games saved for {date_str}")
+
+        _write_cached_schedule(date_str, {
+            "games": games,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_hash": content_hash,
+            "fetched_at": time.time(),
+        })
         return games
 
     except Exception as e:
         print(f"[ERROR] Failed to fetch from MLB API for {date_str}: {e}")
-        return []
-
-
-
+        return entry["games"] if entry is not None else []
+
+
+
+def _store_rows(games):
+    times = games["time"].dt.strftime("%Y-%m-%dT%H:%M:%SZ").fillna("")
+    return [
+        {"gamePk": int(game_pk), "home": home, "opponent": away, "time": time_str, "status": status}
+        for game_pk, home, away, time_str, status in zip(
+            games["game_pk"], games["home"].astype(str), games["away"].astype(str), times, games["status"].astype(str))
+    ]
+
+def get_games_between(start, end):
+    """
+    Games dated start..end (inclusive) in fetch_schedule_by_date's row format,
+    from the season schedule store. Seasons the store couldn't load (e.g. the
+    season request failed on a fresh store) fall back to the per-date cache.
+    """
+    start, end = pd.Timestamp(start).date(), pd.Timestamp(end).date()
+    games = []
+    for season in range(start.year, end.year + 1):
+        first, last = max(start, date(season, 1, 1)), min(end, date(season, 12, 31))
+        schedule = schedule_store.get_season_schedule(season)
+        if schedule.is_loaded:
+            games.extend(_store_rows(schedule.games_between(first, last)))
+            continue
+        day = first
+        while day <= last:
+            games.extend(fetch_schedule_by_date(day))
+            day += timedelta(days=1)
+    return games
+
+@instrumented_cache(shared_frame_cache(ttl=300))
 def get_schedule():
-    all_games = []
-    from datetime import datetime, timedelta
-    import os
-
-    for offset in [0, 1]:  # Today and Tomorrow
-        target_date = (datetime.utcnow() + timedelta(days=offset)).date()
-        cache_file = os.path.join(CACHE_DIR, f"{target_date}.json")
-        games = []
-
-        # Try to load from cache
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, "r") as f:
-                    games = json.load(f)
-            except Exception as e:
-                print(f"[WARN] Failed to load cache: {e}")
-
-        # Fallback to live fetch if cache is missing or empty
-        if not games:
-            print(f"[FALLBACK] Fetching schedule for {target_date}")
-            games = fetch_schedule_by_date(datetime.combine(target_date, datetime.min.time()), force_refresh=True)
-
-        # Add game metadata
-        # Add game metadata
-        for game in games:
-            try:
-                game["Date"] = pd.to_datetime(game.get("time"), utc=True)
-            except Exception:
-                game["Date"] = pd.NaT
-
-            game["Home"] = game.get("home", "Unknown")
-            game["Away"] = game.get("opponent", "Unknown")
-            all_games.append(game)
-
-
-    if not all_games:
-        return pd.DataFrame()
-
-    df = pd.DataFrame(all_games)
-    df["Date"] = pd.to_datetime(df["Date"], errors="coerce", utc=True)
+    """Today's and tomorrow's games. Read-only when served from cache; .copy() before mutating."""
+    # One range lookup in the season schedule store
+    today = datetime.utcnow().date()
+    df = pd.DataFrame(get_games_between(today, today + timedelta(days=1)),
+                      columns=["gamePk", "home", "opponent", "time", "status"])
+    df["Date"] = pd.to_datetime(df["time"], errors="coerce", utc=True)
+    df["Home"] = df["home"]
+    df["Away"] = df["opponent"]
     return df.dropna(subset=["Date"])
@@ -1,7 +1,9 @@
 from datetime import datetime
 from utils.mlb_api import get_game_state
 from utils.schedule_utils import get_schedule
-from streamlit_autorefresh import st_autorefresh
+from utils.fragment_cache import cached_fragment
+from utils.count_index import lookup_pitch_mix, lookup_batter_count
+from utils.lazy_imports import st_autorefresh
 import streamlit as st
 import pytz
 import pandas as pd
@@ -9,13 +11,71 @@ import textwrap
 
 def render_scoreboard(game_pk, home_team="Home", away_team="Away", autorefresh=True):
     if autorefresh:
-        st_autorefresh(interval=15 * 1000, key=f"autorefresh-{game_pk}")
+        st_autorefresh()(interval=15 * 1000, key=f"autorefresh-{game_pk}")
 
     state = get_game_state(game_pk)
     if not state:
         st.info("Awaiting MLB live data feed.")
         return
 
+    count_matchup = get_count_matchup(state)
+    game_time_display = get_game_time_display(game_pk)
+
+    # Unchanged state between refresh ticks reuses the previously built HTML
+    html = cached_fragment(
+        "scoreboard",
+        (game_pk, home_team, away_team, state, count_matchup, game_time_display),
+        lambda: build_scoreboard_html(game_pk, state, home_team, away_team, count_matchup, game_time_display)
+    )
+    st.markdown(html, unsafe_allow_html=True)
+
+def get_count_matchup(state):
+    """
+    Pitch mix and batter Whiff%/K% for the current count from the precomputed
+    count index (dict lookups only; players are indexed when the page loads).
+    """
+    matchup = state.get("matchup") or {}
+    try:
+        balls, strikes = map(int, state.get("count", "0-0").split("-"))
+    except ValueError:
+        return {}
+    return {
+        "pitcher": matchup.get("pitcher"),
+        "batter": matchup.get("batter"),
+        "pitch_mix": lookup_pitch_mix(matchup.get("pitcher_id"), balls, strikes),
+        "batter_stats": lookup_batter_count(matchup.get("batter_id"), balls, strikes),
+    }
+
+def get_game_time_display(game_pk):
+    """
+    Scheduled first pitch for game_pk from the cached schedule, e.g.
+    "Scheduled: 07:05 PM EST", or "Scheduled" when it is not listed.
+    """
+    schedule_df = get_schedule()
+    game_row = schedule_df[schedule_df["gamePk"] == game_pk]
+    if not game_row.empty:
+        try:
+            est = pytz.timezone("US/Eastern")
+            scheduled_time = pd.to_datetime(game_row.iloc[0]["Date"]).tz_convert(est)
+            return f"Scheduled: {scheduled_time.strftime('%I:%M %p EST')}"
+        except Exception:
+            pass
+    return "Scheduled"
+
+def build_count_matchup_html(count, count_matchup):
+    pitch_mix = count_matchup.get("pitch_mix")
+    batter_stats = count_matchup.get("batter_stats")
+    html = ""
+    if pitch_mix:
+        mix = " · ".join(f"{pitch} {pct:.0f}%" for pitch, pct in pitch_mix[:4])
+        html += f'<p style="margin:0.25rem 0;"><strong>{count_matchup.get("pitcher") or "Pitcher"} at {count}:</strong> {mix}</p>'
+    if batter_stats:
+        html += (f'<p style="margin:0.25rem 0;"><strong>{count_matchup.get("batter") or "Batter"} at {count}:</strong> '
+                 f'Whiff {batter_stats["Whiff%"]:.1f}% · K {batter_stats["K%"]:.1f}% ({batter_stats["pitches"]} pitches)</p>')
+    return html
+
+def build_scoreboard_html(game_pk, state, home_team="Home", away_team="Away", count_matchup=None,
+                          game_time_display=None):
     # --- Extract State Info ---
     status = ""
     is_final = False
@@ -71,26 +131,17 @@ def render_scoreboard(game_pk, home_team="Home", away_team="Away", autorefresh=T
         home_style = style["tie"] if winner == "tie" else style["win"] if winner == "home" else style["loss"]
         away_style = style["tie"] if winner == "tie" else style["win"] if winner == "away" else style["loss"]
 
-        st.markdown(textwrap.dedent(f"""
+        return textwrap.dedent(f"""
             <div style="border: 1px solid #444; border-radius: 8px; padding: 16px; margin: 0.5rem 0 1.5rem 0;">
                 <h4 style="margin-bottom: 0.5rem; text-align: center;">{final_label}</h4>
                 <p style="{away_style}">{away_icon} <strong>{away_team}</strong>: {away_score} R</p>
                 <p style="{home_style}">{home_icon} <strong>{home_team}</strong>: {home_score} R</p>
             </div>
-        """), unsafe_allow_html=True)
-        return
+        """)
 
     # --- Scheduled Time Display ---
-    game_time_display = "Scheduled"
-    schedule_df = get_schedule()
-    game_row = schedule_df[schedule_df["gamePk"] == game_pk]
-    if not game_row.empty:
-        try:
-            est = pytz.timezone("US/Eastern")
-            scheduled_time = pd.to_datetime(game_row.iloc[0]["Date"]).tz_convert(est)
-            game_time_display = f"Scheduled: {scheduled_time.strftime('%I:%M %p EST')}"
-        except Exception:
-            pass
+    if game_time_display is None:
+        game_time_display = get_game_time_display(game_pk)
 
     # --- Determine Game State ---
     has_real_activity = any([
@@ -120,12 +171,13 @@ def render_scoreboard(game_pk, home_team="Home", away_team="Away", autorefresh=T
             <div><strong>Strikes:</strong> {'🔴' * strikes + '⚪️' * (2 - strikes)}</div>
         </div>
         <p style="margin: 0.25rem 0;"><strong>Outs:</strong> {'⚫️' * outs + '⚪️' * (3 - outs)}</p>
+        {build_count_matchup_html(count, count_matchup or {})}
     """
     else:
         count_html = ""
 
     # --- Final Scoreboard HTML ---
     # --- Final Scoreboard Display ---
-    st.markdown(f'<div style="border:1px solid #444;border-radius:8px;padding:16px;margin:0.5rem 0 1.5rem 0;"><h4 style="margin-bottom:0.5rem;text-align:center;">{display_title}</h4><div style="display:flex;justify-content:center;"><div style="display:flex;flex-direction:row;align-items:center;gap:36px;flex-wrap:wrap;max-width:800px;"><div style="min-width:240px;">{count_html}<p style="margin:0.25rem 0;"><strong>{away_team}</strong>: {away_score} R / {away.get("hits", 0)} H / {away.get("xba", ".000")}</p><p style="margin:0.25rem 0;"><strong>{home_team}</strong>: {home_score} R / {home.get("hits", 0)} H / {home.get("xba", ".000")}</p></div></div></div></div>', unsafe_allow_html=True)
+    return (f'<div style="border:1px solid #444;border-radius:8px;padding:16px;margin:0.5rem 0 1.5rem 0;"><h4 style="margin-bottom:0.5rem;text-align:center;">{display_title}</h4><div style="display:flex;justify-content:center;"><div style="display:flex;flex-direction:row;align-items:center;gap:36px;flex-wrap:wrap;max-width:800px;"><div style="min-width:240px;">{count_html}<p style="margin:0.25rem 0;"><strong>{away_team}</strong>: {away_score} R / {away.get("hits", 0)} H / {away.get("xba", ".000")}</p><p style="margin:0.25rem 0;"><strong>{home_team}</strong>: {home_score} R / {home.get("hits", 0)} H / {home.get("xba", ".000")}</p></div></div></div></div>')
 
 
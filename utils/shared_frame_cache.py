@@ -0,0 +1,107 @@
+# utils/shared_frame_cache.py
+import functools
+import hashlib
+import os
+import tempfile
+import time
+
+import pandas as pd
+import pyarrow as pa
+
+# DataFrames cached as Arrow IPC files on a RAM-backed filesystem. Every
+# Streamlit worker memory-maps the same file, so the OS keeps one copy of
+# the data in the page cache no matter how many processes read it, and a
+# value computed by one worker is visible to the others immediately.
+def _default_cache_dir():
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "pitch-stats-frames")
+
+SHARED_CACHE_DIR = os.environ.get("SHARED_CACHE_DIR", _default_cache_dir())
+
+def _cache_path(key):
+    return os.path.join(SHARED_CACHE_DIR, f"{key}.arrow")
+
+def _frame_prefix(fn):
+    return f"{fn.__module__}.{fn.__qualname__}"
+
+def make_frame_key(fn, args, kwargs):
+    raw = repr((args, sorted(kwargs.items())))
+    return f"{_frame_prefix(fn)}-{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+def read_shared_frame(key, ttl=None):
+    """
+    Return the cached DataFrame for key, or None if missing or older than ttl seconds.
+    The Arrow buffers are memory-mapped, not read into process memory, so the
+    returned frame's columns are read-only: call .copy() before assigning into it.
+    """
+    path = _cache_path(key)
+    try:
+        if ttl is not None and time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        return table.to_pandas(split_blocks=True)
+    except (FileNotFoundError, pa.ArrowInvalid):
+        return None
+
+def write_shared_frame(key, df):
+    """
+    Write df as an Arrow IPC file. Written to a temp file and renamed so
+    readers in other processes never see a partial file.
+    """
+    os.makedirs(SHARED_CACHE_DIR, exist_ok=True)
+    try:
+        table = pa.Table.from_pandas(df)
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        print(f"[WARN] Frame not cacheable as Arrow ({e}); skipping shared cache")
+        return False
+
+    fd, tmp_path = tempfile.mkstemp(dir=SHARED_CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, _cache_path(key))
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return True
+
+def sweep_expired(prefix, ttl):
+    """
+    Remove cached frames for one function (by key prefix) older than ttl seconds.
+    """
+    if not os.path.isdir(SHARED_CACHE_DIR):
+        return
+    cutoff = time.time() - ttl
+    for entry in os.scandir(SHARED_CACHE_DIR):
+        try:
+            if entry.name.startswith(prefix) and entry.name.endswith(".arrow") \
+                    and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except FileNotFoundError:
+            continue
+
+def shared_frame_cache(ttl=600):
+    """
+    Cross-process replacement for @st.cache_data on functions that return a
+    DataFrame, keyed by function and arguments. Non-DataFrame results are
+    returned uncached. Cache hits are read-only (see read_shared_frame);
+    callers that mutate the result must .copy() it first.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = make_frame_key(fn, args, kwargs)
+            cached = read_shared_frame(key, ttl=ttl)
+            if cached is not None:
+                return cached
+
+            result = fn(*args, **kwargs)
+            if isinstance(result, pd.DataFrame):
+                write_shared_frame(key, result)
+                sweep_expired(f"{_frame_prefix(fn)}-", ttl)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,127 @@
+# utils/similar_batters.py
+import glob
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils import disk_cache
+from utils.lazy_imports import kd_tree_class
+
+# Nearest-neighbor index over batters' per-pitch-type profiles, built from
+# the daily job's batters_by_pitch CSV. Each batter is one row of
+# [K%, Whiff%, wOBA] per pitch type, shrunk toward the league mean by PA,
+# z-scored and unit-normalized, so the k most similar batters come from a
+# single matrix-vector product (or a KD-tree once the roster is large).
+if os.environ.get("RENDER"):
+    DAILY_STATS_DIR = "/data/daily_stats"
+else:
+    DAILY_STATS_DIR = "data/daily_stats"
+
+FEATURE_METRICS = ["K%", "Whiff%", "wOBA"]
+POOLED_METRICS = ["BA", "SLG", "wOBA", "K%", "Whiff%", "PutAway%"]
+SHRINK_PITCHES = 50   # pseudo-pitches of league average blended into each cell
+TREE_MIN_BATTERS = 2000
+
+class SimilarBatterIndex:
+    def __init__(self, stats: pd.DataFrame):
+        self.stats = stats
+        self.pitch_types = sorted(stats["pitch_type"].unique())
+
+        pa = stats.pivot_table(index="batter_id", columns="pitch_type", values="PA", aggfunc="sum")
+        pa = pa.reindex(columns=self.pitch_types).fillna(0)
+        self.batter_ids = pa.index.to_numpy()
+
+        blocks = []
+        for metric in FEATURE_METRICS:
+            values = stats.pivot_table(index="batter_id", columns="pitch_type", values=metric, aggfunc="mean")
+            values = values.reindex(index=pa.index, columns=self.pitch_types)
+            league = (values * pa).sum() / pa.where(values.notna(), 0).sum()
+            shrunk = (values.fillna(0) * pa + league * SHRINK_PITCHES) / (pa + SHRINK_PITCHES)
+            blocks.append(shrunk.fillna(league).fillna(0).to_numpy(dtype=float))
+
+        matrix = np.hstack(blocks)
+        std = matrix.std(axis=0)
+        matrix = (matrix - matrix.mean(axis=0)) / np.where(std > 0, std, 1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self.matrix = matrix / np.where(norms > 0, norms, 1)
+        self.row_of = {batter_id: i for i, batter_id in enumerate(self.batter_ids)}
+        # On unit vectors, Euclidean nearest neighbors are the cosine nearest neighbors
+        # scipy is only imported for rosters big enough to use the tree; without it, brute force
+        tree_class = kd_tree_class() if len(self.matrix) >= TREE_MIN_BATTERS else None
+        self.tree = tree_class(self.matrix) if tree_class is not None else None
+
+    def query(self, batter_id, k=10):
+        """
+        The k most similar batters (excluding batter_id) as [(batter_id, cosine similarity)].
+        """
+        row = self.row_of.get(batter_id)
+        if row is None:
+            return []
+        vector = self.matrix[row]
+        k = min(k, len(self.batter_ids) - 1)
+        if k <= 0:
+            return []
+
+        if self.tree is not None:
+            distances, rows = self.tree.query(vector, k=k + 1)
+            similarity = 1 - distances ** 2 / 2
+        else:
+            scores = self.matrix @ vector
+            rows = np.argpartition(-scores, k)[:k + 1]
+            rows = rows[np.argsort(-scores[rows])]
+            similarity = scores[rows]
+        return [
+            (int(self.batter_ids[r]), float(s))
+            for r, s in zip(rows, similarity) if r != row
+        ][:k]
+
+    def pooled_estimate(self, batter_id, pitch_types, k=10) -> pd.DataFrame:
+        """
+        PA-weighted per-pitch metrics pooled over the batter's k nearest neighbors.
+        """
+        neighbors = [neighbor for neighbor, _ in self.query(batter_id, k)]
+        if not neighbors:
+            return pd.DataFrame()
+        rows = self.stats[self.stats["batter_id"].isin(neighbors) & self.stats["pitch_type"].isin(pitch_types)]
+        if rows.empty:
+            return pd.DataFrame()
+
+        # Each metric is averaged over the PA of the rows that have it, so a
+        # neighbor missing a metric doesn't pull that metric toward zero
+        metrics = rows[POOLED_METRICS]
+        weighted = metrics.mul(rows["PA"], axis=0)
+        metric_pa = metrics.notna().mul(rows["PA"], axis=0)
+        by_pitch = rows["pitch_type"]
+        pooled = weighted.groupby(by_pitch).sum() / metric_pa.groupby(by_pitch).sum().replace(0, np.nan)
+        pooled.insert(0, "PA", rows.groupby("pitch_type")["PA"].sum().astype(int))
+        return pooled.rename_axis("pitch_type").reset_index()
+
+
+def latest_batter_stats_path(data_dir=DAILY_STATS_DIR):
+    paths = sorted(glob.glob(os.path.join(data_dir, "batters_by_pitch_*.csv")))
+    return paths[-1] if paths else None
+
+_index = None
+_index_source = None
+_index_lock = threading.Lock()
+
+def get_similar_batter_index(data_dir=DAILY_STATS_DIR):
+    """
+    Index over the newest daily batters CSV, rebuilt when a newer file appears.
+    None until the daily job has run.
+    """
+    global _index, _index_source
+    path = latest_batter_stats_path(data_dir)
+    if path is None:
+        return None
+    with _index_lock:
+        source = (path, os.path.getmtime(path))
+        if source != _index_source:
+            stats = disk_cache.read_frame(path)
+            for col in ["PA"] + POOLED_METRICS:
+                stats[col] = pd.to_numeric(stats[col], errors="coerce")
+            _index = SimilarBatterIndex(stats.dropna(subset=["PA"]))
+            _index_source = source
+        return _index
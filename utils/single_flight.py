@@ -0,0 +1,59 @@
+# utils/single_flight.py
+import functools
+import threading
+from concurrent.futures import Future
+
+import pandas as pd
+
+# In-flight calls shared by every Streamlit session in the process.
+# The first caller for a key runs the function; concurrent callers for
+# the same key block on its Future and receive the same result (or error).
+inflight_calls = {}
+_inflight_lock = threading.Lock()
+
+def make_call_key(fn, args, kwargs):
+    return (fn.__module__, fn.__qualname__, args, tuple(sorted(kwargs.items())))
+
+def run_single_flight(key, fn, *args, **kwargs):
+    """
+    Run fn(*args, **kwargs) once per key at a time. Callers that arrive while
+    a call for the same key is running wait for it instead of starting another.
+    """
+    with _inflight_lock:
+        future = inflight_calls.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = Future()
+            inflight_calls[key] = future
+
+    if not is_leader:
+        result = future.result()
+        # Pages mutate returned frames in place; give each waiter its own copy
+        return result.copy() if isinstance(result, pd.DataFrame) else result
+
+    try:
+        result = fn(*args, **kwargs)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            inflight_calls.pop(key, None)
+
+def single_flight(fn):
+    """
+    Decorator form of run_single_flight, keyed by function and arguments.
+    Place it under @st.cache_data so concurrent cache misses share one fetch.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            key = make_call_key(fn, args, kwargs)
+            hash(key)
+        except TypeError:
+            # Unhashable arguments (e.g. DataFrames) cannot be deduplicated
+            return fn(*args, **kwargs)
+        return run_single_flight(key, fn, *args, **kwargs)
+    return wrapper
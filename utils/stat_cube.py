@@ -0,0 +1,149 @@
+# utils/stat_cube.py
+import numpy as np
+import pandas as pd
+
+# Dense cube of additive counters over
+#   (player, pitch_type, opposing hand, balls, strikes, counter)
+# built in one vectorized pass over raw Statcast. Because every counter is a
+# plain sum, any split (platoon, count, two-strike) or roll-up (the per-pitch
+# tables) is a sum over cube axes; the raw pitches are never needed again.
+HANDS = ["L", "R", "?"]
+MAX_BALLS = 4
+MAX_STRIKES = 3
+
+COUNTERS = [
+    "pitches", "strikeouts", "whiffs", "putaways",
+    "ba_sum", "ba_n", "slg_sum", "slg_n", "woba_sum", "woba_n",
+]
+C = {name: i for i, name in enumerate(COUNTERS)}
+
+EXPECTED_STATS = {
+    "ba": "estimated_ba_using_speedangle",
+    "slg": "estimated_slg_using_speedangle",
+    "woba": "estimated_woba_using_speedangle",
+}
+
+class StatCube:
+    def __init__(self, players, pitch_types, counts):
+        self.players = players          # sorted player IDs (axis 0)
+        self.pitch_types = pitch_types  # pitch type codes (axis 1)
+        self.counts = counts            # float64 array, shape (P, T, H, B, S, C)
+
+    def _player_pos(self, player_id):
+        pos = np.searchsorted(self.players, player_id)
+        if pos < len(self.players) and self.players[pos] == player_id:
+            return pos
+        return None
+
+    def select(self, player_id=None, hand=None, balls=None, strikes=None, two_strikes=False):
+        """
+        Sum the cube down to a (pitch_type, counter) array for the requested split.
+        Each filter left as None keeps every value on that axis.
+        """
+        cube = self.counts
+        if player_id is not None:
+            pos = self._player_pos(player_id)
+            if pos is None:
+                return np.zeros((len(self.pitch_types), len(COUNTERS)))
+            cube = cube[pos:pos + 1]
+        if hand is not None:
+            cube = cube[:, :, [HANDS.index(hand)]]
+        if balls is not None:
+            cube = cube[:, :, :, [min(balls, MAX_BALLS - 1)]]
+        if two_strikes:
+            cube = cube[:, :, :, :, [MAX_STRIKES - 1]]
+        elif strikes is not None:
+            cube = cube[:, :, :, :, [min(strikes, MAX_STRIKES - 1)]]
+        return cube.sum(axis=(0, 2, 3, 4))
+
+    def pitch_type_summary(self, player_id=None, pitch_type_names=None, **split) -> pd.DataFrame:
+        """
+        Per-pitch-type table (PA, BA, SLG, wOBA, K%, Whiff%, PutAway%) for a split.
+        """
+        totals = self.select(player_id, **split)
+        pitches = totals[:, C["pitches"]]
+        keep = pitches > 0
+        totals, pitches = totals[keep], pitches[keep]
+        names = [
+            (pitch_type_names or {}).get(code, code)
+            for code, kept in zip(self.pitch_types, keep) if kept
+        ]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            summary = pd.DataFrame({
+                "pitch_type": names,
+                "PA": pitches.astype(int),
+                "BA": totals[:, C["ba_sum"]] / totals[:, C["ba_n"]],
+                "SLG": totals[:, C["slg_sum"]] / totals[:, C["slg_n"]],
+                "wOBA": totals[:, C["woba_sum"]] / totals[:, C["woba_n"]],
+                "K%": totals[:, C["strikeouts"]] / pitches * 100,
+                "Whiff%": totals[:, C["whiffs"]] / pitches * 100,
+                "PutAway%": totals[:, C["putaways"]] / pitches * 100,
+            })
+        return summary
+
+
+def _codes(values, categories):
+    return pd.Categorical(values, categories=categories).codes.astype(np.int64)
+
+def build_stat_cube(df: pd.DataFrame, player_col="pitcher", hand_col="stand") -> StatCube:
+    """
+    Build a StatCube from a (compact or raw) Statcast frame in one pass.
+    hand_col is the opposing hand: "stand" for pitchers, "p_throws" for batters.
+    Pitches without a pitch_type are skipped, matching the per-pitch tables.
+    """
+    df = df[df["pitch_type"].notna()]
+    players = np.unique(df[player_col].to_numpy(dtype=np.int64))
+    pitch_types = sorted(df["pitch_type"].astype(str).unique())
+    shape = (len(players), len(pitch_types), len(HANDS), MAX_BALLS, MAX_STRIKES)
+
+    hand = df[hand_col].astype(object).where(df[hand_col].isin(HANDS[:2]), "?") if hand_col in df.columns \
+        else pd.Series("?", index=df.index)
+    balls = pd.to_numeric(df["balls"], errors="coerce").fillna(0).clip(0, MAX_BALLS - 1) if "balls" in df.columns \
+        else pd.Series(0, index=df.index)
+    strikes = pd.to_numeric(df["strikes"], errors="coerce").fillna(0).clip(0, MAX_STRIKES - 1) if "strikes" in df.columns \
+        else pd.Series(0, index=df.index)
+
+    flat = np.ravel_multi_index((
+        np.searchsorted(players, df[player_col].to_numpy(dtype=np.int64)),
+        _codes(df["pitch_type"].astype(str), pitch_types),
+        _codes(hand, HANDS),
+        balls.to_numpy(dtype=np.int64),
+        strikes.to_numpy(dtype=np.int64),
+    ), shape)
+    size = int(np.prod(shape))
+
+    description = df["description"].astype(str)
+    weights = {
+        "pitches": np.ones(len(df)),
+        "strikeouts": (df["events"].astype(object) == "strikeout").to_numpy(dtype=float),
+        "whiffs": description.str.contains("swinging_strike").to_numpy(dtype=float),
+        "putaways": description.str.contains("strikeout|swinging_strike").to_numpy(dtype=float),
+    }
+    for key, col in EXPECTED_STATS.items():
+        values = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float) if col in df.columns \
+            else np.full(len(df), np.nan)
+        present = ~np.isnan(values)
+        weights[f"{key}_sum"] = np.where(present, values, 0.0)
+        weights[f"{key}_n"] = present.astype(float)
+
+    counts = np.stack(
+        [np.bincount(flat, weights=weights[name], minlength=size) for name in COUNTERS],
+        axis=-1,
+    ).reshape(shape + (len(COUNTERS),))
+    return StatCube(players, pitch_types, counts)
+
+def combine_cubes(*cubes) -> StatCube:
+    """
+    Add cubes together, aligning their player and pitch type axes.
+    None entries are skipped.
+    """
+    cubes = [cube for cube in cubes if cube is not None]
+    players = np.unique(np.concatenate([cube.players for cube in cubes])) if cubes else np.zeros(0, dtype=np.int64)
+    pitch_types = sorted({code for cube in cubes for code in cube.pitch_types})
+    counts = np.zeros((len(players), len(pitch_types), len(HANDS), MAX_BALLS, MAX_STRIKES, len(COUNTERS)))
+    for cube in cubes:
+        p_pos = np.searchsorted(players, cube.players)
+        t_pos = [pitch_types.index(code) for code in cube.pitch_types]
+        counts[np.ix_(p_pos, t_pos)] += cube.counts
+    return StatCube(players, pitch_types, counts)
@@ -1,12 +1,16 @@
+import threading
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from pybaseball import statcast_pitcher, statcast_batter
-from utils.mlb_api import (
-    get_pitcher_advanced_metrics_by_name,
-    get_player_id,
-    get_batter_putaway_by_pitch
-)
+from utils.player_registry import lookup_player_id
+from utils.single_flight import single_flight
+from utils.upstream import serve_stale_on_open
+from utils.shared_frame_cache import shared_frame_cache
+from utils.instrumentation import instrumented_cache
+from utils.pitch_store import get_pitch_store
+from utils.stat_cube import build_stat_cube
+from utils.statcast_chunks import fetch_statcast_range
+from utils.lazy_imports import pybaseball_function
 
 PITCH_TYPE_MAP = {
     "FF": "4-Seam Fastball", "SL": "Slider", "CH": "Changeup", "CU": "Curveball",
@@ -14,125 +18,179 @@ PITCH_TYPE_MAP = {
     "KC": "Knuckle Curve", "ST": "Sweeper", "SV": "Slurve"
 }
 
-@st.cache_data(ttl=600)
-def get_pitcher_stats(name: str, start_date="2024-03-01", end_date=None) -> pd.DataFrame:
-    try:
-        first, last = name.strip().split(" ", 1)
-    except ValueError:
-        return pd.DataFrame()
-
-    pid = get_player_id(first, last)
-    if not pid:
-        return pd.DataFrame()
-
-    if not end_date:
-        end_date = datetime.now().strftime("%Y-%m-%d")
-
-    df = statcast_pitcher(start_date, end_date, pid)
+# --- Lean Statcast frames ---
+# Columns the aggregations below actually read; the other ~80 Savant columns are dropped on fetch
+STATCAST_COLUMNS = [
+    "pitch_type", "batter", "pitcher", "events", "description", "stand", "p_throws", "balls", "strikes",
+    "estimated_ba_using_speedangle", "estimated_slg_using_speedangle", "estimated_woba_using_speedangle"
+]
+CATEGORICAL_COLUMNS = ["pitch_type", "events", "description", "stand", "p_throws"]
+INT8_COLUMNS = ["balls", "strikes"]
+FLOAT32_COLUMNS = [
+    "estimated_ba_using_speedangle", "estimated_slg_using_speedangle", "estimated_woba_using_speedangle"
+]
+
+def compact_statcast_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Project a raw Statcast frame to STATCAST_COLUMNS, store the low-cardinality
+    text columns as categoricals and the expected stats as float32.
+    """
     if df.empty:
-        return pd.DataFrame()
-
-    df = df[df["pitch_type"].notna()]
-    grouped = df.groupby("pitch_type")
-
-    summary = grouped.agg(
-        PA=("batter", "count"),
-        BA=("estimated_ba_using_speedangle", "mean"),
-        SLG=("estimated_slg_using_speedangle", "mean"),
-        wOBA=("estimated_woba_using_speedangle", "mean"),
-        K_rate=("events", lambda x: (x == "strikeout").sum() / len(x) * 100),
-        Whiff_rate=("description", lambda x: x.str.contains("swinging_strike").sum() / len(x) * 100),
-        PutAway_rate=("description", lambda x: (x.str.contains("strikeout|swinging_strike")).sum() / len(x) * 100)
-    )
-
-    summary = summary.rename(columns={
-        "K_rate": "K%", "Whiff_rate": "Whiff%", "PutAway_rate": "PutAway%"
-    })
-
-    summary.index = summary.index.map(lambda code: PITCH_TYPE_MAP.get(code, code))
-    summary = summary.reset_index().rename(columns={"index": "pitch_type"})
-    return summary[summary["PA"] > 0]
-
-@st.cache_data(ttl=600)
-def get_batter_k_rate_by_pitch(batter_name: str, start_date="2024-03-01", end_date=None) -> dict:
+        return df
+
+    df = df[[col for col in STATCAST_COLUMNS if col in df.columns]].copy()
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    for col in INT8_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype("int8")
+    for col in FLOAT32_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float32")
+    return df
+
+class _CompactionTally:
+    """
+    compact_statcast_frame as a fetch's `prepare` step, adding up the savings
+    over every chunk (chunks are prepared on pool threads) for one log line.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pitches = self.before = self.after = 0
+
+    def __call__(self, df):
+        before = df.memory_usage(deep=True).sum()
+        df = compact_statcast_frame(df)
+        after = df.memory_usage(deep=True).sum()
+        with self.lock:
+            self.pitches += len(df)
+            self.before += before
+            self.after += after
+        return df
+
+    def report(self, label):
+        if self.pitches:
+            print(f"[MEMORY] {label} ({self.pitches} pitches fetched): {self.before / 1e6:.2f} MB -> "
+                  f"{self.after / 1e6:.2f} MB, saved {(self.before - self.after) / 1e6:.2f} MB")
+
+def _fetch_compacted(fetcher, kind, start_date, end_date, player_id):
+    tally = _CompactionTally()
     try:
-        first, last = batter_name.strip().split(" ", 1)
-    except ValueError:
-        return {}
-
-    batter_id = get_player_id(first, last)
-    if not batter_id:
-        return {}
-
+        return fetch_statcast_range(pybaseball_function(fetcher), kind, start_date, end_date, player_id,
+                                    prepare=tally)
+    finally:
+        tally.report(f"Statcast {kind} {player_id} {start_date}..{end_date}")
+
+def fetch_statcast_pitcher(start_date, end_date, player_id) -> pd.DataFrame:
+    store = get_pitch_store()
+    if store is not None and store.covers(start_date, end_date):
+        return store.to_frame(store.pitcher_pitches(player_id, start_date, end_date))
+
+    return _fetch_compacted("statcast_pitcher", "pitcher", start_date, end_date, player_id)
+
+def fetch_statcast_batter(start_date, end_date, player_id) -> pd.DataFrame:
+    store = get_pitch_store()
+    if store is not None and store.covers(start_date, end_date):
+        return store.to_frame(store.batter_pitches(player_id, start_date, end_date))
+
+    return _fetch_compacted("statcast_batter", "batter", start_date, end_date, player_id)
+
+# --- Pitch cubes (one aggregation pass; every table below is a roll-up of these) ---
+# st.cache_data keys on the arguments as passed, so get_pitcher_cube(pid) and
+# get_pitcher_cube(pid, "2024-03-01", None) would be separate entries. The
+# public functions pass every argument positionally to the cached ones, so all
+# callers share one entry per (player, range).
+@instrumented_cache(st.cache_data(ttl=600))
+@serve_stale_on_open
+@single_flight
+def _pitcher_cube(player_id, start_date, end_date):
     if not end_date:
         end_date = datetime.now().strftime("%Y-%m-%d")
 
-    df = statcast_batter(start_date, end_date, batter_id)
+    df = fetch_statcast_pitcher(start_date, end_date, player_id)
     if df.empty or "pitch_type" not in df.columns:
-        return {}
-
-    df = df[df["pitch_type"].notna()]
-    grouped = df.groupby("pitch_type")
+        return None
+    return build_stat_cube(df, player_col="pitcher", hand_col="stand")
 
-    k_rate = grouped.apply(lambda x: (x["events"] == "strikeout").sum() / len(x) * 100).round(2)
-
-    return {
-        PITCH_TYPE_MAP.get(pitch, pitch): f"{k_rate.get(pitch, 0.0):.2f}%"
-        for pitch in df["pitch_type"].unique()
-    }
-
-def get_batter_metrics_by_pitch(batter_id: int, start_date="2024-03-01", end_date=None) -> pd.DataFrame:
+@instrumented_cache(st.cache_data(ttl=600))
+@serve_stale_on_open
+@single_flight
+def _batter_cube(player_id, start_date, end_date):
     if not end_date:
         end_date = datetime.now().strftime("%Y-%m-%d")
 
-    df = statcast_batter(start_date, end_date, batter_id)
+    df = fetch_statcast_batter(start_date, end_date, player_id)
     if df.empty or "pitch_type" not in df.columns:
+        return None
+    return build_stat_cube(df, player_col="batter", hand_col="p_throws")
+
+def get_pitcher_cube(player_id: int, start_date="2024-03-01", end_date=None):
+    return _pitcher_cube(int(player_id), start_date, end_date)
+
+def get_batter_cube(player_id: int, start_date="2024-03-01", end_date=None):
+    return _batter_cube(int(player_id), start_date, end_date)
+
+def get_pitcher_split_stats(player_id: int, start_date="2024-03-01", end_date=None,
+                            hand=None, balls=None, strikes=None, two_strikes=False) -> pd.DataFrame:
+    """
+    Per-pitch table for a platoon/count split, e.g. hand="L" or balls=0, strikes=2.
+    """
+    cube = get_pitcher_cube(player_id, start_date, end_date)
+    if cube is None:
         return pd.DataFrame()
+    return cube.pitch_type_summary(player_id, PITCH_TYPE_MAP, hand=hand, balls=balls,
+                                   strikes=strikes, two_strikes=two_strikes)
 
-    df = df[df["pitch_type"].notna()]
-    grouped = df.groupby("pitch_type")
-
-    summary = grouped.agg(
-        PA=("pitch_type", "count"),
-        BA=("estimated_ba_using_speedangle", "mean"),
-        SLG=("estimated_slg_using_speedangle", "mean"),
-        wOBA=("estimated_woba_using_speedangle", "mean"),
-        K_rate=("events", lambda x: (x == "strikeout").sum() / len(x) * 100),
-        Whiff_rate=("description", lambda x: x.str.contains("swinging_strike").sum() / len(x) * 100),
-        PutAway_rate=("description", lambda x: (x.str.contains("strikeout|swinging_strike")).sum() / len(x) * 100)
-    )
+def get_batter_split_stats(player_id: int, start_date="2024-03-01", end_date=None,
+                           hand=None, balls=None, strikes=None, two_strikes=False) -> pd.DataFrame:
+    cube = get_batter_cube(player_id, start_date, end_date)
+    if cube is None:
+        return pd.DataFrame()
+    return cube.pitch_type_summary(player_id, PITCH_TYPE_MAP, hand=hand, balls=balls,
+                                   strikes=strikes, two_strikes=two_strikes)
 
-    summary = summary.rename(columns={
-        "K_rate": "K%", "Whiff_rate": "Whiff%", "PutAway_rate": "PutAway%"
-    })
+@instrumented_cache(shared_frame_cache(ttl=600))
+@serve_stale_on_open
+@single_flight
+def get_pitcher_stats(name: str, start_date="2024-03-01", end_date=None) -> pd.DataFrame:
+    """Per-pitch-type stats for a pitcher by name. Read-only when served from cache; .copy() before mutating."""
+    pid = lookup_player_id(name)
+    if not pid:
+        return pd.DataFrame()
+    return get_pitcher_split_stats(pid, start_date, end_date)
+
+@instrumented_cache(st.cache_data(ttl=600))
+@serve_stale_on_open
+@single_flight
+def get_batter_k_rate_by_id(batter_id: int, start_date="2024-03-01", end_date=None) -> dict:
+    """
+    {pitch type: "K%"} for a batter. Prefer this over the by-name lookup when
+    the player ID is known; two players can share a name.
+    """
+    summary = get_batter_split_stats(batter_id, start_date, end_date)
+    if summary.empty:
+        return {}
 
-    summary.index = summary.index.map(lambda code: PITCH_TYPE_MAP.get(code, code))
-    return summary.reset_index().rename(columns={"index": "pitch_type"})
+    return {
+        pitch: f"{k_rate:.2f}%"
+        for pitch, k_rate in zip(summary["pitch_type"], summary["K%"].round(2))
+    }
 
-def get_pitcher_arsenal_stats(player_id: int, start_date="2024-03-01", end_date=None) -> pd.DataFrame:
-    if not end_date:
-        end_date = datetime.now().strftime("%Y-%m-%d")
+def get_batter_k_rate_by_pitch(batter_name: str, start_date="2024-03-01", end_date=None) -> dict:
+    batter_id = lookup_player_id(batter_name)
+    if not batter_id:
+        return {}
+    return get_batter_k_rate_by_id(batter_id, start_date, end_date)
 
-    df = statcast_pitcher(start_date, end_date, player_id)
-    if df.empty or "pitch_type" not in df.columns:
-        return pd.DataFrame()
+@instrumented_cache(shared_frame_cache(ttl=600))
+@single_flight
+def get_batter_metrics_by_pitch(batter_id: int, start_date="2024-03-01", end_date=None) -> pd.DataFrame:
+    """Per-pitch-type stats for a batter. Read-only when served from cache; .copy() before mutating."""
+    return get_batter_split_stats(batter_id, start_date, end_date)
 
-    df = df[df["pitch_type"].notna()]
-    grouped = df.groupby("pitch_type")
-
-    summary = grouped.agg(
-        PA=("batter", "count"),
-        BA=("estimated_ba_using_speedangle", "mean"),
-        SLG=("estimated_slg_using_speedangle", "mean"),
-        wOBA=("estimated_woba_using_speedangle", "mean"),
-        K_rate=("events", lambda x: (x == "strikeout").sum() / len(x) * 100),
-        Whiff_rate=("description", lambda x: x.str.contains("swinging_strike").sum() / len(x) * 100),
-        PutAway_rate=("description", lambda x: (x.str.contains("strikeout|swinging_strike")).sum() / len(x) * 100)
-    )
-
-    summary = summary.rename(columns={
-        "K_rate": "K%", "Whiff_rate": "Whiff%", "PutAway_rate": "PutAway%"
-    })
-
-    summary.index = summary.index.map(lambda code: PITCH_TYPE_MAP.get(code, code))
-    return summary.reset_index().rename(columns={"index": "pitch_type"})
+@instrumented_cache(shared_frame_cache(ttl=600))
+@single_flight
+def get_pitcher_arsenal_stats(player_id: int, start_date="2024-03-01", end_date=None) -> pd.DataFrame:
+    """Per-pitch-type stats for a pitcher by id. Read-only when served from cache; .copy() before mutating."""
+    return get_pitcher_split_stats(player_id, start_date, end_date)
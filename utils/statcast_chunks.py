@@ -0,0 +1,176 @@
+# utils/statcast_chunks.py
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+from utils import disk_cache
+from utils.upstream import SAVANT_HOST, call_upstream
+
+# Long Statcast ranges are split into few, large chunks, since every chunk
+# is one Savant request and Savant allows one request a second. Off-season
+# months (no games) are skipped. A finished season is one chunk. The season
+# in progress is one chunk up to the end of last month, which settles and is
+# cached (its key moves once a month), plus the current month, which is the
+# live tail. Chunks are fetched concurrently (each call still goes through the
+# Savant rate limiter and breaker) and cached independently. A manifest per
+# (kind, player) records the completed chunks, so a failed chunk is the only
+# thing refetched on the next call.
+if os.environ.get("RENDER"):
+    CHUNK_CACHE_DIR = Path(os.environ.get("STATCAST_CHUNK_DIR", "/data/statcast_chunks"))
+else:
+    CHUNK_CACHE_DIR = Path(os.environ.get("STATCAST_CHUNK_DIR", "data/statcast_chunks"))
+
+SEASON_OPEN = (3, 1)    # (month, day) spring training and the regular season start after this
+SEASON_CLOSE = (11, 7)  # the World Series can run into the first days of November
+MAX_WORKERS = 4
+SETTLE_DAYS = 2  # chunks ending this close to today may still change; never marked complete
+
+def date_chunks(start_date, end_date, today=None):
+    """
+    Split [start_date, end_date] (inclusive, YYYY-MM-DD) into fetch chunks:
+    one per season, with the current month split off the season in progress.
+    Dates outside SEASON_OPEN..SEASON_CLOSE are dropped.
+    """
+    start = datetime.strptime(start_date, "%Y-%m-%d").date()
+    end = datetime.strptime(end_date, "%Y-%m-%d").date()
+    month_start = (today or date.today()).replace(day=1)
+    chunks = []
+    for year in range(start.year, end.year + 1):
+        lo = max(start, date(year, *SEASON_OPEN))
+        hi = min(end, date(year, *SEASON_CLOSE))
+        if lo > hi:
+            continue
+        if lo < month_start <= hi:
+            chunks.append((lo.isoformat(), (month_start - timedelta(days=1)).isoformat()))
+            lo = month_start
+        chunks.append((lo.isoformat(), hi.isoformat()))
+    return chunks
+
+def _chunk_dir(kind, player_id):
+    return CHUNK_CACHE_DIR / (f"{kind}-{player_id}" if player_id is not None else kind)
+
+def _chunk_path(chunk_dir, chunk):
+    return chunk_dir / f"{chunk[0]}_{chunk[1]}.feather"
+
+def load_manifest(chunk_dir):
+    try:
+        return disk_cache.read_json(chunk_dir / "manifest.json") or {}
+    except ValueError:
+        return {}
+
+def save_manifest(chunk_dir, manifest):
+    """
+    Merge manifest into the one on disk (another worker may have recorded
+    chunks meanwhile) under the manifest's lock, and write it atomically.
+    """
+    path = chunk_dir / "manifest.json"
+    with disk_cache.locked(path):
+        disk_cache.write_json(path, {**load_manifest(chunk_dir), **manifest})
+
+def _is_settled(chunk):
+    cutoff = (datetime.now() - timedelta(days=SETTLE_DAYS)).date().isoformat()
+    return chunk[1] < cutoff
+
+def _read_chunk(chunk_dir, chunk):
+    try:
+        return pd.read_feather(_chunk_path(chunk_dir, chunk))
+    except (FileNotFoundError, OSError, ValueError):
+        return None
+
+def _write_chunk(chunk_dir, chunk, df):
+    # Feather is already compressed (lz4), so chunks only borrow the atomic rename
+    try:
+        with disk_cache.atomic_path(_chunk_path(chunk_dir, chunk)) as tmp_path:
+            df.reset_index(drop=True).to_feather(tmp_path)
+    except Exception as e:
+        print(f"[WARN] Could not cache Statcast chunk {chunk[0]}..{chunk[1]}: {e}")
+        return False
+    return True
+
+def _concat_chunks(frames):
+    frames = [df for df in frames if df is not None and not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True)
+    # Categoricals with different categories per chunk concat to object; restore them
+    for col in frames[0].columns:
+        if not isinstance(df[col].dtype, pd.CategoricalDtype) and all(isinstance(f[col].dtype, pd.CategoricalDtype) for f in frames if col in f):
+            df[col] = df[col].astype("category")
+    return df
+
+def fetch_statcast_range(fetch_fn, kind, start_date, end_date, player_id=None, prepare=None):
+    """
+    Fetch fetch_fn's Statcast data for [start_date, end_date] in date_chunks chunks.
+
+    fetch_fn is called as fetch_fn(chunk_start, chunk_end, player_id) (or without
+    player_id when it is None). prepare, if given, is applied to each chunk before
+    it is cached. Chunks already in the manifest are read from disk; the rest are
+    fetched concurrently. If any chunk fails, the successful ones are still cached
+    and the first error is raised, so a retry only refetches the failures.
+    """
+    chunk_dir = _chunk_dir(kind, player_id)
+    chunk_dir.mkdir(parents=True, exist_ok=True)
+    chunks = date_chunks(start_date, end_date)
+    frames, missing = _read_cached_chunks(chunk_dir, chunks)
+    if not missing:
+        return _concat_chunks(frames[chunk] for chunk in chunks)
+
+    # One worker fetches a player's missing chunks; the others wait, then
+    # re-read the manifest and fetch only what is still missing
+    with disk_cache.locked(chunk_dir / "fetch"):
+        frames, missing = _read_cached_chunks(chunk_dir, chunks)
+        errors = _fetch_missing_chunks(fetch_fn, kind, player_id, prepare, chunk_dir, chunks, frames, missing)
+
+    if errors:
+        raise errors[0]
+    return _concat_chunks(frames[chunk] for chunk in chunks)
+
+def _read_cached_chunks(chunk_dir, chunks):
+    """
+    ({chunk: df} for chunks in the manifest and on disk, [chunks still missing]).
+    """
+    manifest = load_manifest(chunk_dir)
+    frames = {}
+    missing = []
+    for chunk in chunks:
+        df = _read_chunk(chunk_dir, chunk) if f"{chunk[0]}_{chunk[1]}" in manifest else None
+        if df is None:
+            missing.append(chunk)
+        else:
+            frames[chunk] = df
+    return frames, missing
+
+def _fetch_missing_chunks(fetch_fn, kind, player_id, prepare, chunk_dir, chunks, frames, missing):
+    """
+    Fetch `missing` into `frames`, caching settled chunks. Returns the errors.
+    """
+    def fetch_chunk(chunk):
+        args = (chunk[0], chunk[1]) if player_id is None else (chunk[0], chunk[1], player_id)
+        df = call_upstream(SAVANT_HOST, fetch_fn, *args)
+        return prepare(df) if prepare is not None and not df.empty else df
+
+    errors = []
+    manifest = {}
+    if missing:
+        print(f"[CHUNKS] {kind} {player_id or ''}: {len(chunks) - len(missing)}/{len(chunks)} cached, "
+              f"fetching {len(missing)}")
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(missing))) as pool:
+            futures = {chunk: pool.submit(fetch_chunk, chunk) for chunk in missing}
+            for chunk, future in futures.items():
+                try:
+                    df = future.result()
+                except Exception as e:
+                    print(f"[ERROR] Statcast chunk {chunk[0]}..{chunk[1]} failed: {e}")
+                    errors.append(e)
+                    continue
+                frames[chunk] = df
+                if _is_settled(chunk) and _write_chunk(chunk_dir, chunk, df):
+                    manifest[f"{chunk[0]}_{chunk[1]}"] = {
+                        "rows": len(df),
+                        "fetched_at": datetime.now().isoformat(timespec="seconds"),
+                    }
+        save_manifest(chunk_dir, manifest)
+    return errors
@@ -1,11 +1,15 @@
 import pandas as pd
 from .style_utils import (
-    get_batter_red_green_shade,
-    get_batter_blue_red_shade,
-    get_pitcher_red_green_shade,
-    get_pitcher_blue_red_shade,
-    get_delta_red_blue
+    batter_red_green_css,
+    batter_blue_red_css,
+    pitcher_red_green_css,
+    pitcher_blue_red_css,
+    delta_red_blue_css,
+    percentile_css
 )
+from .league_sketches import has_sketch, league_percentiles
+
+RED, BLUE, GREEN = "255, 0, 0", "0, 102, 255", "0, 153, 0"
 
 def sanitize_numeric_columns(df, columns):
     """
@@ -16,23 +20,57 @@ def sanitize_numeric_columns(df, columns):
             df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0.000).round(3)
     return df
 
+def _apply_css(df: pd.DataFrame, shaders) -> pd.DataFrame.style:
+    """
+    Build one CSS frame for the whole table (one vectorized pass per column group)
+    and hand it to the Styler in a single apply(axis=None).
+    """
+    css = pd.DataFrame("", index=df.index, columns=df.columns)
+    for columns, shader in shaders:
+        cols = [col for col in columns if col in df.columns]
+        if cols:
+            css[cols] = shader(df[cols])
+    return df.style.apply(lambda _: css, axis=None)
+
+def _league_shader(df, role, high_rgb, low_rgb, fallback):
+    """
+    Shade by league percentile (per pitch type) for metrics the daily job has
+    published a sketch for; other columns use the fixed-cap fallback shader.
+    """
+    pitch_types = df["pitch_type"].to_numpy(dtype=object) if "pitch_type" in df.columns else None
+
+    def shader(block):
+        css = fallback(block)
+        for col in block.columns:
+            if has_sketch(role, col):
+                values = pd.to_numeric(block[col], errors="coerce").to_numpy(dtype=float)
+                css[col] = percentile_css(values, league_percentiles(role, col, values, pitch_types), high_rgb, low_rgb)
+        return css
+    return shader
+
 def style_pitcher_table(df: pd.DataFrame) -> pd.DataFrame.style:
     """
     Apply styles to the pitcher table including color shading for specific metrics.
     """
-    return df.style.applymap(get_pitcher_blue_red_shade, subset=["BA", "SLG", "wOBA"]) \
-                   .applymap(lambda x: get_pitcher_red_green_shade(x, high_is_good=True), subset=["K%", "Whiff%", "PutAway%"])
+    return _apply_css(df, [
+        (["BA", "SLG", "wOBA"], _league_shader(df, "pitcher", RED, BLUE, pitcher_blue_red_css)),
+        (["K%", "Whiff%", "PutAway%"], _league_shader(
+            df, "pitcher", GREEN, RED, lambda d: pitcher_red_green_css(d, high_is_good=True))),
+    ])
 
 def style_batter_table(df: pd.DataFrame) -> pd.DataFrame.style:
     """
     Apply styles to the batter table including color shading for specific metrics.
     """
-    return df.style.applymap(lambda x: get_batter_red_green_shade(x, high_is_bad=True), subset=["K%", "Whiff%", "PutAway%"]) \
-                   .applymap(get_batter_blue_red_shade, subset=["BA", "SLG", "wOBA"])
+    return _apply_css(df, [
+        (["K%", "Whiff%", "PutAway%"], _league_shader(
+            df, "batter", RED, GREEN, lambda d: batter_red_green_css(d, high_is_bad=True))),
+        (["BA", "SLG", "wOBA"], _league_shader(df, "batter", BLUE, RED, batter_blue_red_css)),
+    ])
 
 def style_delta_table(df: pd.DataFrame) -> pd.DataFrame.style:
     """
     Apply styles to the delta table for pitch type comparison between batter and pitcher.
     """
     delta_cols = [col for col in df.columns if "Δ" in col]
-    return df.style.applymap(get_delta_red_blue, subset=delta_cols)
+    return _apply_css(df, [(delta_cols, delta_red_blue_css)])
@@ -1,89 +1,99 @@
 # utils/style_utils.py
 
-def get_batter_red_green_shade(percent, high_is_bad=True):
+import numpy as np
+import pandas as pd
+
+WHITE_TEXT = "color: white;"
+
+def get_red_shade(percent_str):
     try:
-        val = float(percent)
-        if val == 0:
-            return ""  # No background for 0 values
+        value = float(percent_str.strip('%')) if isinstance(percent_str, str) else float(percent_str)
+        if value == 0:
+            return ""
     except:
         return "color: white;"
-    capped = min(val, 50)
+    capped = min(value, 50)
     alpha = capped / 50
+    return f"background-color: rgba(255, 0, 0, {alpha:.2f}); color: white;"
+
+
+# --- Vectorized shading (whole-column CSS) ---
+def _numeric_block(data):
+    """
+    Coerce a DataFrame/Series block to a float ndarray; non-numeric cells become NaN.
+    """
+    if isinstance(data, pd.Series):
+        return pd.to_numeric(data, errors="coerce").to_numpy(dtype=float)
+    return data.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+
+
+def _rgba_css(rgb, alpha):
+    alpha_str = np.char.mod("%.2f", alpha)
+    css = np.char.add(f"background-color: rgba({rgb}, ", alpha_str)
+    return np.char.add(css, "); color: white;")
+
+
+def _finalize_css(vals, css, data):
+    """
+    Blank out zeros, mark non-numeric cells white, and wrap back into data's shape.
+    """
+    out = np.where(np.isnan(vals), WHITE_TEXT, css)
+    out = np.where(vals == 0, "", out)
+    if isinstance(data, pd.Series):
+        return pd.Series(out, index=data.index, name=data.name)
+    return pd.DataFrame(out, index=data.index, columns=data.columns)
+
+
+def batter_red_green_css(data, high_is_bad=True):
+    vals = _numeric_block(data)
+    alpha = np.clip(vals, 0, 50) / 50
     if high_is_bad:
-        return f"background-color: rgba(255, 0, 0, {alpha:.2f}); color: white;"
+        css = _rgba_css("255, 0, 0", alpha)
     else:
-        green_alpha = 1 - alpha
-        return f"background-color: rgba(0, 153, 0, {green_alpha:.2f}); color: white;"
+        css = _rgba_css("0, 153, 0", 1 - alpha)
+    return _finalize_css(vals, css, data)
 
 
-def get_batter_blue_red_shade(val):
-    try:
-        val = float(val)
-        if val == 0:
-            return ""
-    except:
-        return "color: white;"
-    capped = min(val, 1.0)
-    alpha = capped
-    return (
-        f"background-color: rgba(0, 102, 255, {alpha:.2f}); color: white;" if val > 0.3
-        else f"background-color: rgba(255, 0, 0, {1 - alpha:.2f}); color: white;"
-    )
+def batter_blue_red_css(data):
+    vals = _numeric_block(data)
+    alpha = np.clip(vals, 0, 1.0)
+    css = np.where(vals > 0.3, _rgba_css("0, 102, 255", alpha), _rgba_css("255, 0, 0", 1 - alpha))
+    return _finalize_css(vals, css, data)
 
 
-def get_pitcher_red_green_shade(percent, high_is_good=True):
-    try:
-        val = float(percent)
-        if val == 0:
-            return ""
-    except:
-        return "color: white;"
-    capped = min(val, 50)
-    alpha = capped / 50
+def pitcher_red_green_css(data, high_is_good=True):
+    vals = _numeric_block(data)
+    alpha = np.clip(vals, 0, 50) / 50
     if high_is_good:
-        return f"background-color: rgba(0, 153, 0, {alpha:.2f}); color: white;"
+        css = _rgba_css("0, 153, 0", alpha)
     else:
-        red_alpha = 1 - alpha
-        return f"background-color: rgba(255, 0, 0, {red_alpha:.2f}); color: white;"
+        css = _rgba_css("255, 0, 0", 1 - alpha)
+    return _finalize_css(vals, css, data)
 
 
-def get_pitcher_blue_red_shade(val):
-    try:
-        val = float(val)
-        if val == 0:
-            return ""
-    except:
-        return "color: white;"
-    capped = min(val, 1.0)
-    alpha = capped
-    return (
-        f"background-color: rgba(255, 0, 0, {alpha:.2f}); color: white;" if val > 0.3
-        else f"background-color: rgba(0, 102, 255, {1 - alpha:.2f}); color: white;"
-    )
+def pitcher_blue_red_css(data):
+    vals = _numeric_block(data)
+    alpha = np.clip(vals, 0, 1.0)
+    css = np.where(vals > 0.3, _rgba_css("255, 0, 0", alpha), _rgba_css("0, 102, 255", 1 - alpha))
+    return _finalize_css(vals, css, data)
 
 
-def get_delta_red_blue(val):
-    try:
-        val = float(val)
-        if val == 0:
-            return ""
-    except:
-        return "color: white;"
-    if val > 0:
-        alpha = min(val, 50) / 50
-        return f"background-color: rgba(0, 102, 255, {alpha:.2f}); color: white;"
-    elif val < 0:
-        alpha = min(abs(val), 50) / 50
-        return f"background-color: rgba(255, 0, 0, {alpha:.2f}); color: white;"
+def delta_red_blue_css(data):
+    vals = _numeric_block(data)
+    alpha = np.clip(np.abs(vals), 0, 50) / 50
+    css = np.where(vals > 0, _rgba_css("0, 102, 255", alpha), _rgba_css("255, 0, 0", alpha))
+    return _finalize_css(vals, css, data)
 
 
-def get_red_shade(percent_str):
-    try:
-        value = float(percent_str.strip('%')) if isinstance(percent_str, str) else float(percent_str)
-        if value == 0:
-            return ""
-    except:
-        return "color: white;"
-    capped = min(value, 50)
-    alpha = capped / 50
-    return f"background-color: rgba(255, 0, 0, {alpha:.2f}); color: white;"
+def percentile_css(values, percentiles, high_rgb, low_rgb):
+    """
+    Shade league percentiles (0-1) by distance from the median: high_rgb above it,
+    low_rgb below it. As with the fixed-cap shaders, zero values are left blank and
+    missing values (or percentiles) get the non-numeric style.
+    """
+    values = np.asarray(values, dtype=float)
+    percentiles = np.asarray(percentiles, dtype=float)
+    alpha = np.clip(np.abs(percentiles - 0.5) * 2, 0, 1)
+    css = np.where(percentiles >= 0.5, _rgba_css(high_rgb, alpha), _rgba_css(low_rgb, alpha))
+    css = np.where(np.isnan(values) | np.isnan(percentiles), WHITE_TEXT, css)
+    return np.where(values == 0, "", css)
@@ -0,0 +1,282 @@
+# utils/upstream.py
+import functools
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from urllib.parse import urlparse
+
+import requests
+
+from utils.instrumentation import endpoint_template, payload_size, record_call
+from utils.memory_monitor import register_cache
+
+try:
+    import fcntl
+except ImportError:  # Non-POSIX: cross-process coordination is unavailable
+    fcntl = None
+
+STATSAPI_HOST = "statsapi.mlb.com"
+SAVANT_HOST = "baseballsavant.mlb.com"
+
+# --- Per-host limits: (tokens per second, burst size) ---
+RATE_LIMITS = {
+    STATSAPI_HOST: (10.0, 20),
+    SAVANT_HOST: (1.0, 3),
+}
+DEFAULT_RATE_LIMIT = (5.0, 10)
+
+# --- Circuit breaker settings ---
+BREAKER_WINDOW = 20           # most recent calls considered per host
+BREAKER_MIN_CALLS = 5         # don't judge a host on fewer calls than this
+BREAKER_FAILURE_RATIO = 0.5   # errors (or slow calls) in the window that trip the breaker
+BREAKER_COOLDOWN = 30         # seconds to stay open before a half-open trial call
+SLOW_CALL_SECONDS = {
+    STATSAPI_HOST: 5.0,
+    SAVANT_HOST: 30.0,
+}
+
+# Set to a directory shared by all workers to coordinate limits across processes
+RATE_LOCK_DIR = os.environ.get("UPSTREAM_RATE_LOCK_DIR")
+
+REQUEST_TIMEOUT = 30
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of calling an upstream host whose circuit breaker is open."""
+
+
+# --- Token bucket rate limiter ---
+class TokenBucket:
+    def __init__(self, host, rate, burst):
+        self.host = host
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.waits = 0
+        self.waited_seconds = 0.0  # summed over callers, so concurrent waits add up
+
+    def _take(self, tokens, updated, now):
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens >= 1:
+            return tokens - 1, 0.0
+        return tokens, (1 - tokens) / self.rate
+
+    def _acquire_local(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens, wait = self._take(self.tokens, self.updated, now)
+            self.updated = now
+            if wait:
+                # Reserve the token now so concurrent callers queue behind us
+                self.tokens -= 1
+            return wait
+
+    def _acquire_shared(self):
+        # Bucket state lives in a small JSON file guarded by an advisory lock,
+        # so every worker process draws from the same bucket. Wall-clock time
+        # is used because monotonic clocks are not comparable across processes.
+        path = os.path.join(RATE_LOCK_DIR, f"{self.host}.bucket")
+        with open(path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read() or "{}")
+                except ValueError:
+                    state = {}
+                now = time.time()
+                tokens, wait = self._take(state.get("tokens", float(self.burst)), state.get("updated", now), now)
+                if wait:
+                    tokens -= 1
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps({"tokens": tokens, "updated": now}))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return wait
+
+    def acquire(self):
+        """
+        Block until a token is available for this host.
+        """
+        if RATE_LOCK_DIR and fcntl is not None:
+            os.makedirs(RATE_LOCK_DIR, exist_ok=True)
+            wait = self._acquire_shared()
+        else:
+            wait = self._acquire_local()
+        if wait > 0:
+            with self.lock:
+                self.waits += 1
+                self.waited_seconds += wait
+            time.sleep(wait)
+
+
+# --- Circuit breaker ---
+CLOSED_TICKET = "closed"  # allow() ticket for an ordinary call while the breaker is closed
+
+class CircuitBreaker:
+    def __init__(self, host, slow_call_seconds):
+        self.host = host
+        self.slow_call_seconds = slow_call_seconds
+        self.calls = deque(maxlen=BREAKER_WINDOW)
+        self.opened_at = None
+        self.trial = None  # ticket of the half-open trial call in flight, if any
+        self.lock = threading.Lock()
+
+    @property
+    def trial_in_flight(self):
+        return self.trial is not None
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= BREAKER_COOLDOWN:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        """
+        A ticket for one call, or None if the call must not be made. A
+        half-open breaker hands out a single trial ticket; pass the ticket
+        to record() with the outcome and to release() when the call ends.
+        """
+        with self.lock:
+            state = self.state
+            if state == "closed":
+                return CLOSED_TICKET
+            if state == "half-open" and self.trial is None:
+                self.trial = object()
+                return self.trial
+            return None
+
+    def record(self, ticket, ok, latency):
+        failed = (not ok) or latency > self.slow_call_seconds
+        with self.lock:
+            if self.opened_at is not None:
+                # Only the half-open trial decides the next state; calls that
+                # were already in flight when the breaker tripped are ignored
+                if ticket is not self.trial:
+                    return
+                self.trial = None
+                if failed:
+                    self.opened_at = time.monotonic()
+                else:
+                    self.opened_at = None
+                    self.calls.clear()
+                return
+
+            self.calls.append(failed)
+            if len(self.calls) >= BREAKER_MIN_CALLS and \
+                    sum(self.calls) / len(self.calls) >= BREAKER_FAILURE_RATIO:
+                self.opened_at = time.monotonic()
+                print(f"[WARN] Circuit opened for {self.host}")
+
+    def release(self, ticket):
+        """
+        Free the trial slot if ticket's call ended without recording an outcome
+        (e.g. interrupted by a BaseException), so a later call can retry it.
+        """
+        with self.lock:
+            if ticket is not None and ticket is self.trial:
+                self.trial = None
+
+
+rate_limiters = {}
+circuit_breakers = {}
+_registry_lock = threading.Lock()
+
+def get_rate_limiter(host):
+    with _registry_lock:
+        if host not in rate_limiters:
+            rate, burst = RATE_LIMITS.get(host, DEFAULT_RATE_LIMIT)
+            rate_limiters[host] = TokenBucket(host, rate, burst)
+        return rate_limiters[host]
+
+def get_circuit_breaker(host):
+    with _registry_lock:
+        if host not in circuit_breakers:
+            circuit_breakers[host] = CircuitBreaker(host, SLOW_CALL_SECONDS.get(host, 10.0))
+        return circuit_breakers[host]
+
+
+# --- Guarded calls ---
+def call_upstream(host, fn, *args, **kwargs):
+    """
+    Call fn under the host's rate limit and circuit breaker.
+    Raises CircuitOpenError without calling fn while the breaker is open.
+    """
+    url = args[0] if args and isinstance(args[0], str) and args[0].startswith("http") else None
+    endpoint = endpoint_template(url) if url else f"{host}/{fn.__name__}"
+
+    breaker = get_circuit_breaker(host)
+    ticket = breaker.allow()
+    if ticket is None:
+        record_call(endpoint, 0.0, error=True)
+        raise CircuitOpenError(f"Circuit open for {host}")
+
+    try:
+        get_rate_limiter(host).acquire()
+        start = time.monotonic()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            breaker.record(ticket, False, time.monotonic() - start)
+            record_call(endpoint, time.monotonic() - start, error=True)
+            raise
+        latency = time.monotonic() - start
+        is_response = isinstance(result, requests.Response)
+        ok = not is_response or (result.status_code < 500 and result.status_code != 429)
+        breaker.record(ticket, ok, latency)
+        record_call(endpoint, latency, payload_size(result), error=is_response and not result.ok)
+        return result
+    finally:
+        breaker.release(ticket)
+
+def http_get(url, **kwargs):
+    """
+    Drop-in for requests.get with per-host rate limiting and circuit breaking.
+    While the breaker is open it raises CircuitOpenError (a RequestException,
+    like a connection error) rather than returning a response, so functions
+    under @serve_stale_on_open serve their last good value instead of caching
+    an empty result.
+    """
+    host = urlparse(url).netloc
+    kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+    return call_upstream(host, requests.get, url, **kwargs)
+
+
+# --- Stale-while-revalidate for cached functions ---
+MAX_STALE_VALUES = 1024
+
+last_good_values = OrderedDict()
+_stale_lock = threading.Lock()
+register_cache("upstream.last_good_values", last_good_values, _stale_lock)
+
+def serve_stale_on_open(fn):
+    """
+    Remember each call's last good result; while an upstream breaker is open,
+    return that value instead of failing. Place it under @st.cache_data.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = (fn.__module__, fn.__qualname__, repr(args), repr(sorted(kwargs.items())))
+        try:
+            result = fn(*args, **kwargs)
+        except CircuitOpenError:
+            with _stale_lock:
+                if key in last_good_values:
+                    print(f"[STALE] Serving last good value for {fn.__name__}")
+                    return last_good_values[key]
+            raise
+        with _stale_lock:
+            last_good_values[key] = result
+            last_good_values.move_to_end(key)
+            while len(last_good_values) > MAX_STALE_VALUES:
+                last_good_values.popitem(last=False)
+        return result
+    return wrapper
@@ -0,0 +1,78 @@
+# utils/xba_grid.py
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils import disk_cache
+from utils.pitch_store import PITCH_STORE_DIR
+
+# Launch speed x launch angle -> expected BA lookup, built from stored
+# Statcast batted balls. Live games map each ball in play's hitData to a
+# grid cell instead of waiting for Savant to publish its xBA.
+XBA_GRID_PATH = PITCH_STORE_DIR / "xba_grid.npz"
+
+SPEED_EDGES = np.arange(0, 126, 3, dtype=float)    # mph
+ANGLE_EDGES = np.arange(-90, 91, 5, dtype=float)   # degrees
+
+def _cell(speed, angle):
+    s = np.clip(np.searchsorted(SPEED_EDGES, speed, side="right") - 1, 0, len(SPEED_EDGES) - 2)
+    a = np.clip(np.searchsorted(ANGLE_EDGES, angle, side="right") - 1, 0, len(ANGLE_EDGES) - 2)
+    return s, a
+
+def build_xba_grid(df: pd.DataFrame, path=XBA_GRID_PATH):
+    """
+    Average estimated_ba_using_speedangle per (speed, angle) cell. Empty cells
+    take their speed row's average, then the overall average.
+    """
+    cols = ["launch_speed", "launch_angle", "estimated_ba_using_speedangle"]
+    batted = df[cols].apply(pd.to_numeric, errors="coerce").dropna()
+    shape = (len(SPEED_EDGES) - 1, len(ANGLE_EDGES) - 1)
+
+    s, a = _cell(batted["launch_speed"].to_numpy(), batted["launch_angle"].to_numpy())
+    flat = np.ravel_multi_index((s, a), shape)
+    sums = np.bincount(flat, weights=batted["estimated_ba_using_speedangle"].to_numpy(), minlength=np.prod(shape)).reshape(shape)
+    counts = np.bincount(flat, minlength=np.prod(shape)).reshape(shape)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        grid = sums / counts
+        row_means = sums.sum(axis=1) / counts.sum(axis=1)
+    overall = sums.sum() / counts.sum() if counts.sum() else 0.0
+    row_means = np.where(np.isnan(row_means), overall, row_means)
+    grid = np.where(np.isnan(grid), row_means[:, np.newaxis], grid).astype(np.float32)
+
+    # Workers may load the grid mid-rebuild; they see the old file or the new one
+    with disk_cache.atomic_path(path) as tmp_path:
+        with open(tmp_path, "wb") as f:  # a file object, so savez doesn't append ".npz"
+            np.savez(f, grid=grid, counts=counts.astype(np.int32))
+    print(f"[✓] xBA grid from {len(batted)} batted balls -> {path}")
+    return grid
+
+
+_grid = None
+_grid_source = None
+_grid_lock = threading.Lock()
+
+def get_xba_grid(path=XBA_GRID_PATH):
+    """
+    The saved grid, reloaded when a rebuild replaces the file. None until a grid has been built.
+    """
+    global _grid, _grid_source
+    try:
+        source = (str(path), os.path.getmtime(path))
+    except OSError:
+        return None
+    with _grid_lock:
+        if source != _grid_source:
+            with np.load(path) as saved:
+                _grid = saved["grid"]
+            _grid_source = source
+        return _grid
+
+def lookup_xba(launch_speed, launch_angle):
+    grid = get_xba_grid()
+    if grid is None:
+        return None
+    s, a = _cell(launch_speed, launch_angle)
+    return float(grid[s, a])